@@ -0,0 +1,266 @@
+from __future__ import annotations
+from typing import Any, Callable, Hashable, TYPE_CHECKING
+from datetime import timedelta
+import hashlib
+import logging
+import threading
+import time
+
+if TYPE_CHECKING:
+    import pyexasol     # type: ignore
+
+logger = logging.getLogger(__name__)
+
+ConnectionKey = tuple[Hashable, ...]
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def get_connection_key(connect_params: dict[str, Any]) -> ConnectionKey:
+    """
+    Returns the key identifying the pooled connections that can be used in place of a new
+    connection opened with the given parameters, i.e. the DSN, user, schema, SSL and all
+    other options. The password is represented by its fingerprint, so that a connection
+    is never handed to someone who doesn't know the password it was opened with.
+
+    connect_params  - Parameters of the pyexasol.connect.
+    """
+    params = dict(connect_params)
+    if params.get('password') is not None:
+        params['password'] = hashlib.sha256(str(params['password']).encode()).hexdigest()
+    return _freeze(params)  # type: ignore
+
+
+def is_connection_healthy(conn: pyexasol.ExaConnection) -> bool:
+    """
+    The default health check of the pool. Runs a trivial query on the connection.
+    """
+    if conn.is_closed:
+        return False
+    try:
+        conn.execute('SELECT 1').fetchval()
+        return True
+    except Exception:     # pylint: disable=broad-exception-caught
+        return False
+
+
+class PooledConnection:
+    """
+    A pyexasol connection borrowed from a PyexasolConnectionPool. This is a proxy, not an
+    ExaConnection. It forwards all other attributes to the connection it wraps, except that
+    closing it, also by leaving its context, returns the connection to the pool.
+    """
+    def __init__(self, pool: PyexasolConnectionPool, key: ConnectionKey,
+                 conn: pyexasol.ExaConnection, attributes: dict[str, Any]) -> None:
+        self._pool = pool
+        self._key = key
+        self._conn: pyexasol.ExaConnection | None = conn
+        self._attributes = attributes
+
+    @property
+    def connection(self) -> pyexasol.ExaConnection:
+        """ The wrapped connection. """
+        if self._conn is None:
+            raise RuntimeError('The connection has been returned to the pool.')
+        return self._conn
+
+    @property
+    def is_closed(self) -> bool:
+        return (self._conn is None) or self._conn.is_closed
+
+    def close(self) -> None:
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._pool.release(self._key, conn, self._attributes)
+
+    def __enter__(self) -> PooledConnection:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.connection, name)
+
+
+def reset_connection(conn: pyexasol.ExaConnection, attributes: dict[str, Any]) -> bool:
+    """
+    Brings a connection returned to the pool back to the state it was opened in. Rolls back
+    the open transaction and reopens the original schema. Returns False if the session
+    attributes still differ from the original ones, e.g. because of an ALTER SESSION,
+    in which case the connection must not be reused.
+
+    conn        - The returned connection.
+    attributes  - The session attributes of the connection when it was opened.
+    """
+    try:
+        conn.rollback()
+        schema = attributes.get('currentSchema', '')
+        if conn.current_schema() != schema:
+            if schema:
+                conn.open_schema(schema)
+            else:
+                conn.execute('CLOSE SCHEMA')
+        return conn.attr == attributes
+    except Exception:     # pylint: disable=broad-exception-caught
+        logger.debug('Failed to reset a pooled connection.', exc_info=True)
+        return False
+
+
+class PyexasolConnectionPool:
+    """
+    A pool of pyexasol connections, keyed by the connection parameters, see the
+    get_connection_key. Reusing a connection saves the TLS websocket handshake and
+    the login.
+
+    The pool only keeps the idle connections. A connection is borrowed with the connect
+    method and returned when it gets closed. A returned connection is reset, see the
+    reset_connection, and dropped if it cannot be reset. A connection that has been idle for
+    some time is health-checked before being handed out. The pool is thread-safe.
+
+    max_size        - The maximum number of idle connections kept, for all keys together.
+                      Above that, the connection idle for the longest time is closed.
+    max_idle        - Idle connections older than this are closed.
+    check_after     - A connection idle for longer than this is health-checked before being
+                      reused. A connection that fails the check is closed and replaced.
+    health_check    - The health check. Defaults to the is_connection_healthy.
+    connect_func    - The function opening a new connection. Defaults to the pyexasol.connect.
+    """
+    def __init__(self,
+                 max_size: int = 8,
+                 max_idle: timedelta = timedelta(minutes=5),
+                 check_after: timedelta = timedelta(seconds=30),
+                 health_check: Callable[[pyexasol.ExaConnection], bool] = is_connection_healthy,
+                 connect_func: Callable[..., pyexasol.ExaConnection] | None = None) -> None:
+        if max_size < 0:
+            raise ValueError('The max_size must not be negative.')
+        self._max_size = max_size
+        self._max_idle = max_idle.total_seconds()
+        self._check_after = check_after.total_seconds()
+        self._health_check = health_check
+        self._connect_func = connect_func
+        # Idle connections with the time they were returned and their original session
+        # attributes, the most recently returned at the end.
+        self._idle: dict[ConnectionKey, list[tuple[pyexasol.ExaConnection, float,
+                                                   dict[str, Any]]]] = {}
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> PyexasolConnectionPool:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def idle_count(self) -> int:
+        with self._lock:
+            return sum(len(idle) for idle in self._idle.values())
+
+    def connect(self, **connect_params) -> PooledConnection:
+        """
+        Returns a pooled connection opened with the given parameters, or a new one if there
+        is no healthy idle connection for them.
+
+        connect_params  - Parameters of the pyexasol.connect.
+        """
+        key = get_connection_key(connect_params)
+        while True:
+            with self._lock:
+                expired = self._pop_expired()
+                idle = self._idle.get(key)
+                conn, released_at, attributes = idle.pop() if idle else (None, 0., {})
+                if idle == []:
+                    del self._idle[key]
+            for expired_conn in expired:
+                self._close(expired_conn)
+            if conn is None:
+                break
+            if (time.monotonic() - released_at < self._check_after) or self._health_check(conn):
+                logger.debug('Reusing a pooled connection.')
+                return PooledConnection(self, key, conn, attributes)
+            logger.debug('A pooled connection failed the health check.')
+            self._close(conn)
+
+        conn = self._open(**connect_params)
+        return PooledConnection(self, key, conn, dict(conn.attr))
+
+    def release(self, key: ConnectionKey, conn: pyexasol.ExaConnection,
+                attributes: dict[str, Any]) -> None:
+        """
+        Returns a connection to the pool. A closed connection is dropped, and so is
+        a connection that cannot be reset to its original session attributes.
+        Also closes the connections that have been idle for too long.
+        """
+        if conn.is_closed:
+            return
+        if not reset_connection(conn, attributes):
+            logger.debug('Dropping a pooled connection that could not be reset.')
+            self._close(conn)
+            return
+        with self._lock:
+            to_close = self._pop_expired()
+            if self._closed:
+                to_close.append(conn)
+            else:
+                self._idle.setdefault(key, []).append((conn, time.monotonic(), attributes))
+            while sum(len(idle) for idle in self._idle.values()) > self._max_size:
+                oldest_key = min(self._idle, key=lambda k: self._idle[k][0][1])
+                to_close.append(self._idle[oldest_key].pop(0)[0])
+                if not self._idle[oldest_key]:
+                    del self._idle[oldest_key]
+        for old_conn in to_close:
+            self._close(old_conn)
+
+    def close(self) -> None:
+        """
+        Closes all idle connections. Borrowed connections will be closed when they are
+        returned. The pool can still open new connections.
+        """
+        with self._lock:
+            self._closed = True
+            to_close = [conn for idle in self._idle.values() for conn, _, _ in idle]
+            self._idle.clear()
+        for conn in to_close:
+            self._close(conn)
+
+    def close_idle(self) -> None:
+        """
+        Closes the connections that have been idle for longer than the max_idle. The pool
+        also does it when a connection is borrowed or returned. A long-lived process can
+        call this method periodically, so that a quiet pool doesn't hold the connections.
+        """
+        with self._lock:
+            expired = self._pop_expired()
+        for conn in expired:
+            self._close(conn)
+
+    def _pop_expired(self) -> list[pyexasol.ExaConnection]:
+        deadline = time.monotonic() - self._max_idle
+        expired = []
+        for key in list(self._idle):
+            idle = self._idle[key]
+            while idle and (idle[0][1] < deadline):
+                expired.append(idle.pop(0)[0])
+            if not idle:
+                del self._idle[key]
+        return expired
+
+    def _open(self, **connect_params) -> pyexasol.ExaConnection:
+        if self._connect_func is None:
+            import pyexasol     # type: ignore     # pylint: disable=import-outside-toplevel
+            return pyexasol.connect(**connect_params)
+        return self._connect_func(**connect_params)
+
+    @staticmethod
+    def _close(conn: pyexasol.ExaConnection) -> None:
+        try:
+            conn.close()
+        except Exception:     # pylint: disable=broad-exception-caught
+            logger.debug('Failed to close a pooled connection.', exc_info=True)
@@ -2,6 +2,9 @@ import pyexasol     # type: ignore
 import exasol.saas.client.api_access as saas_api    # type: ignore
 
 from exasol.python_extension_common.deployment.language_container_deployer import get_websocket_sslopt
+from exasol.python_extension_common.connections.connection_pool import (
+    PyexasolConnectionPool, PooledConnection)
+from exasol.python_extension_common.connections.saas_lookup_cache import SaasLookupCache
 
 
 def open_pyexasol_connection(
@@ -17,7 +20,10 @@ def open_pyexasol_connection(
         use_ssl_cert_validation: bool = True,
         ssl_trusted_ca: str | None = None,
         ssl_client_certificate: str | None = None,
-        ssl_private_key: str | None = None) -> pyexasol.ExaConnection:
+        ssl_private_key: str | None = None,
+        pool: PyexasolConnectionPool | None = None,
+        saas_cache: SaasLookupCache | None = None
+) -> pyexasol.ExaConnection | PooledConnection:
     """
     Creates a database connections object, either in an On-Prem or SaaS database,
     depending on the provided parameters.
@@ -39,18 +45,31 @@ def open_pyexasol_connection(
         ssl_trusted_ca          - Path to a file or directory with an SSL trusted CA bundle
         ssl_client_certificate  - Path to a file with the SSL client certificate
         ssl_private_key         - Path to a file with the SSL client private key
+        pool                    - If provided, an idle connection with the same parameters is
+                                  taken from this pool, if there is one. The connection is
+                                  then returned as a PooledConnection, closing which returns
+                                  the connection to the pool.
+        saas_cache              - If provided, the SaaS connection parameters are taken from
+                                  this cache, when possible. They are invalidated in the cache
+                                  if the connection fails.
     """
 
+    # The SaaS lookups of the connection, if it is a SaaS database.
+    saas_lookup: dict[str, str] | None = None
+
     # Infer where the database is - On-Prem or SaaS.
     if all((dsn, db_user, db_pass)):
         connection_params = {'dsn': dsn, 'user': db_user, 'password': db_pass}
     elif all((saas_url, saas_account_id, saas_token,
               any((saas_database_id, saas_database_name)))):
-        connection_params = saas_api.get_connection_params(host=saas_url,
-                                                           account_id=saas_account_id,
-                                                           database_id=saas_database_id,
-                                                           database_name=saas_database_name,
-                                                           pat=saas_token)
+        # The all() above doesn't narrow the types.
+        assert saas_url and saas_account_id and saas_token
+        saas_lookup = {'host': saas_url, 'account_id': saas_account_id, 'pat': saas_token}
+        get_connection_params = (saas_api.get_connection_params if saas_cache is None
+                                 else saas_cache.get_connection_params)
+        connection_params = get_connection_params(**saas_lookup,
+                                                  database_id=saas_database_id,
+                                                  database_name=saas_database_name)
     else:
         raise ValueError('Incomplete parameter list. '
                          'Please either provide the parameters [dns, db_user, db_pass] '
@@ -61,7 +80,20 @@ def open_pyexasol_connection(
     websocket_sslopt = get_websocket_sslopt(use_ssl_cert_validation, ssl_trusted_ca,
                                             ssl_client_certificate, ssl_private_key)
 
-    return pyexasol.connect(**connection_params, schema=schema,
-                            encryption=True,
-                            websocket_sslopt=websocket_sslopt,
-                            compression=True)
+    try:
+        if pool is not None:
+            return pool.connect(**connection_params, schema=schema,
+                                encryption=True,
+                                websocket_sslopt=websocket_sslopt,
+                                compression=True)
+
+        return pyexasol.connect(**connection_params, schema=schema,
+                                encryption=True,
+                                websocket_sslopt=websocket_sslopt,
+                                compression=True)
+    except Exception:
+        # Only the lookups of a SaaS database are in the cache.
+        if (saas_cache is not None) and (saas_lookup is not None):
+            saas_cache.invalidate(**saas_lookup, database_id=saas_database_id,
+                                  database_name=saas_database_name)
+        raise
@@ -0,0 +1,164 @@
+from __future__ import annotations
+from typing import Any
+from datetime import timedelta
+from pathlib import Path
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = timedelta(hours=1)
+
+_CONNECTION_PARAMS = 'connection_params'
+_DATABASE_ID = 'database_id'
+
+
+def _get_saas_api():
+    # The SaaS API client is heavy. It is only imported if a lookup is not in the cache.
+    # pylint: disable-next=import-outside-toplevel
+    import exasol.saas.client.api_access as saas_api    # type: ignore
+    return saas_api
+
+
+def _get_token_fingerprint(pat: str) -> str:
+    return hashlib.sha256(pat.encode()).hexdigest()[:16]
+
+
+class SaasLookupCache:
+    """
+    A cache of the SaaS API lookups needed to connect to a SaaS database, i.e. the connection
+    parameters and the database id. The entries expire after the TTL. They are keyed by the
+    service url, account, database id or name, and a fingerprint of the token, so that a
+    different token never gets an entry looked up with another one.
+
+    The cache is kept in memory and, optionally, in a file shared by subsequent processes.
+    No secrets are stored. The token, which is also the password of the connection parameters,
+    is put back into the parameters when they are read from the cache.
+
+    An entry that has led to a failed connection should be invalidated, so that the next
+    attempt looks it up again.
+
+    ttl         - Time to live of the entries.
+    cache_file  - Optional path of the file where the entries are persisted.
+    """
+    def __init__(self, ttl: timedelta = DEFAULT_TTL, cache_file: Path | None = None) -> None:
+        self._ttl = ttl.total_seconds()
+        self._cache_file = cache_file
+        self._entries: dict[str, dict[str, Any]] | None = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_key(kind: str, host: str, account_id: str, pat: str,
+                 database_id: str | None, database_name: str | None) -> str:
+        return '|'.join([kind, host, account_id, database_id or '', database_name or '',
+                         _get_token_fingerprint(pat)])
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        if self._entries is None:
+            self._entries = {}
+            if (self._cache_file is not None) and self._cache_file.is_file():
+                try:
+                    entries = json.loads(self._cache_file.read_text())
+                    if isinstance(entries, dict):
+                        self._entries = entries
+                except (OSError, ValueError):
+                    logger.info('Ignoring the unreadable SaaS lookup cache %s.', self._cache_file)
+        return self._entries
+
+    def _save(self) -> None:
+        if self._cache_file is None:
+            return
+        tmp_file = self._cache_file.with_name(self._cache_file.name + '.tmp')
+        try:
+            fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self._entries, f)
+            tmp_file.replace(self._cache_file)
+        except OSError:
+            # The cache file is an optimisation, failing to write it is not an error.
+            logger.warning('Failed to write the SaaS lookup cache %s.', self._cache_file)
+
+    def _get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._load().get(key)
+        if (entry is None) or (entry.get('expires', 0) < time.time()):
+            return None
+        return entry.get('value')
+
+    def _put(self, key: str, value: Any) -> None:
+        with self._lock:
+            entries = self._load()
+            now = time.time()
+            for expired_key in [k for k, entry in entries.items()
+                                if entry.get('expires', 0) < now]:
+                del entries[expired_key]
+            entries[key] = {'value': value, 'expires': now + self._ttl}
+            self._save()
+
+    def get_connection_params(self, host: str, account_id: str, pat: str,
+                              database_id: str | None = None,
+                              database_name: str | None = None) -> dict[str, Any]:
+        """
+        Returns the connection parameters of a SaaS database, see the
+        exasol.saas.client.api_access.get_connection_params.
+        """
+        key = self._get_key(_CONNECTION_PARAMS, host, account_id, pat, database_id, database_name)
+        params = self._get(key)
+        if params is None:
+            params = _get_saas_api().get_connection_params(host=host, account_id=account_id,
+                                                           database_id=database_id,
+                                                           database_name=database_name,
+                                                           pat=pat)
+            self._put(key, {name: value for name, value in params.items()
+                            if name != 'password'})
+            return params
+        return {**params, 'password': pat}
+
+    def get_database_id(self, host: str, account_id: str, pat: str, database_name: str) -> str:
+        """
+        Returns the id of a SaaS database given its name, see the
+        exasol.saas.client.api_access.get_database_id.
+        """
+        key = self._get_key(_DATABASE_ID, host, account_id, pat, None, database_name)
+        database_id = self._get(key)
+        if database_id is None:
+            database_id = _get_saas_api().get_database_id(host=host, account_id=account_id,
+                                                          pat=pat, database_name=database_name)
+            self._put(key, database_id)
+        return database_id
+
+    def invalidate(self, host: str, account_id: str, pat: str,
+                   database_id: str | None = None,
+                   database_name: str | None = None) -> None:
+        """
+        Removes the entries of a database, looked up with the given token. To be called
+        when connecting to the database with the cached parameters has failed.
+        """
+        fingerprint = _get_token_fingerprint(pat)
+
+        def matches(key: str) -> bool:
+            parts = key.split('|')
+            if (len(parts) != 6) or (parts[1:3] + parts[5:] != [host, account_id, fingerprint]):
+                return False
+            return bool(database_id and (parts[3] == database_id) or
+                        database_name and (parts[4] == database_name))
+
+        with self._lock:
+            entries = self._load()
+            keys = [key for key in entries if matches(key)]
+            if keys:
+                for key in keys:
+                    del entries[key]
+                self._save()
+
+    def clear(self) -> None:
+        """
+        Removes all entries.
+        """
+        with self._lock:
+            self._entries = {}
+            self._save()
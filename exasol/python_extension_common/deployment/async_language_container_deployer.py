@@ -0,0 +1,153 @@
+from __future__ import annotations
+from typing import Any, Callable, TypeVar, TYPE_CHECKING
+from concurrent.futures import Executor
+from datetime import timedelta
+from functools import partial
+from pathlib import Path
+import asyncio
+
+from exasol.python_extension_common.deployment.language_container_deployer import (
+    LanguageContainerDeployer, LanguageActivationLevel)
+from exasol.python_extension_common.deployment.language_container_validator import (
+    wait_language_container_async, temp_schema_async)
+from exasol.python_extension_common.deployment.deployment_metrics import PHASE_VALIDATION
+
+if TYPE_CHECKING:
+    from exasol.python_extension_common.deployment.language_container_cache import (
+        ContainerCache)
+
+_T = TypeVar('_T')
+
+
+class AsyncLanguageContainerDeployer:
+    """
+    A coroutine interface to the LanguageContainerDeployer, allowing many deployments to run
+    on one event loop. The blocking steps - the download, the BucketFS upload and the database
+    calls - are executed in an executor, by default the one of the event loop. A thread is
+    only occupied while such a step is running. In particular, waiting for a language container
+    to become operational doesn't occupy a thread between the validation attempts.
+
+    The calls of one deployer must not overlap, since they share one database connection.
+
+    deployer    - The synchronous deployer doing the actual work.
+    executor    - The executor for the blocking steps.
+    """
+    def __init__(self, deployer: LanguageContainerDeployer,
+                 executor: Executor | None = None) -> None:
+        self._deployer = deployer
+        self._executor = executor
+
+    @classmethod
+    async def create(cls, executor: Executor | None = None,
+                     **kwargs) -> AsyncLanguageContainerDeployer:
+        """
+        Creates the deployer, connecting to the database in the executor.
+        The keyword arguments are those of the LanguageContainerDeployer.create.
+        """
+        loop = asyncio.get_running_loop()
+        deployer = await loop.run_in_executor(
+            executor, partial(LanguageContainerDeployer.create, **kwargs))
+        return cls(deployer, executor)
+
+    @property
+    def deployer(self) -> LanguageContainerDeployer:
+        return self._deployer
+
+    async def _call(self, func: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    async def download_and_run(self, url: str,
+                               bucket_file_path: str,
+                               alter_system: bool = True,
+                               allow_override: bool = False,
+                               wait_for_completion: bool = True,
+                               connections: int = 1,
+                               checksum: str | None = None,
+                               cache: ContainerCache | None = None) -> None:
+        """
+        A coroutine equivalent of the LanguageContainerDeployer.download_and_run.
+        """
+        await self.upload_container_from_url(url, bucket_file_path, connections=connections,
+                                             checksum=checksum, cache=cache)
+        await self.activate_and_wait(bucket_file_path, alter_system, allow_override,
+                                     wait_for_completion)
+
+    async def run(self, container_file: Path | None = None,
+                  bucket_file_path: str | None = None,
+                  alter_system: bool = True,
+                  allow_override: bool = False,
+                  wait_for_completion: bool = True,
+                  skip_if_unchanged: bool = False) -> None:
+        """
+        A coroutine equivalent of the LanguageContainerDeployer.run.
+        """
+        if not bucket_file_path:
+            if not container_file:
+                raise ValueError('Either a container file or a bucket file path must be specified.')
+            bucket_file_path = container_file.name
+
+        if container_file:
+            await self.upload_container(container_file, bucket_file_path,
+                                        skip_if_unchanged=skip_if_unchanged)
+
+        await self.activate_and_wait(bucket_file_path, alter_system, allow_override,
+                                     bool(container_file) and wait_for_completion)
+
+    async def activate_and_wait(self, bucket_file_path: str,
+                                alter_system: bool = True,
+                                allow_override: bool = False,
+                                wait_for_completion: bool = True) -> timedelta | None:
+        """
+        A coroutine equivalent of the LanguageContainerDeployer.activate_and_wait.
+        """
+        await self._call(self._deployer.activate, bucket_file_path, alter_system,
+                         allow_override)
+        if not wait_for_completion:
+            return None
+
+        conn = self._deployer.pyexasol_connection
+        language_alias = self._deployer.language_alias
+        metrics = self._deployer.metrics
+        async with temp_schema_async(conn, executor=self._executor) as schema:
+            with metrics.phase(PHASE_VALIDATION, language_alias=language_alias):
+                ready_after = await wait_language_container_async(conn, language_alias, schema,
+                                                                  metrics=metrics,
+                                                                  executor=self._executor)
+            if self._deployer.warm_up_vms_per_node > 0:
+                await self._call(self._deployer.warm_up, schema)
+        return ready_after
+
+    async def upload_container(self, container_file: Path,
+                               bucket_file_path: str | None = None,
+                               skip_if_unchanged: bool = False) -> bool:
+        """
+        A coroutine equivalent of the LanguageContainerDeployer.upload_container.
+        """
+        return await self._call(self._deployer.upload_container, container_file,
+                                bucket_file_path, skip_if_unchanged=skip_if_unchanged)
+
+    async def upload_container_from_url(self, url: str, bucket_file_path: str,
+                                        connections: int = 1,
+                                        checksum: str | None = None,
+                                        cache: ContainerCache | None = None) -> None:
+        """
+        A coroutine equivalent of the LanguageContainerDeployer.upload_container_from_url.
+        """
+        await self._call(self._deployer.upload_container_from_url, url, bucket_file_path,
+                         connections=connections, checksum=checksum, cache=cache)
+
+    async def activate_container(self, bucket_file_path: str,
+                                 alter_type: LanguageActivationLevel = LanguageActivationLevel.Session,
+                                 allow_override: bool = False) -> None:
+        """
+        A coroutine equivalent of the LanguageContainerDeployer.activate_container.
+        """
+        await self._call(self._deployer.activate_container, bucket_file_path, alter_type,
+                         allow_override)
+
+    async def close(self) -> None:
+        """
+        Closes the database connection.
+        """
+        await self._call(self._deployer.close)
@@ -0,0 +1,174 @@
+from __future__ import annotations
+from typing import Any, Callable, Generator
+from dataclasses import dataclass, field, asdict
+from contextlib import contextmanager
+from pathlib import Path
+import json
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Names of the phases recorded by the deployer.
+PHASE_CONNECT = 'connect'
+PHASE_DOWNLOAD = 'download'
+PHASE_HASH = 'hash'
+PHASE_UPLOAD = 'upload'
+PHASE_ALTER = 'alter'
+PHASE_VALIDATION = 'validation'
+PHASE_VALIDATION_ATTEMPT = 'validation_attempt'
+PHASE_WARM_UP = 'warm_up'
+
+DEFAULT_METRIC_PREFIX = 'slc_deployment'
+
+
+@dataclass
+class PhaseRecord:
+    """
+    Timing of one deployment phase.
+
+    phase       - Name of the phase, e.g. upload.
+    started     - Time when the phase started, in seconds since the epoch.
+    seconds     - Duration of the phase.
+    size        - Number of bytes processed in the phase, if applicable.
+    success     - False if the phase has ended with an exception.
+    labels      - Further details, e.g. the language alias or the activation level.
+    """
+    phase: str
+    started: float = 0.
+    seconds: float = 0.
+    size: int | None = None
+    success: bool = True
+    labels: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def throughput(self) -> float | None:
+        """ Bytes per second, None if the size is unknown or the duration is zero. """
+        if (self.size is None) or (self.seconds <= 0):
+            return None
+        return self.size / self.seconds
+
+
+MetricsCallback = Callable[[PhaseRecord], None]
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    return ','.join(f'{name}="{_escape_label_value(value)}"' for name, value in labels.items())
+
+
+class DeploymentMetrics:
+    """
+    Collects the timing of the deployment phases. Every completed phase is passed to the
+    callbacks, as it happens, and kept for an export in the JSON or Prometheus text format.
+    It is safe to record phases from multiple threads.
+
+    callbacks   - Functions called with each completed PhaseRecord. An exception raised by
+                  a callback is logged and otherwise ignored.
+    """
+    def __init__(self, callbacks: list[MetricsCallback] | None = None) -> None:
+        self.callbacks = list(callbacks or [])
+        self._records: list[PhaseRecord] = []
+        self._lock = threading.Lock()
+
+    @property
+    def records(self) -> list[PhaseRecord]:
+        with self._lock:
+            return list(self._records)
+
+    def add(self, record: PhaseRecord) -> None:
+        """
+        Adds a completed phase and passes it to the callbacks.
+        """
+        with self._lock:
+            self._records.append(record)
+        logger.debug('Phase %s took %.3f s, size: %s, labels: %s.',
+                     record.phase, record.seconds, record.size, record.labels)
+        for callback in self.callbacks:
+            try:
+                callback(record)
+            except Exception:     # pylint: disable=broad-exception-caught
+                logger.exception('Metrics callback failed for the phase %s.', record.phase)
+
+    @contextmanager
+    def phase(self, name: str, **labels: Any) -> Generator[PhaseRecord, None, None]:
+        """
+        A context manager measuring the duration of a phase. The phase is recorded when the
+        context exits, also if it exits with an exception. The yielded record can be used to
+        set the number of processed bytes.
+
+        name    - Name of the phase.
+        labels  - Further details of the phase. The values are converted to strings.
+        """
+        record = PhaseRecord(name, started=time.time(),
+                             labels={key: str(value) for key, value in labels.items()})
+        start_time = time.perf_counter()
+        try:
+            yield record
+        except BaseException:
+            record.success = False
+            raise
+        finally:
+            record.seconds = time.perf_counter() - start_time
+            self.add(record)
+
+    def to_json(self) -> str:
+        """
+        Returns all recorded phases as a JSON document.
+        """
+        phases = []
+        for record in self.records:
+            phases.append({**asdict(record), 'throughput': record.throughput})
+        return json.dumps({'phases': phases}, indent=2)
+
+    def to_prometheus(self, prefix: str = DEFAULT_METRIC_PREFIX) -> str:
+        """
+        Returns the recorded phases in the Prometheus text exposition format, e.g. for the
+        node exporter's textfile collector. Phases with the same name and labels, e.g. the
+        validation attempts, are aggregated.
+
+        prefix  - Prefix of the metric names.
+        """
+        totals: dict[tuple[tuple[str, str], ...], list[float | int]] = {}
+        for record in self.records:
+            key = (('phase', record.phase), *sorted(record.labels.items()))
+            total = totals.setdefault(key, [0., 0, 0, 0])
+            total[0] += record.seconds
+            total[1] += 1
+            total[2] += record.size or 0
+            total[3] += int(not record.success)
+
+        metrics = [('seconds_total', 'Time spent in the deployment phase.', 0),
+                   ('executions_total', 'Number of times the deployment phase was executed.', 1),
+                   ('bytes_total', 'Bytes processed in the deployment phase.', 2),
+                   ('failures_total', 'Number of failed executions of the phase.', 3)]
+        lines = []
+        for suffix, description, index in metrics:
+            name = f'{prefix}_phase_{suffix}'
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} counter')
+            for key, total in totals.items():
+                lines.append(f'{name}{{{_format_labels(dict(key))}}} {total[index]}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: Path, metrics_format: str = 'json') -> None:
+        """
+        Writes the recorded phases to a file. The file is replaced atomically, so that
+        a collector never reads it half-written.
+
+        path            - Path of the file.
+        metrics_format  - Either json or prometheus.
+        """
+        if metrics_format == 'json':
+            content = self.to_json()
+        elif metrics_format == 'prometheus':
+            content = self.to_prometheus()
+        else:
+            raise ValueError(f'Unknown metrics format {metrics_format}.')
+        tmp_path = path.with_name(path.name + '.tmp')
+        tmp_path.write_text(content)
+        tmp_path.replace(path)
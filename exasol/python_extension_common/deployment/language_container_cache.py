@@ -0,0 +1,220 @@
+from __future__ import annotations
+from typing import Any, Optional
+from pathlib import Path
+import hashlib
+import json
+import logging
+import threading
+import time
+import uuid
+
+from exasol.python_extension_common.deployment.language_container_digest import (
+    DIGEST_CACHE_SUFFIX, cache_digest, get_cached_digest)
+from exasol.python_extension_common.deployment.language_container_download import (
+    DOWNLOAD_CHUNK_SIZE, DOWNLOAD_TIMEOUT, download_container)
+from exasol.python_extension_common.deployment.transfer_progress import (
+    OPERATION_DOWNLOAD, ProgressCallback, ProgressTracker)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CACHE_SIZE = 4 * 1024 * 1024 * 1024
+
+# Suffixes of the files making up a cache entry.
+_ARCHIVE_SUFFIX = '.tar.gz'
+_METADATA_SUFFIX = '.json'
+_TMP_SUFFIX = '.tmp'
+
+
+def _get_entry_key(url: str) -> str:
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]
+
+
+def _write_atomically(path: Path, content: str) -> None:
+    tmp_path = path.with_name(f'{path.name}.{uuid.uuid4().hex}{_TMP_SUFFIX}')
+    tmp_path.write_text(content)
+    tmp_path.replace(path)
+
+
+class ContainerCache:
+    """
+    A local cache of the downloaded language container archives, shared by subsequent
+    deployments and processes. An entry is keyed by the url. It also records the ETag and
+    the Last-Modified date the server has sent with the archive. A cached archive is
+    revalidated with a conditional GET, every time it is requested, and downloaded again
+    only if it has changed. If the server can't be reached, the cached archive is used.
+    A download of a changed archive that fails partway raises the error.
+
+    An archive is downloaded into a temporary file, which is renamed when it's complete,
+    so that no one ever sees a partial entry. The SHA-256 digest of the archive is cached
+    next to it, which spares hashing it again before the upload.
+
+    When the total size of the archives exceeds the limit, the least recently used entries
+    are evicted.
+
+    cache_dir   - The directory of the cache. It will be created if it doesn't exist.
+    max_size    - The maximum total size of the cached archives, in bytes.
+    """
+    def __init__(self, cache_dir: Path, max_size: int = DEFAULT_MAX_CACHE_SIZE) -> None:
+        self._cache_dir = cache_dir
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._entry_locks: dict[str, threading.Lock] = {}
+
+    @property
+    def cache_dir(self) -> Path:
+        return self._cache_dir
+
+    def _get_archive_path(self, key: str) -> Path:
+        return self._cache_dir / (key + _ARCHIVE_SUFFIX)
+
+    def _get_metadata_path(self, key: str) -> Path:
+        return self._cache_dir / (key + _METADATA_SUFFIX)
+
+    def _get_entry_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._entry_locks.setdefault(key, threading.Lock())
+
+    def _read_metadata(self, key: str) -> Optional[dict[str, Any]]:
+        if not self._get_archive_path(key).is_file():
+            return None
+        try:
+            metadata = json.loads(self._get_metadata_path(key).read_text())
+        except (OSError, ValueError):
+            return None
+        return metadata if isinstance(metadata, dict) else None
+
+    def _touch(self, key: str, metadata: dict[str, Any]) -> None:
+        metadata['last_used'] = time.time()
+        _write_atomically(self._get_metadata_path(key), json.dumps(metadata))
+
+    def get(self, url: str, connections: int = 1, checksum: Optional[str] = None,
+            timeout: int = DOWNLOAD_TIMEOUT,
+            progress: Optional[ProgressCallback] = None) -> Path:
+        """
+        Returns the path of the cached container archive downloaded from the given url,
+        downloading it if it isn't in the cache or has changed on the server.
+
+        url         - Address where the container will be downloaded from.
+        connections - The maximum number of concurrent range requests of the download,
+                      see the download_container function.
+        checksum    - The expected hex SHA-256 digest of the container. A cached archive
+                      with a different digest is downloaded again.
+        timeout     - The http request timeout, in seconds.
+        progress    - A function receiving the progress of the download, if there is one.
+        """
+        import requests     # type: ignore     # pylint: disable=import-outside-toplevel
+
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        key = _get_entry_key(url)
+        archive_path = self._get_archive_path(key)
+        with self._get_entry_lock(key):
+            metadata = self._read_metadata(key)
+            if (metadata is not None) and checksum and \
+                    (get_cached_digest(archive_path) != checksum.lower()):
+                metadata = None
+
+            headers = {}
+            if metadata is not None:
+                if metadata.get('etag'):
+                    headers['If-None-Match'] = metadata['etag']
+                if metadata.get('last_modified'):
+                    headers['If-Modified-Since'] = metadata['last_modified']
+            # Only a server that can't be reached at all is a reason to use the cached archive.
+            # A download failing halfway is an error, as the server has a newer archive.
+            try:
+                response = requests.get(url, headers=headers, stream=True, timeout=timeout)
+            except requests.ConnectionError:
+                if metadata is None:
+                    raise
+                logger.warning('Cannot revalidate the cached container downloaded from %s, '
+                               'using it as it is.', url)
+                self._touch(key, metadata)
+                return archive_path
+
+            with response:
+                if (metadata is not None) and (response.status_code == 304):
+                    logger.info('Using the cached container downloaded from %s.', url)
+                    self._touch(key, metadata)
+                    return archive_path
+                response.raise_for_status()
+                new_metadata = {'url': url,
+                                'etag': response.headers.get('ETag'),
+                                'last_modified': response.headers.get('Last-Modified')}
+                tmp_path = archive_path.with_name(
+                    f'{archive_path.name}.{uuid.uuid4().hex}{_TMP_SUFFIX}')
+                try:
+                    if connections > 1:
+                        # The ranges are fetched with new requests.
+                        response.close()
+                        digest = download_container(url, tmp_path, connections=connections,
+                                                    checksum=checksum, timeout=timeout,
+                                                    progress=progress)
+                    else:
+                        digest = self._save_response(response, tmp_path, checksum, progress)
+                    tmp_path.replace(archive_path)
+                finally:
+                    tmp_path.unlink(missing_ok=True)
+
+            cache_digest(archive_path, digest)
+            self._touch(key, new_metadata)
+        self._evict(keep=key)
+        return archive_path
+
+    @staticmethod
+    def _save_response(response, target: Path, checksum: Optional[str],
+                       progress: Optional[ProgressCallback]) -> str:
+        sha256 = hashlib.sha256()
+        content_length = response.headers.get('Content-Length')
+        tracker = ProgressTracker(OPERATION_DOWNLOAD,
+                                  int(content_length) if content_length else None,
+                                  progress) if progress else None
+        with open(target, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+                sha256.update(chunk)
+                if tracker is not None:
+                    tracker.update(len(chunk))
+        if tracker is not None:
+            tracker.finish()
+        digest = sha256.hexdigest()
+        if checksum and (digest != checksum.lower()):
+            raise RuntimeError(f'The SHA-256 digest {digest} of the container downloaded '
+                               f'from {response.url} does not match the checksum {checksum}.')
+        return digest
+
+    def _remove_entry(self, key: str) -> None:
+        archive_path = self._get_archive_path(key)
+        for path in [archive_path,
+                     archive_path.with_name(archive_path.name + DIGEST_CACHE_SUFFIX),
+                     self._get_metadata_path(key)]:
+            path.unlink(missing_ok=True)
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        entries = []
+        for metadata_path in self._cache_dir.glob('*' + _METADATA_SUFFIX):
+            if metadata_path.name.endswith(DIGEST_CACHE_SUFFIX):
+                continue
+            key = metadata_path.name[:-len(_METADATA_SUFFIX)]
+            metadata = self._read_metadata(key)
+            if metadata is not None:
+                entries.append((metadata.get('last_used', 0), key, metadata.get('url'),
+                                self._get_archive_path(key).stat().st_size))
+        total_size = sum(entry[3] for entry in entries)
+        for _, key, url, size in sorted(entries):
+            if total_size <= self._max_size:
+                break
+            if key != keep:
+                logger.info('Evicting the cached container downloaded from %s.', url)
+                self._remove_entry(key)
+                total_size -= size
+
+    def clear(self) -> None:
+        """
+        Removes all entries.
+        """
+        if not self._cache_dir.is_dir():
+            return
+        for path in self._cache_dir.iterdir():
+            if path.is_file() and path.name.endswith((_ARCHIVE_SUFFIX, _METADATA_SUFFIX,
+                                                      _TMP_SUFFIX)):
+                path.unlink(missing_ok=True)
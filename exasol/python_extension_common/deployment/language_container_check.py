@@ -0,0 +1,222 @@
+from __future__ import annotations
+from typing import Iterable, Optional
+from pathlib import Path
+import zlib
+
+from exasol.python_extension_common.deployment.script_languages import PYTHON_CLIENT_PATH
+from exasol.python_extension_common.deployment.sized_reader import CountingReader, ReadableStream
+
+_BLOCK_SIZE = 512
+
+# The decompressed data is produced in slices of this size, so that a highly compressed
+# chunk doesn't expand in memory all at once.
+_MAX_DECOMPRESSED_SIZE = 1024 * 1024
+
+_READ_CHUNK_SIZE = 1024 * 1024
+
+# Tar entry types carrying the name or the attributes of the next entry.
+_GNU_LONG_NAME = b'L'
+_PAX_HEADER = b'x'
+_PAX_GLOBAL_HEADER = b'g'
+
+# The metadata entries are small, a larger one indicates a corrupt archive.
+_MAX_METADATA_SIZE = 1024 * 1024
+
+
+class InvalidContainerError(RuntimeError):
+    """
+    Raised when a language container is not a valid tar.gz archive or lacks a required file.
+    """
+
+
+def _normalize_path(path: str) -> str:
+    while path.startswith('./'):
+        path = path[2:]
+    return path.strip('/')
+
+
+def _parse_octal(field: bytes) -> int:
+    if field and (field[0] & 0x80):
+        # The base-256 encoding of large numbers.
+        return int.from_bytes(field[1:], 'big')
+    digits = field.split(b'\0', 1)[0].strip()
+    return int(digits, 8) if digits else 0
+
+
+def _parse_pax_path(data: bytes) -> Optional[str]:
+    path = None
+    while data:
+        length_field, _, _ = data.partition(b' ')
+        length = int(length_field)
+        record = data[len(length_field) + 1:length].rstrip(b'\n')
+        key, _, value = record.partition(b'=')
+        if key == b'path':
+            path = value.decode('utf-8', errors='replace')
+        data = data[length:]
+    return path
+
+
+class ContainerChecker:
+    """
+    Verifies a language container archive, fed to it in chunks as it is being read, e.g.
+    while it's uploaded. Nothing is extracted. The archive is decompressed on the fly, which
+    verifies the gzip checksums, and the tar headers are scanned for the names of the entries.
+    The content of the entries is skipped. The memory consumption doesn't depend on the size
+    of the archive.
+
+    Feed the archive with the update method and call the verify method at the end.
+
+    required_paths  - Paths that must exist in the archive, relative to its root. By default,
+                      the UDF client the language definition of a Python container points at.
+    """
+    def __init__(self, required_paths: Iterable[str] = (PYTHON_CLIENT_PATH,)) -> None:
+        self._missing_paths = {_normalize_path(path) for path in required_paths}
+        self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        self._error: Optional[str] = None
+        self._tar_end = False
+        # Bytes of the current header or metadata entry, collected until complete.
+        self._buffer = bytearray()
+        self._needed = _BLOCK_SIZE
+        # Bytes of the current entry's content and padding still to be skipped.
+        self._skip = 0
+        # The type of the metadata entry being collected, if any.
+        self._metadata_type: Optional[bytes] = None
+        self._next_path: Optional[str] = None
+        self.entries = 0
+
+    @property
+    def error(self) -> Optional[str]:
+        """ The first problem found so far, None if there is none. """
+        return self._error
+
+    def update(self, data: bytes | bytearray | memoryview) -> None:
+        """
+        Feeds the next chunk of the archive.
+        """
+        if self._error is not None:
+            return
+        try:
+            self._decompress(data)
+        except (zlib.error, ValueError) as ex:
+            self._error = f'The container is not a valid tar.gz archive: {ex}'
+
+    def verify(self) -> None:
+        """
+        Checks that the whole archive has been fed, and that it's valid and complete.
+        Raises an InvalidContainerError otherwise.
+        """
+        if (self._error is None) and not self._decompressor.eof:
+            self._error = 'The container is not a valid tar.gz archive: it is truncated.'
+        if (self._error is None) and self._missing_paths:
+            self._error = (f'The container lacks the required file(s) '
+                           f'{", ".join(sorted(self._missing_paths))}.')
+        if self._error is not None:
+            raise InvalidContainerError(self._error)
+
+    def _decompress(self, data: bytes | bytearray | memoryview) -> None:
+        while True:
+            if self._decompressor.eof:
+                # Only another gzip member or a zero padding may follow a gzip member.
+                if not bytes(data).strip(b'\0'):
+                    return
+                self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            output = self._decompressor.decompress(data, _MAX_DECOMPRESSED_SIZE)
+            self._scan(memoryview(output))
+            data = self._decompressor.unconsumed_tail or self._decompressor.unused_data
+            # Without the input, more output may still be pending, if the limit has been hit.
+            if (not data) and (self._decompressor.eof or len(output) < _MAX_DECOMPRESSED_SIZE):
+                return
+
+    def _scan(self, data: memoryview) -> None:
+        while data and not self._tar_end:
+            if self._skip:
+                size = min(self._skip, len(data))
+                self._skip -= size
+                data = data[size:]
+                continue
+            size = min(self._needed - len(self._buffer), len(data))
+            self._buffer += data[:size]
+            data = data[size:]
+            if len(self._buffer) == self._needed:
+                block = bytes(self._buffer)
+                self._buffer.clear()
+                if self._metadata_type is None:
+                    self._process_header(block)
+                else:
+                    self._process_metadata(block)
+
+    def _process_header(self, header: bytes) -> None:
+        if not header.strip(b'\0'):
+            # The end of the archive is marked by zero blocks.
+            self._tar_end = True
+            return
+        checksum = sum(header[:148]) + 8 * 32 + sum(header[156:])
+        if _parse_octal(header[148:156]) != checksum:
+            raise ValueError('a tar header has an invalid checksum')
+        size = _parse_octal(header[124:136])
+        entry_type = header[156:157]
+        padded_size = -(-size // _BLOCK_SIZE) * _BLOCK_SIZE
+        if entry_type in (_GNU_LONG_NAME, _PAX_HEADER, _PAX_GLOBAL_HEADER):
+            if size > _MAX_METADATA_SIZE:
+                raise ValueError('a tar metadata entry is too large')
+            if size:
+                self._metadata_type = entry_type
+                self._needed = padded_size
+            return
+
+        path = self._next_path
+        self._next_path = None
+        if path is None:
+            path = header[:100].split(b'\0', 1)[0].decode('utf-8', errors='replace')
+            if header[257:263] == b'ustar\0':
+                prefix = header[345:500].split(b'\0', 1)[0].decode('utf-8', errors='replace')
+                if prefix:
+                    path = f'{prefix}/{path}'
+        self._missing_paths.discard(_normalize_path(path))
+        self.entries += 1
+        self._skip = padded_size
+
+    def _process_metadata(self, data: bytes) -> None:
+        entry_type = self._metadata_type
+        self._metadata_type = None
+        self._needed = _BLOCK_SIZE
+        if entry_type == _GNU_LONG_NAME:
+            self._next_path = data.split(b'\0', 1)[0].decode('utf-8', errors='replace')
+        elif entry_type == _PAX_HEADER:
+            self._next_path = _parse_pax_path(data.rstrip(b'\0')) or self._next_path
+
+
+class CheckingReader(CountingReader):
+    """
+    A read-only binary stream that feeds the data read from the underlying stream to
+    a ContainerChecker, as it passes through. The data is not copied.
+
+    stream  - The underlying stream.
+    checker - The checker the data is fed to.
+    """
+    def __init__(self, stream: ReadableStream, checker: ContainerChecker) -> None:
+        super().__init__()
+        self._stream = stream
+        self._checker = checker
+
+    def _readinto(self, buffer) -> int:
+        size = self._stream.readinto(buffer)     # type: ignore
+        if size:
+            self._checker.update(memoryview(buffer)[:size])
+        return size or 0
+
+
+def check_container(container_file: Path,
+                    required_paths: Iterable[str] = (PYTHON_CLIENT_PATH,)) -> None:
+    """
+    Verifies a local language container archive, see the ContainerChecker.
+    Raises an InvalidContainerError if the container is invalid.
+
+    container_file  - Path of the container tar.gz file in a local file system.
+    required_paths  - Paths that must exist in the archive, relative to its root.
+    """
+    checker = ContainerChecker(required_paths)
+    with open(container_file, 'rb') as f:
+        while chunk := f.read(_READ_CHUNK_SIZE):
+            checker.update(chunk)
+    checker.verify()
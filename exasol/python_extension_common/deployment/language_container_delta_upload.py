@@ -0,0 +1,317 @@
+from __future__ import annotations
+from typing import BinaryIO, Callable, Iterator, Optional, TYPE_CHECKING
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+import gzip
+import hashlib
+import json
+import logging
+import posixpath
+import shutil
+import tarfile
+import tempfile
+
+if TYPE_CHECKING:
+    import exasol.bucketfs as bfs   # type: ignore
+
+from exasol.python_extension_common.deployment.language_container_digest import (
+    get_container_digest, read_manifest, write_manifest)
+from exasol.python_extension_common.deployment.sized_reader import CountingReader, with_length
+
+logger = logging.getLogger(__name__)
+
+# Suffix of the directory in the BucketFS where the delta of a container is uploaded to.
+DELTA_SUFFIX = '.delta'
+
+# Names of the files in the delta directory.
+RECIPE_FILE = 'recipe.json'
+BLOCKS_FILE = 'blocks'
+
+# Members of the tar archive larger than this are split into chunks of this size.
+DEFAULT_MAX_CHUNK_SIZE = 1024 * 1024
+
+# The compression level of a container rebuilt from the delta.
+DEFAULT_COMPRESSION_LEVEL = 6
+
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+# The kinds of the recipe operations.
+OP_BASE = 'base'
+OP_DELTA = 'delta'
+
+# A function that rebuilds the target file from the base file and the delta directory,
+# next to them in the BucketFS, e.g. by calling the apply_delta function. Same as the
+# assembly of a resumable upload, this must be done by a component with a write access
+# to the bucket close to the BucketFS service, e.g. a UDF or a server-side job. No such
+# assembler is provided, hence the delta upload is experimental and not used by the deployer.
+DeltaAssembler = Callable[['bfs.path.PathLike', 'bfs.path.PathLike', 'bfs.path.PathLike'],
+                          None]
+
+
+@dataclass
+class DeltaRecipe:
+    """
+    Instructions for rebuilding a container from its previous version and the changed blocks.
+    The operations work on the tar archives, i.e. on the decompressed containers.
+
+    size    - Size of the target tar archive.
+    sha256  - The hex SHA-256 digest of the target tar archive.
+    ops     - The operations, in the order of the target content. Each operation is a tuple of
+              the kind, the offset and the length. An operation of the base kind copies a range
+              of the base archive, an operation of the delta kind a range of the blocks file.
+    level   - The compression level of the rebuilt container.
+    """
+    size: int
+    sha256: str
+    ops: list[tuple[str, int, int]] = field(default_factory=list)
+    level: int = DEFAULT_COMPRESSION_LEVEL
+
+    @property
+    def delta_size(self) -> int:
+        """ Number of bytes that have to be uploaded in the blocks file. """
+        return sum(length for kind, _, length in self.ops if kind == OP_DELTA)
+
+    def add(self, kind: str, offset: int, length: int) -> None:
+        """ Appends an operation, merging it with the last one if they are contiguous. """
+        if self.ops:
+            last_kind, last_offset, last_length = self.ops[-1]
+            if (last_kind == kind) and (last_offset + last_length == offset):
+                self.ops[-1] = (kind, last_offset, last_length + length)
+                return
+        self.ops.append((kind, offset, length))
+
+    def to_json(self) -> str:
+        return json.dumps({'size': self.size, 'sha256': self.sha256, 'level': self.level,
+                           'ops': [list(op) for op in self.ops]})
+
+    @classmethod
+    def from_json(cls, content: str | bytes) -> DeltaRecipe:
+        recipe = json.loads(content)
+        return cls(recipe['size'], recipe['sha256'],
+                   [(kind, offset, length) for kind, offset, length in recipe['ops']],
+                   recipe.get('level', DEFAULT_COMPRESSION_LEVEL))
+
+
+def split_chunks(archive: BinaryIO,
+                 max_size: int = DEFAULT_MAX_CHUNK_SIZE) -> Iterator[tuple[int, int]]:
+    """
+    Splits a tar archive into chunks along its members. Yields the offset and the length
+    of each chunk. A chunk starts at the header of a member, members larger than max_size
+    are split further. Adding, removing or changing a file in the archive therefore changes
+    only the chunks of this file, wherever it is in the archive.
+
+    archive     - The tar archive, open for reading.
+    max_size    - The maximum size of a chunk.
+    """
+    if max_size < tarfile.BLOCKSIZE:
+        raise ValueError(f'The maximum chunk size must be at least {tarfile.BLOCKSIZE} bytes.')
+    size = archive.seek(0, 2)
+    archive.seek(0)
+    with tarfile.open(fileobj=archive, mode='r:') as tar:
+        # The offset of a member includes its extended headers, e.g. of a long name.
+        starts = [member.offset for member in tar]
+        # The end of the archive, after the last member, is the last chunk.
+        starts.append(tar.offset)
+    boundaries = sorted(set([0, *starts, size]))
+    for start, end in zip(boundaries, boundaries[1:]):
+        for offset in range(start, end, max_size):
+            yield offset, min(max_size, end - offset)
+
+
+@contextmanager
+def _decompress(container_file: Path) -> Iterator[BinaryIO]:
+    # Decompresses a tar.gz container into a temporary file.
+    with tempfile.TemporaryFile() as f:
+        with gzip.open(container_file, 'rb') as source:
+            shutil.copyfileobj(source, f, _COPY_CHUNK_SIZE)
+        f.seek(0)
+        yield f     # type: ignore
+
+
+def _read_chunks(archive: BinaryIO, max_chunk_size: int) -> Iterator[tuple[int, bytes]]:
+    for offset, length in split_chunks(archive, max_chunk_size):
+        archive.seek(offset)
+        yield offset, archive.read(length)
+
+
+def _compute_delta(archive: BinaryIO, base_archive: BinaryIO, max_chunk_size: int,
+                   level: int) -> DeltaRecipe:
+    base_chunks = {hashlib.sha256(chunk).digest(): offset
+                   for offset, chunk in _read_chunks(base_archive, max_chunk_size)}
+    sha256 = hashlib.sha256()
+    ops = DeltaRecipe(0, '', level=level)
+    delta_offset = 0
+    for _, chunk in _read_chunks(archive, max_chunk_size):
+        sha256.update(chunk)
+        base_offset = base_chunks.get(hashlib.sha256(chunk).digest())
+        if base_offset is None:
+            ops.add(OP_DELTA, delta_offset, len(chunk))
+            delta_offset += len(chunk)
+        else:
+            ops.add(OP_BASE, base_offset, len(chunk))
+    ops.size = archive.seek(0, 2)
+    ops.sha256 = sha256.hexdigest()
+    return ops
+
+
+def compute_delta(container_file: Path, base_file: Path,
+                  max_chunk_size: int = DEFAULT_MAX_CHUNK_SIZE,
+                  level: int = DEFAULT_COMPRESSION_LEVEL) -> DeltaRecipe:
+    """
+    Computes the difference between a container and its previous version. The tar archives
+    in the containers are decompressed and split into chunks along their members, see the
+    split_chunks. The chunks of the container found in the base archive are copied from it,
+    the others have to be uploaded.
+
+    A change in a file changes the rest of the gzip stream, so the difference is computed
+    between the decompressed archives, and the container is compressed again after it's
+    rebuilt.
+
+    container_file  - Path of the new container tar.gz file in a local file system.
+    base_file       - Path of the previous version of the container in a local file system.
+    max_chunk_size  - The maximum size of a chunk.
+    level           - The compression level of the rebuilt container.
+    """
+    with _decompress(container_file) as archive, _decompress(base_file) as base_archive:
+        return _compute_delta(archive, base_archive, max_chunk_size, level)
+
+
+class _DeltaBlocksReader(CountingReader):
+    """
+    A read-only binary stream over the ranges of a tar archive that have to be uploaded,
+    following the delta operations of a recipe.
+    """
+    def __init__(self, file: BinaryIO, recipe: DeltaRecipe) -> None:
+        super().__init__()
+        self._file = file
+        self._ranges: list[tuple[int, int]] = []
+        target_offset = 0
+        for kind, _, length in recipe.ops:
+            if kind == OP_DELTA:
+                self._ranges.append((target_offset, length))
+            target_offset += length
+        self._index = 0
+        self._range_position = 0
+
+    def _readinto(self, buffer) -> int:
+        while self._index < len(self._ranges):
+            offset, length = self._ranges[self._index]
+            if self._range_position < length:
+                self._file.seek(offset + self._range_position)
+                data = self._file.read(min(len(buffer), length - self._range_position))
+                buffer[:len(data)] = data
+                self._range_position += len(data)
+                return len(data)
+            self._index += 1
+            self._range_position = 0
+        return 0
+
+
+def apply_delta(recipe: DeltaRecipe, base: BinaryIO, blocks: BinaryIO,
+                target: BinaryIO) -> None:
+    """
+    Rebuilds a container from its previous version and the uploaded blocks. This is the
+    reconstruction step, e.g. for a UDF or a server-side job implementing the DeltaAssembler.
+    The previous version is decompressed into a temporary file, the tar archive is rebuilt
+    following the recipe and compressed into the target. Raises a ValueError if the rebuilt
+    archive doesn't match the digest in the recipe.
+
+    recipe  - The recipe of the container.
+    base    - The previous version of the container, a tar.gz file open for reading.
+    blocks  - The uploaded blocks file, open for reading.
+    target  - The file the container is written to, open for writing.
+    """
+    sha256 = hashlib.sha256()
+    with tempfile.TemporaryFile() as base_archive, \
+            gzip.GzipFile(fileobj=target, mode='wb', compresslevel=recipe.level,
+                          mtime=0) as archive:
+        with gzip.GzipFile(fileobj=base, mode='rb') as source:
+            shutil.copyfileobj(source, base_archive, _COPY_CHUNK_SIZE)
+        for kind, offset, length in recipe.ops:
+            source = base_archive if kind == OP_BASE else blocks     # type: ignore
+            source.seek(offset)
+            while length > 0:
+                data = source.read(min(length, _COPY_CHUNK_SIZE))
+                if not data:
+                    raise ValueError(f'The {kind} file is too short for the recipe.')
+                archive.write(data)
+                sha256.update(data)
+                length -= len(data)
+    if sha256.hexdigest() != recipe.sha256:
+        raise ValueError('The rebuilt container does not match the digest in the recipe.')
+
+
+def get_delta_path(file_path: bfs.path.PathLike) -> bfs.path.PathLike:
+    """
+    Returns the directory in the BucketFS where the delta of a container is uploaded to.
+    """
+    return file_path.parent / (file_path.name + DELTA_SUFFIX)
+
+
+def _is_same_file(path: bfs.path.PathLike, other_path: bfs.path.PathLike) -> bool:
+    # Different archives extracted into the same directory in the UDFs are considered
+    # the same file as well.
+    return posixpath.normpath(path.as_udf_path()) == posixpath.normpath(other_path.as_udf_path())
+
+
+def upload_container_delta(container_file: Path,
+                           file_path: bfs.path.PathLike,
+                           base_file: Path,
+                           base_file_path: bfs.path.PathLike,
+                           assembler: DeltaAssembler,
+                           max_chunk_size: int = DEFAULT_MAX_CHUNK_SIZE,
+                           level: int = DEFAULT_COMPRESSION_LEVEL) -> Optional[DeltaRecipe]:
+    """
+    Uploads a container to the BucketFS as a difference to its previous version, which is
+    both in the bucket and in a local file system. Only the chunks of the tar archive not
+    found in the previous version are uploaded, uncompressed, together with the recipe for
+    rebuilding the container. The assembler then rebuilds the container next to the previous
+    version. This is followed by writing the manifest. The delta directory is removed, whether
+    the upload succeeds or not.
+
+    The rebuilt container holds the same tar archive as the local one, but it's compressed
+    again, so the two files are not identical. The manifest has the digest of the local
+    container, which the rebuilt one stands for, e.g. as the base of the next delta upload.
+
+    The BucketFS cannot rename files, so the container cannot be rebuilt in place of its
+    previous version. The two paths must be different, otherwise a ValueError is raised.
+
+    The delta upload is possible only if the manifest of the previous version in the bucket
+    matches the local file, and it's worth it only if the uploaded chunks are smaller than
+    the compressed container. Otherwise, nothing is uploaded and None is returned. Returns
+    the recipe if the container has been uploaded.
+
+    container_file  - Path of the container tar.gz file in a local file system.
+    file_path       - Path of the container file in the BucketFS.
+    base_file       - Path of the previous version of the container in a local file system.
+    base_file_path  - Path of the previous version of the container in the BucketFS.
+    assembler       - Function rebuilding the container from the base file and the delta.
+    max_chunk_size  - The maximum size of a chunk.
+    level           - The compression level of the rebuilt container.
+    """
+    if _is_same_file(file_path, base_file_path):
+        raise ValueError(f'The container {file_path} cannot be uploaded as a delta to itself.')
+    if read_manifest(base_file_path) != get_container_digest(base_file):
+        logger.info('The container %s in the bucket does not match the local file %s.',
+                    base_file_path, base_file)
+        return None
+    delta_path = get_delta_path(file_path)
+    with _decompress(container_file) as archive:
+        with _decompress(base_file) as base_archive:
+            recipe = _compute_delta(archive, base_archive, max_chunk_size, level)
+        container_size = container_file.stat().st_size
+        if recipe.delta_size >= container_size:
+            logger.info('The delta to the container %s saves nothing.', base_file_path)
+            return None
+        try:
+            (delta_path / BLOCKS_FILE).write(with_length(_DeltaBlocksReader(archive, recipe),
+                                                         recipe.delta_size))
+            (delta_path / RECIPE_FILE).write(recipe.to_json().encode('utf-8'))
+            assembler(base_file_path, delta_path, file_path)
+            write_manifest(file_path, get_container_digest(container_file))
+        finally:
+            delta_path.rmdir(recursive=True)
+    logger.info('Uploaded %d bytes of the container %s of %d bytes as a delta.',
+                recipe.delta_size, file_path, container_size)
+    return recipe
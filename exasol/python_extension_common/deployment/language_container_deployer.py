@@ -1,17 +1,42 @@
+from __future__ import annotations
 from enum import Enum
+from datetime import timedelta
 from textwrap import dedent
-from typing import List, Optional, Dict
+from typing import Optional, Dict, List, Iterable, TYPE_CHECKING
+from contextlib import ExitStack
 from pathlib import Path, PurePosixPath
 import logging
-import tempfile
 import ssl
-import requests     # type: ignore
-import pyexasol     # type: ignore
-import exasol.bucketfs as bfs   # type: ignore
-from exasol.saas.client.api_access import (get_connection_params, get_database_id)      # type: ignore
+
+if TYPE_CHECKING:
+    # The backends are imported where they are used, so that importing this module,
+    # e.g. by a cli invoked with --help, doesn't pay for loading them.
+    import pyexasol     # type: ignore
+    import exasol.bucketfs as bfs   # type: ignore
+    from exasol.python_extension_common.connections.connection_pool import (
+        PyexasolConnectionPool)
+    from exasol.python_extension_common.deployment.language_container_cache import (
+        ContainerCache)
+
+from exasol.python_extension_common.connections.saas_lookup_cache import SaasLookupCache
 
 from exasol.python_extension_common.deployment.language_container_validator import (
-    wait_language_container, temp_schema
+    wait_language_container, wait_language_containers, temp_schema, warm_up_language_container,
+    WarmUpReport
+)
+from exasol.python_extension_common.deployment.script_languages import (
+    ScriptLanguages, LanguageDefinition
+)
+from exasol.python_extension_common.deployment.transfer_progress import ProgressCallback
+from exasol.python_extension_common.deployment.language_container_retention import (
+    RetentionPolicy, RetentionReport, collect_garbage
+)
+from exasol.python_extension_common.deployment.mapped_file import DEFAULT_BUFFER_SIZE
+from exasol.python_extension_common.deployment.deployment_metrics import (
+    DeploymentMetrics, PHASE_CONNECT, PHASE_ALTER, PHASE_VALIDATION, PHASE_WARM_UP
+)
+from exasol.python_extension_common.deployment.language_container_uploader import (
+    LanguageContainerUploader, ContainerSpec
 )
 
 
@@ -75,6 +100,20 @@ def get_language_settings(pyexasol_conn: pyexasol.ExaConnection, alter_type: Lan
     return result[0][0]
 
 
+def get_all_language_settings(pyexasol_conn: pyexasol.ExaConnection
+                              ) -> Dict[LanguageActivationLevel, str]:
+    """
+    Reads the current language settings at both levels, in one query.
+
+    pyexasol_conn    - Opened database connection.
+    """
+    result = pyexasol_conn.execute(
+        """SELECT "SYSTEM_VALUE", "SESSION_VALUE" FROM SYS.EXA_PARAMETERS WHERE
+        PARAMETER_NAME='SCRIPT_LANGUAGES'""").fetchall()
+    return {LanguageActivationLevel.System: result[0][0],
+            LanguageActivationLevel.Session: result[0][1]}
+
+
 def get_udf_path(bucket_base_path: bfs.path.PathLike, bucket_file: str) -> PurePosixPath:
     """
     Returns the path of the specified file in a bucket, as it's seen from a UDF
@@ -87,25 +126,74 @@ def get_udf_path(bucket_base_path: bfs.path.PathLike, bucket_file: str) -> PureP
     return PurePosixPath(file_path.as_udf_path())
 
 
-class LanguageContainerDeployer:
+def _get_alter_command(alter_type: LanguageActivationLevel, new_settings: ScriptLanguages) -> str:
+    return f"ALTER {alter_type.value} SET SCRIPT_LANGUAGES='{new_settings}';"
+
+
+class LanguageContainerDeployer(LanguageContainerUploader):
+    """
+    Uploads language containers to the BucketFS and activates them.
+
+    pyexasol_connection - Opened database connection.
+    language_alias      - Language alias the container is activated with.
+    warm_up_vms_per_node - If positive, a container is started in this number of VMs on every
+                          node after it has become operational, see the warm_up method. It is
+                          available as the warm_up_vms_per_node attribute.
+
+    The other parameters are those of the LanguageContainerUploader.
+    """
 
     def __init__(self,
                  pyexasol_connection: pyexasol.ExaConnection,
                  language_alias: str,
-                 bucketfs_path: bfs.path.PathLike) -> None:
-
-        self._bucketfs_path = bucketfs_path
+                 bucketfs_path: bfs.path.PathLike,
+                 metrics: Optional[DeploymentMetrics] = None,
+                 progress_callback: Optional[ProgressCallback] = None,
+                 check_container: bool = False,
+                 zero_copy_upload: bool = False,
+                 upload_buffer_size: int = DEFAULT_BUFFER_SIZE,
+                 warm_up_vms_per_node: int = 0,
+                 recompression_level: int = 0) -> None:
+
+        super().__init__(bucketfs_path, metrics, progress_callback, check_container,
+                         zero_copy_upload, upload_buffer_size, recompression_level)
         self._language_alias = language_alias
         self._pyexasol_conn = pyexasol_connection
+        self.warm_up_vms_per_node = warm_up_vms_per_node
+        # Reports of the warm-ups, keyed by the language alias.
+        self.warm_up_reports: Dict[str, WarmUpReport] = {}
+        # Snapshot of the language settings, read once and then kept up to date with our own changes.
+        self._language_settings: Optional[Dict[LanguageActivationLevel, str]] = None
         logger.debug("Init %s", LanguageContainerDeployer.__name__)
 
+    @property
+    def pyexasol_connection(self) -> pyexasol.ExaConnection:
+        return self._pyexasol_conn
+
+    @property
+    def language_alias(self) -> str:
+        return self._language_alias
+
+    def close(self) -> None:
+        """
+        Closes the database connection. A connection taken from a pool is returned to it.
+        """
+        self._pyexasol_conn.close()
+
     def download_and_run(self, url: str,
                          bucket_file_path: str,
                          alter_system: bool = True,
                          allow_override: bool = False,
-                         wait_for_completion: bool = True) -> None:
+                         wait_for_completion: bool = True,
+                         connections: int = 1,
+                         checksum: Optional[str] = None,
+                         cache: Optional[ContainerCache] = None) -> None:
         """
-        Downloads the language container from the provided url to a temporary file and then deploys it.
+        Streams the language container from the provided url directly into the BucketFS and
+        then activates it. The container is never fully held in memory or stored locally,
+        unless it is downloaded over multiple connections or verified against a checksum.
+        If a cache is provided, the container is taken from the cache, which downloads it
+        only if it's not cached yet or has changed since.
         See docstring on the `run` method for details on what is involved in the deployment.
 
         url              - Address where the container will be downloaded from.
@@ -114,21 +202,22 @@ class LanguageContainerDeployer:
         allow_override   - If True the activation of a language container with the same alias will be
                            overriden, otherwise a RuntimeException will be thrown.
         wait_for_completion - If True will wait until the language container becomes operational.
+        connections      - The maximum number of concurrent range requests of the download.
+        checksum         - The expected hex SHA-256 digest of the container.
+        cache            - A local cache of the downloaded containers.
         """
 
-        with tempfile.NamedTemporaryFile() as tmp_file:
-            response = requests.get(url, stream=True, timeout=300)
-            response.raise_for_status()
-            tmp_file.write(response.content)
-
-            self.run(Path(tmp_file.name), bucket_file_path, alter_system, allow_override,
-                     wait_for_completion)
+        self.upload_container_from_url(url, bucket_file_path, connections=connections,
+                                       checksum=checksum, cache=cache)
+        self.activate_and_wait(bucket_file_path, alter_system, allow_override,
+                                wait_for_completion)
 
     def run(self, container_file: Optional[Path] = None,
             bucket_file_path: Optional[str] = None,
             alter_system: bool = True,
             allow_override: bool = False,
-            wait_for_completion: bool = True) -> None:
+            wait_for_completion: bool = True,
+            skip_if_unchanged: bool = False) -> None:
         """
         Deploys the language container. This includes two steps, both of which are optional:
         - Uploading the container into the database. This step can be skipped if the container
@@ -145,6 +234,8 @@ class LanguageContainerDeployer:
         allow_override   - If True the activation of a language container with the same alias will be
                            overriden, otherwise a RuntimeException will be thrown.
         wait_for_completion - If True will wait until the language container becomes operational.
+        skip_if_unchanged - If True the upload will be skipped if the same container, as identified
+                           by its SHA-256 digest, is already in the bucket.
         """
 
         if not bucket_file_path:
@@ -153,48 +244,190 @@ class LanguageContainerDeployer:
             bucket_file_path = container_file.name
 
         if container_file:
-            self.upload_container(container_file, bucket_file_path)
+            self.upload_container(container_file, bucket_file_path,
+                                  skip_if_unchanged=skip_if_unchanged)
+
+        self.activate_and_wait(bucket_file_path, alter_system, allow_override,
+                                bool(container_file) and wait_for_completion)
+
+    def activate_and_wait(self, bucket_file_path: str,
+                          alter_system: bool = True,
+                          allow_override: bool = False,
+                          wait_for_completion: bool = True) -> Optional[timedelta]:
+        """
+        Activates an uploaded language container and, optionally, waits until it becomes
+        operational. In case the container does not get activated at the System level, two
+        alternative activation SQL commands will be printed on the console.
+
+        Returns the time it took for the container to become operational, after the activation,
+        or None if the wait_for_completion is False.
 
-        # Activate the language container.
+        bucket_file_path - Path within the designated bucket where the container is uploaded.
+        alter_system     - If True will try to activate the container at the System level.
+        allow_override   - If True the activation of a language container with the same alias will be
+                           overriden, otherwise a RuntimeException will be thrown.
+        wait_for_completion - If True will wait until the language container becomes operational.
+        """
+
+        self.activate(bucket_file_path, alter_system, allow_override)
+
+        # Maybe wait until the container becomes operational.
+        ready_after: Optional[timedelta] = None
+        if wait_for_completion:
+            with temp_schema(self._pyexasol_conn) as schema:
+                with self.metrics.phase(PHASE_VALIDATION, language_alias=self._language_alias):
+                    ready_after = wait_language_container(self._pyexasol_conn,
+                                                          self._language_alias, schema,
+                                                          metrics=self.metrics)
+                if self.warm_up_vms_per_node > 0:
+                    self.warm_up(schema)
+        return ready_after
+
+    def warm_up(self, schema: Optional[str] = None,
+                language_alias: Optional[str] = None) -> WarmUpReport:
+        """
+        Starts an operational language container on all nodes of the cluster, in the number
+        of VMs per node set by the warm_up_vms_per_node attribute, but at least in one.
+        Then the first real UDF call doesn't pay for the extraction of the container and
+        the start of the interpreter. See the warm_up_language_container function.
+
+        Returns the time each node took to warm up. The report is also stored in the
+        warm_up_reports attribute.
+
+        schema          - The schema to run the probe UDF in. If not specified, a temporary
+                          schema is created.
+        language_alias  - Language alias of the container. Defaults to the deployer's alias.
+        """
+        language_alias = language_alias or self._language_alias
+        with ExitStack() as stack:
+            if schema is None:
+                schema = stack.enter_context(temp_schema(self._pyexasol_conn))
+            with self.metrics.phase(PHASE_WARM_UP, language_alias=language_alias):
+                report = warm_up_language_container(self._pyexasol_conn, language_alias, schema,
+                                                    max(self.warm_up_vms_per_node, 1))
+        self.warm_up_reports[language_alias] = report
+        return report
+
+    def activate(self, bucket_file_path: str,
+                 alter_system: bool = True,
+                 allow_override: bool = False) -> None:
+        """
+        Activates an uploaded language container at the Session and, optionally, the System
+        level. In case the container does not get activated at the System level, two
+        alternative activation SQL commands will be printed on the console.
+
+        bucket_file_path - Path within the designated bucket where the container is uploaded.
+        alter_system     - If True will try to activate the container at the System level.
+        allow_override   - If True the activation of a language container with the same alias will be
+                           overriden, otherwise a RuntimeException will be thrown.
+        """
         if alter_system:
             self.activate_container(bucket_file_path, LanguageActivationLevel.System,
                                     allow_override)
         self.activate_container(bucket_file_path, LanguageActivationLevel.Session,
                                 allow_override)
-
-        # Maybe wait until the container becomes operational.
-        if container_file and wait_for_completion:
+        if not alter_system:
+            self._print_activation_commands([self._get_definition(bucket_file_path)])
+
+    def run_batch(self, containers: List[ContainerSpec],
+                  alter_system: bool = True,
+                  allow_override: bool = False,
+                  wait_for_completion: bool = True,
+                  skip_if_unchanged: bool = False,
+                  max_concurrency: int = 4) -> Dict[str, timedelta]:
+        """
+        Deploys several language containers, each with its own language alias, in one go:
+        - The containers are uploaded concurrently, up to max_concurrency at a time.
+        - All containers are activated together, with one ALTER command per level.
+        - The uploaded containers are validated together in one temporary schema.
+        In case the containers do not get activated at the System level, two alternative
+        activation SQL commands, covering all containers, will be printed on the console.
+
+        Returns the time it took for each uploaded container to become operational, after
+        the activation, keyed by the language alias. The result is empty if the
+        wait_for_completion is False.
+
+        containers       - The containers to be deployed. The language aliases must be unique.
+        alter_system     - If True will try to activate the containers at the System level.
+        allow_override   - If True the activation of a language container with the same alias will be
+                           overriden, otherwise a RuntimeException will be thrown.
+        wait_for_completion - If True will wait until the uploaded containers become operational.
+        skip_if_unchanged - If True the upload of a container file will be skipped if the same
+                           container is already in the bucket.
+        max_concurrency  - The maximum number of containers uploaded in parallel.
+        """
+        if max_concurrency < 1:
+            raise ValueError('The max_concurrency must be a positive number.')
+        aliases = [container.language_alias for container in containers]
+        if len(set(aliases)) != len(aliases):
+            raise ValueError('The language aliases must be unique.')
+        bucket_file_paths = [container.get_bucket_file_path() for container in containers]
+        self.upload_containers(containers, skip_if_unchanged, max_concurrency)
+
+        # Activate all containers at once.
+        definitions = [self._get_definition(bucket_file_path, container.language_alias)
+                       for container, bucket_file_path in zip(containers, bucket_file_paths)]
+        if alter_system:
+            self.update_language_settings(LanguageActivationLevel.System, definitions,
+                                          allow_override=allow_override)
+        self.update_language_settings(LanguageActivationLevel.Session, definitions,
+                                      allow_override=allow_override)
+
+        # Maybe wait until the uploaded containers become operational.
+        ready_after: Dict[str, timedelta] = {}
+        aliases = [container.language_alias for container in containers if container.has_source]
+        if wait_for_completion and aliases:
             with temp_schema(self._pyexasol_conn) as schema:
-                wait_language_container(self._pyexasol_conn, self._language_alias, schema)
+                with self.metrics.phase(PHASE_VALIDATION, language_alias=','.join(aliases)):
+                    ready_after = wait_language_containers(self._pyexasol_conn, aliases, schema,
+                                                           metrics=self.metrics)
+                if self.warm_up_vms_per_node > 0:
+                    for alias in aliases:
+                        self.warm_up(schema, alias)
 
         if not alter_system:
-            message = dedent(f"""
-            In SQL, you can activate the SLC
-            by using the following statements:
-
-            To activate the SLC only for the current session:
-            {self.generate_activation_command(bucket_file_path, LanguageActivationLevel.Session, True)}
-
-            To activate the SLC on the system:
-            {self.generate_activation_command(bucket_file_path, LanguageActivationLevel.System, True)}
-            """)
-            print(message)
-
-    def upload_container(self, container_file: Path,
-                         bucket_file_path: Optional[str] = None) -> None:
+            self._print_activation_commands(definitions)
+        return ready_after
+
+    def _print_activation_commands(self, definitions: List[LanguageDefinition]) -> None:
+        session_command = _get_alter_command(
+            LanguageActivationLevel.Session,
+            self._get_new_language_settings(LanguageActivationLevel.Session, definitions, (), True))
+        system_command = _get_alter_command(
+            LanguageActivationLevel.System,
+            self._get_new_language_settings(LanguageActivationLevel.System, definitions, (), True))
+        message = dedent(f"""
+        In SQL, you can activate the SLC
+        by using the following statements:
+
+        To activate the SLC only for the current session:
+        {session_command}
+
+        To activate the SLC on the system:
+        {system_command}
+        """)
+        print(message)
+
+    def collect_garbage(self, policy: RetentionPolicy, dry_run: bool = False,
+                        recursive: bool = False,
+                        allow_bucket_root: bool = False) -> RetentionReport:
         """
-        Upload the language container to the BucketFS.
-
-        container_file   - Path of the container tar.gz file in a local file system.
-        bucket_file_path - Path within the designated bucket where the container should be uploaded.
+        Deletes the containers in the BucketFS location that are not referenced in the current
+        SYSTEM and SESSION language settings, according to the retention policy,
+        see the collect_garbage function of the language_container_retention module.
+
+        policy            - The retention policy.
+        dry_run           - If True, only reports which containers would be deleted.
+        recursive         - If True, the subdirectories of the location are collected as well.
+        allow_bucket_root - If True, the containers can be collected at the root of the bucket,
+                            i.e. if the path in the bucket is empty.
         """
-        if not container_file.is_file():
-            raise RuntimeError(f"Container file {container_file} "
-                               f"is not a file.")
-        with open(container_file, "br") as f:
-            file_path = self._bucketfs_path / bucket_file_path
-            file_path.write(f)
-        logging.debug("Container is uploaded to bucketfs")
+        # The settings are read afresh, as deleting a container still in use can't be undone.
+        self.refresh_language_settings()
+        language_settings = self._get_language_settings_snapshot()
+        return collect_garbage(self._bucketfs_path, language_settings.values(), policy,
+                               dry_run=dry_run, recursive=recursive,
+                               allow_bucket_root=allow_bucket_root)
 
     def activate_container(self, bucket_file_path: str,
                            alter_type: LanguageActivationLevel = LanguageActivationLevel.Session,
@@ -207,9 +440,43 @@ class LanguageContainerDeployer:
         allow_override   - If True the activation of a language container with the same alias will be overriden,
                            otherwise a RuntimeException will be thrown.
         """
-        alter_command = self.generate_activation_command(bucket_file_path, alter_type, allow_override)
-        self._pyexasol_conn.execute(alter_command)
+        self.update_language_settings(alter_type, [self._get_definition(bucket_file_path)],
+                                      allow_override=allow_override)
+
+    def update_language_settings(self, alter_type: LanguageActivationLevel,
+                                 definitions: Iterable[LanguageDefinition] = (),
+                                 remove_aliases: Iterable[str] = (),
+                                 allow_override: bool = False) -> None:
+        """
+        Adds, replaces and removes multiple language definitions at the required level,
+        in a single ALTER command.
+
+        alter_type       - Language activation level.
+        definitions      - Language definitions to be added or replaced.
+        remove_aliases   - Language aliases which definitions should be removed.
+        allow_override   - If True existing definitions of the same aliases will be overriden,
+                           otherwise a RuntimeException will be thrown.
+        """
+        new_settings = self._get_new_language_settings(alter_type, definitions, remove_aliases,
+                                                       allow_override)
+        alter_command = _get_alter_command(alter_type, new_settings)
+        with self.metrics.phase(PHASE_ALTER, level=alter_type.value):
+            self._pyexasol_conn.execute(alter_command)
         logging.debug(alter_command)
+        self._get_language_settings_snapshot()[alter_type] = str(new_settings)
+
+    def refresh_language_settings(self) -> None:
+        """
+        Discards the snapshot of the language settings. The settings will be read from
+        the database again when needed. This is only required if the settings might have
+        been changed by someone else during the deployment.
+        """
+        self._language_settings = None
+
+    def _get_language_settings_snapshot(self) -> Dict[LanguageActivationLevel, str]:
+        if self._language_settings is None:
+            self._language_settings = get_all_language_settings(self._pyexasol_conn)
+        return self._language_settings
 
     def generate_activation_command(self, bucket_file_path: str,
                                     alter_type: LanguageActivationLevel,
@@ -224,23 +491,22 @@ class LanguageContainerDeployer:
         allow_override   - If True the activation of a language container with the same alias will be overriden,
                            otherwise a RuntimeException will be thrown.
         """
-        path_in_udf = get_udf_path(self._bucketfs_path, bucket_file_path)
-        new_settings = \
-            self._update_previous_language_settings(alter_type, allow_override, path_in_udf)
-        alter_command = \
-            f"ALTER {alter_type.value} SET SCRIPT_LANGUAGES='{new_settings}';"
-        return alter_command
-
-    def _update_previous_language_settings(self, alter_type: LanguageActivationLevel,
-                                           allow_override: bool,
-                                           path_in_udf: PurePosixPath) -> str:
-        prev_lang_settings = get_language_settings(self._pyexasol_conn, alter_type)
-        prev_lang_aliases = prev_lang_settings.split(" ")
-        self._check_if_requested_language_alias_already_exists(
-            allow_override, prev_lang_aliases)
-        new_definitions_str = self._generate_new_language_settings(
-            path_in_udf, prev_lang_aliases)
-        return new_definitions_str
+        new_settings = self._get_new_language_settings(
+            alter_type, [self._get_definition(bucket_file_path)], (), allow_override)
+        return _get_alter_command(alter_type, new_settings)
+
+    def _get_new_language_settings(self, alter_type: LanguageActivationLevel,
+                                   definitions: Iterable[LanguageDefinition],
+                                   remove_aliases: Iterable[str],
+                                   allow_override: bool) -> ScriptLanguages:
+        definitions = list(definitions)
+        languages = ScriptLanguages.parse(self._get_language_settings_snapshot()[alter_type])
+        for definition in definitions:
+            self._check_if_requested_language_alias_already_exists(
+                allow_override, definition.alias, languages)
+        languages.remove(remove_aliases)
+        languages.update(definitions)
+        return languages
 
     def get_language_definition(self, bucket_file_path: str):
         """
@@ -248,32 +514,21 @@ class LanguageContainerDeployer:
 
         bucket_file_path - Path within the designated bucket where the container is uploaded.
         """
+        return str(self._get_definition(bucket_file_path))
+
+    def _get_definition(self, bucket_file_path: str,
+                        language_alias: Optional[str] = None) -> LanguageDefinition:
         path_in_udf = get_udf_path(self._bucketfs_path, bucket_file_path)
-        result = self._generate_new_language_settings(path_in_udf=path_in_udf, prev_lang_aliases=[])
-        return result
-
-    def _generate_new_language_settings(self, path_in_udf: PurePosixPath,
-                                        prev_lang_aliases: List[str]) -> str:
-        other_definitions = [
-            alias_definition for alias_definition in prev_lang_aliases
-            if not alias_definition.startswith(self._language_alias + "=")]
-        path_in_udf_without_buckets = PurePosixPath(*path_in_udf.parts[2:])
-        new_language_alias_definition = \
-            f"{self._language_alias}=localzmq+protobuf:///" \
-            f"{path_in_udf_without_buckets}?lang=python#" \
-            f"{path_in_udf}/exaudf/exaudfclient_py3"
-        new_definitions = other_definitions + [new_language_alias_definition]
-        new_definitions_str = " ".join(new_definitions)
-        return new_definitions_str
+        return LanguageDefinition.for_container(language_alias or self._language_alias,
+                                                path_in_udf)
 
+    @staticmethod
     def _check_if_requested_language_alias_already_exists(
-            self, allow_override: bool,
-            prev_lang_aliases: List[str]) -> None:
-        definition_for_requested_alias = [
-            alias_definition for alias_definition in prev_lang_aliases
-            if alias_definition.startswith(self._language_alias + "=")]
-        if not len(definition_for_requested_alias) == 0:
-            warning_message = f"The requested language alias {self._language_alias} is already in use."
+            allow_override: bool,
+            language_alias: str,
+            prev_languages: ScriptLanguages) -> None:
+        if language_alias in prev_languages:
+            warning_message = f"The requested language alias {language_alias} is already in use."
             if allow_override:
                 logging.warning(warning_message)
             else:
@@ -293,7 +548,32 @@ class LanguageContainerDeployer:
                path_in_bucket: str = '',
                use_ssl_cert_validation: bool = True, ssl_trusted_ca: Optional[str] = None,
                ssl_client_certificate: Optional[str] = None,
-               ssl_private_key: Optional[str] = None) -> "LanguageContainerDeployer":
+               ssl_private_key: Optional[str] = None,
+               metrics: Optional[DeploymentMetrics] = None,
+               pool: Optional[PyexasolConnectionPool] = None,
+               saas_cache: Optional[SaasLookupCache] = None,
+               progress_callback: Optional[ProgressCallback] = None,
+               check_container: bool = False,
+               zero_copy_upload: bool = False,
+               upload_buffer_size: int = DEFAULT_BUFFER_SIZE,
+               warm_up_vms_per_node: int = 0,
+               recompression_level: int = 0) -> LanguageContainerDeployer:
+        """
+        Creates a deployer for either an On-Prem or a SaaS database, depending on the
+        provided parameters. If a connection pool is provided, the database connection is
+        taken from it, when possible, and returned to it by the deployer's close method.
+        Note, that the returned connection keeps the language settings activated at the
+        SESSION level. If a SaaS lookup cache is provided, the SaaS database id and connection
+        parameters are taken from it, when possible. They are invalidated in the cache if
+        the connection fails. The recompression is not supported for a SaaS database,
+        a ValueError is raised if the recompression_level is positive.
+        """
+        # pylint: disable=import-outside-toplevel
+        import pyexasol     # type: ignore
+        import exasol.bucketfs as bfs   # type: ignore
+
+        # The SaaS lookups of the connection, if it is a SaaS database.
+        saas_lookup: Optional[Dict[str, str]] = None
 
         # Infer where the database is - on-prem or SaaS.
         if all((dsn, db_user, db_password, bucketfs_host, bucketfs_port,
@@ -313,18 +593,21 @@ class LanguageContainerDeployer:
 
         elif all((saas_url, saas_account_id, saas_token,
                   any((saas_database_id, saas_database_name)))):
-            connection_params = get_connection_params(host=saas_url,
-                                                      account_id=saas_account_id,
-                                                      database_id=saas_database_id,
-                                                      database_name=saas_database_name,
-                                                      pat=saas_token)
-            saas_database_id = (saas_database_id or
-                                get_database_id(
-                                    host=saas_url,
-                                    account_id=saas_account_id,
-                                    pat=saas_token,
-                                    database_name=saas_database_name
-                                ))
+            # The size of a recompressed container is not known in advance. An upload without
+            # the Content-Length may be rejected by the object store behind the SaaS BucketFS.
+            if recompression_level > 0:
+                raise ValueError('The recompression is not supported for a SaaS database.')
+            # Without a cache, a private one still saves a second lookup of the database id.
+            saas_cache = saas_cache or SaasLookupCache()
+            # The all() above doesn't narrow the types.
+            assert saas_url and saas_account_id and saas_token
+            saas_lookup = {'host': saas_url, 'account_id': saas_account_id, 'pat': saas_token}
+            if not saas_database_id:
+                assert saas_database_name
+                saas_database_id = saas_cache.get_database_id(**saas_lookup,
+                                                              database_name=saas_database_name)
+            connection_params = saas_cache.get_connection_params(**saas_lookup,
+                                                                 database_id=saas_database_id)
             bucketfs_path = bfs.path.build_path(backend=bfs.path.StorageBackend.saas,
                                                 url=saas_url,
                                                 account_id=saas_account_id,
@@ -342,8 +625,24 @@ class LanguageContainerDeployer:
         websocket_sslopt = get_websocket_sslopt(use_ssl_cert_validation, ssl_trusted_ca,
                                                 ssl_client_certificate, ssl_private_key)
 
-        pyexasol_conn = pyexasol.connect(**connection_params,
-                                         encryption=True,
-                                         websocket_sslopt=websocket_sslopt)
-
-        return cls(pyexasol_conn, language_alias, bucketfs_path)
+        metrics = metrics or DeploymentMetrics()
+        with metrics.phase(PHASE_CONNECT, pooled=pool is not None):
+            try:
+                if pool is None:
+                    pyexasol_conn = pyexasol.connect(**connection_params,
+                                                     encryption=True,
+                                                     websocket_sslopt=websocket_sslopt)
+                else:
+                    pyexasol_conn = pool.connect(**connection_params,
+                                                 encryption=True,
+                                                 websocket_sslopt=websocket_sslopt)
+            except Exception:
+                # Only the lookups of a SaaS database are in the cache.
+                if (saas_cache is not None) and (saas_lookup is not None):
+                    saas_cache.invalidate(**saas_lookup, database_id=saas_database_id,
+                                          database_name=saas_database_name)
+                raise
+
+        return cls(pyexasol_conn, language_alias, bucketfs_path, metrics, progress_callback,
+                   check_container, zero_copy_upload, upload_buffer_size, warm_up_vms_per_node,
+                   recompression_level)
@@ -1,10 +1,24 @@
-from typing import Optional, Any
+from typing import Optional, Any, Tuple
 import os
 import re
+import sys
 from enum import Enum
+from datetime import timedelta
 from pathlib import Path
 import click
-from exasol.python_extension_common.deployment.language_container_deployer import LanguageContainerDeployer
+from exasol.python_extension_common.deployment.language_container_deployer import (
+    LanguageContainerDeployer, ContainerSpec)
+from exasol.python_extension_common.deployment.deployment_metrics import DeploymentMetrics
+from exasol.python_extension_common.deployment.language_container_download import (
+    get_published_checksum)
+from exasol.python_extension_common.deployment.language_container_cache import (
+    ContainerCache, DEFAULT_MAX_CACHE_SIZE)
+from exasol.python_extension_common.deployment.transfer_progress import (
+    ProgressCallback, TransferProgress, format_progress)
+from exasol.python_extension_common.deployment.mapped_file import DEFAULT_BUFFER_SIZE
+from exasol.python_extension_common.deployment.language_container_retention import (
+    RetentionPolicy)
+from exasol.python_extension_common.connections.saas_lookup_cache import SaasLookupCache
 
 
 class CustomizableParameters(Enum):
@@ -98,6 +112,39 @@ class SecretParams(Enum):
     SAAS_TOKEN = 'saas-token'
 
 
+def _get_container_spec(language_alias: str, source: str, bucket_file_path: str,
+                        upload_container: bool) -> ContainerSpec:
+    """
+    Makes a container specification out of a --batch-container entry. The source is either
+    a url, if it starts with http:// or https://, or a path of a local container file.
+    """
+    if not upload_container:
+        return ContainerSpec(language_alias, bucket_file_path=bucket_file_path)
+    if re.match(r'https?://', source):
+        return ContainerSpec(language_alias, container_url=source,
+                             bucket_file_path=bucket_file_path)
+    return ContainerSpec(language_alias, container_file=Path(source),
+                         bucket_file_path=bucket_file_path)
+
+
+def _get_container_cache(cache_dir: Optional[str], max_size_mb: int) -> Optional[ContainerCache]:
+    if not cache_dir:
+        return None
+    return ContainerCache(Path(cache_dir), max_size_mb * 1024 * 1024)
+
+
+def _print_progress(progress: TransferProgress) -> None:
+    # The line is redrawn in place and ended when the transfer is done.
+    click.echo('\r' + format_progress(progress) + '\x1b[K', nl=progress.done, err=True)
+
+
+def _get_progress_callback(show_progress: Optional[bool]) -> Optional[ProgressCallback]:
+    # By default, the progress is shown only in a terminal.
+    if show_progress is None:
+        show_progress = sys.stderr.isatty()
+    return _print_progress if show_progress else None
+
+
 def secret_callback(ctx: click.Context, param: click.Option, value: Any):
     """
     Here we try to get the secret parameter value from an environment variable.
@@ -130,6 +177,7 @@ def secret_callback(ctx: click.Context, param: click.Option, value: Any):
               prompt='SaaS database id', prompt_required=False,
               hide_input=True, default=SECRET_DISPLAY, callback=secret_callback)
 @click.option('--saas-database-name', type=str)
+@click.option('--saas-cache-file', type=click.Path(dir_okay=False))
 @click.option(f'--{SecretParams.SAAS_TOKEN.value}', type=str,
               prompt='SaaS token', prompt_required=False,
               hide_input=True, default=SECRET_DISPLAY, callback=secret_callback)
@@ -152,6 +200,27 @@ def secret_callback(ctx: click.Context, param: click.Option, value: Any):
 @click.option('--alter-system/--no-alter-system', type=bool, default=True)
 @click.option('--allow-override/--disallow-override', type=bool, default=False)
 @click.option('--wait_for_completion/--no-wait_for_completion', type=bool, default=True)
+@click.option('--skip-if-unchanged/--no-skip-if-unchanged', type=bool, default=False)
+@click.option('--batch-container', type=(str, str, str), multiple=True,
+              metavar='ALIAS SOURCE BUCKET_PATH')
+@click.option('--download-connections', type=click.IntRange(min=1), default=1)
+@click.option('--container-checksum', type=str)
+@click.option('--container-cache-dir', type=click.Path(file_okay=False))
+@click.option('--container-cache-size', type=click.IntRange(min=0),
+              default=DEFAULT_MAX_CACHE_SIZE // (1024 * 1024))
+@click.option('--progress/--no-progress', 'show_progress', type=bool, default=None)
+@click.option('--check-container/--no-check-container', type=bool, default=False)
+@click.option('--zero-copy-upload/--no-zero-copy-upload', type=bool, default=False)
+@click.option('--upload-buffer-size', type=click.IntRange(min=1),
+              default=DEFAULT_BUFFER_SIZE // 1024)
+@click.option('--warm-up-vms-per-node', type=click.IntRange(min=0), default=0)
+@click.option('--recompression-level', type=click.IntRange(min=0, max=9), default=0)
+@click.option('--keep-last-containers', type=click.IntRange(min=0))
+@click.option('--container-max-age', type=click.FloatRange(min=0), metavar='HOURS')
+@click.option('--gc-dry-run/--no-gc-dry-run', type=bool, default=False)
+@click.option('--gc-allow-bucket-root/--no-gc-allow-bucket-root', type=bool, default=False)
+@click.option('--metrics-file', type=click.Path(dir_okay=False, writable=True))
+@click.option('--metrics-format', type=click.Choice(['json', 'prometheus']), default='json')
 def language_container_deployer_main(
         bucketfs_name: str,
         bucketfs_host: str,
@@ -164,6 +233,7 @@ def language_container_deployer_main(
         saas_account_id: str,
         saas_database_id: str,
         saas_database_name: str,
+        saas_cache_file: Optional[str],
         saas_token: str,
         path_in_bucket: str,
         container_file: str,
@@ -179,42 +249,112 @@ def language_container_deployer_main(
         alter_system: bool,
         allow_override: bool,
         wait_for_completion: bool,
+        skip_if_unchanged: bool,
+        batch_container: Tuple[Tuple[str, str, str], ...] = (),
+        download_connections: int = 1,
+        container_checksum: Optional[str] = None,
+        container_cache_dir: Optional[str] = None,
+        container_cache_size: int = DEFAULT_MAX_CACHE_SIZE // (1024 * 1024),
+        show_progress: Optional[bool] = None,
+        check_container: bool = False,
+        zero_copy_upload: bool = False,
+        upload_buffer_size: int = DEFAULT_BUFFER_SIZE // 1024,
+        warm_up_vms_per_node: int = 0,
+        recompression_level: int = 0,
+        keep_last_containers: Optional[int] = None,
+        container_max_age: Optional[float] = None,
+        gc_dry_run: bool = False,
+        gc_allow_bucket_root: bool = False,
+        metrics_file: Optional[str] = None,
+        metrics_format: str = 'json',
         container_url: Optional[str] = None,
         container_name: Optional[str] = None):
 
-    deployer = LanguageContainerDeployer.create(
-        bucketfs_name=bucketfs_name,
-        bucketfs_host=bucketfs_host,
-        bucketfs_port=bucketfs_port,
-        bucketfs_use_https=bucketfs_use_https,
-        bucketfs_user=bucketfs_user,
-        bucketfs_password=bucketfs_password,
-        bucket=bucket,
-        saas_url=saas_url,
-        saas_account_id=saas_account_id,
-        saas_database_id=saas_database_id,
-        saas_database_name=saas_database_name,
-        saas_token=saas_token,
-        path_in_bucket=path_in_bucket,
-        dsn=dsn,
-        db_user=db_user,
-        db_password=db_pass,
-        language_alias=language_alias,
-        ssl_trusted_ca=ssl_cert_path,
-        ssl_client_certificate=ssl_client_cert_path,
-        ssl_private_key=ssl_client_private_key,
-        use_ssl_cert_validation=use_ssl_cert_validation)
+    policy: Optional[RetentionPolicy] = None
+    if (keep_last_containers is not None) or (container_max_age is not None):
+        policy = RetentionPolicy(
+            keep_last=keep_last_containers,
+            max_age=None if container_max_age is None else timedelta(hours=container_max_age))
+        # Checked before the deployment, rather than failing after it.
+        if not (path_in_bucket or gc_allow_bucket_root):
+            raise ValueError("The garbage collection at the root of the bucket must be allowed "
+                             "with the --gc-allow-bucket-root option.")
 
-    if not upload_container:
-        deployer.run(alter_system=alter_system, allow_override=allow_override,
-                     wait_for_completion=wait_for_completion)
-    elif container_file:
-        deployer.run(container_file=Path(container_file), alter_system=alter_system,
-                     allow_override=allow_override, wait_for_completion=wait_for_completion)
-    elif container_url and container_name:
-        deployer.download_and_run(container_url, container_name, alter_system=alter_system,
-                                  allow_override=allow_override, wait_for_completion=wait_for_completion)
-    else:
-        # The error message should mention the parameters which the callback is specified for being missed.
-        raise ValueError("To upload a language container you should specify either its "
-                         "release version or a path of the already downloaded container file.")
+    # The deployer connects to a SaaS database only if the On-Prem parameters are incomplete.
+    # The SaaS lookups are only cached for such a target.
+    saas_cache: Optional[SaasLookupCache] = None
+    if saas_cache_file and all((saas_url, saas_account_id, saas_token)) and not all((
+            dsn, db_user, db_pass, bucketfs_host, bucketfs_port, bucketfs_name, bucket,
+            bucketfs_user, bucketfs_password)):
+        saas_cache = SaasLookupCache(cache_file=Path(saas_cache_file))
+
+    metrics = DeploymentMetrics()
+    try:
+        deployer = LanguageContainerDeployer.create(
+            bucketfs_name=bucketfs_name,
+            bucketfs_host=bucketfs_host,
+            bucketfs_port=bucketfs_port,
+            bucketfs_use_https=bucketfs_use_https,
+            bucketfs_user=bucketfs_user,
+            bucketfs_password=bucketfs_password,
+            bucket=bucket,
+            saas_url=saas_url,
+            saas_account_id=saas_account_id,
+            saas_database_id=saas_database_id,
+            saas_database_name=saas_database_name,
+            saas_token=saas_token,
+            path_in_bucket=path_in_bucket,
+            dsn=dsn,
+            db_user=db_user,
+            db_password=db_pass,
+            language_alias=language_alias,
+            ssl_trusted_ca=ssl_cert_path,
+            ssl_client_certificate=ssl_client_cert_path,
+            ssl_private_key=ssl_client_private_key,
+            use_ssl_cert_validation=use_ssl_cert_validation,
+            metrics=metrics,
+            saas_cache=saas_cache,
+            progress_callback=_get_progress_callback(show_progress),
+            check_container=check_container,
+            zero_copy_upload=zero_copy_upload,
+            upload_buffer_size=upload_buffer_size * 1024,
+            warm_up_vms_per_node=warm_up_vms_per_node,
+            recompression_level=recompression_level)
+
+        if batch_container:
+            containers = [_get_container_spec(*entry, upload_container=upload_container)
+                          for entry in batch_container]
+            deployer.run_batch(containers, alter_system=alter_system, allow_override=allow_override,
+                               wait_for_completion=wait_for_completion,
+                               skip_if_unchanged=skip_if_unchanged)
+        elif not upload_container:
+            deployer.run(alter_system=alter_system, allow_override=allow_override,
+                         wait_for_completion=wait_for_completion)
+        elif container_file:
+            deployer.run(container_file=Path(container_file), alter_system=alter_system,
+                         allow_override=allow_override, wait_for_completion=wait_for_completion,
+                         skip_if_unchanged=skip_if_unchanged)
+        elif container_url and container_name:
+            if container_checksum and container_checksum.startswith(('http://', 'https://')):
+                container_checksum = get_published_checksum(container_checksum)
+            deployer.download_and_run(container_url, container_name, alter_system=alter_system,
+                                      allow_override=allow_override, wait_for_completion=wait_for_completion,
+                                      connections=download_connections, checksum=container_checksum,
+                                      cache=_get_container_cache(container_cache_dir,
+                                                                 container_cache_size))
+        else:
+            # The error message should mention the parameters which the callback is specified for being missed.
+            raise ValueError("To upload a language container you should specify either its "
+                             "release version or a path of the already downloaded container file.")
+        for bucket_file_path, recompression_report in deployer.recompression_reports.items():
+            click.echo(f'Recompressed {bucket_file_path}: {recompression_report}.', err=True)
+        for alias, warm_up_report in deployer.warm_up_reports.items():
+            click.echo(f'The language container {alias}: {warm_up_report}.', err=True)
+        if policy is not None:
+            retention_report = deployer.collect_garbage(policy, dry_run=gc_dry_run,
+                                                        allow_bucket_root=gc_allow_bucket_root)
+            click.echo(str(retention_report), err=True)
+    finally:
+        # The metrics are written also if the deployment fails.
+        if metrics_file:
+            metrics.write(Path(metrics_file), metrics_format)
@@ -0,0 +1,154 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+from pathlib import Path
+import hashlib
+import json
+import logging
+
+if TYPE_CHECKING:
+    import exasol.bucketfs as bfs   # type: ignore
+
+from exasol.python_extension_common.deployment.sized_reader import CountingReader, ReadableStream
+
+logger = logging.getLogger(__name__)
+
+# Suffix of the manifest file stored in the BucketFS next to the container archive.
+MANIFEST_SUFFIX = '.sha256'
+
+# Suffix of the file where the digest of a local container is cached.
+DIGEST_CACHE_SUFFIX = '.sha256.json'
+
+_READ_CHUNK_SIZE = 1024 * 1024
+
+
+class HashingReader(CountingReader):
+    """
+    A read-only binary stream that computes the SHA-256 digest of the data
+    read from the underlying stream, as it passes through.
+
+    stream  - The underlying stream.
+    """
+    def __init__(self, stream: ReadableStream) -> None:
+        super().__init__()
+        self._stream = stream
+        self._hash = hashlib.sha256()
+
+    def _readinto(self, buffer) -> int:
+        size = self._stream.readinto(buffer)     # type: ignore
+        if size:
+            self._hash.update(memoryview(buffer)[:size])
+        return size or 0
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+def _get_cache_path(container_file: Path) -> Path:
+    return container_file.with_name(container_file.name + DIGEST_CACHE_SUFFIX)
+
+
+def _get_file_signature(container_file: Path) -> dict[str, int]:
+    stat = container_file.stat()
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def get_cached_digest(container_file: Path, variant: str = '') -> str | None:
+    """
+    Returns the cached SHA-256 digest of a local container file, or None if the digest
+    hasn't been cached, or the file has changed since the digest was computed.
+
+    container_file  - Path of the container tar.gz file in a local file system.
+    variant         - Identifies a transformation of the file the digest has been computed
+                      after, e.g. a recompression. Empty for the file as it is.
+    """
+    cache_path = _get_cache_path(container_file)
+    try:
+        cache = json.loads(cache_path.read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cache, dict):
+        return None
+    if {k: cache.get(k) for k in ('size', 'mtime_ns')} != _get_file_signature(container_file):
+        return None
+    if cache.get('variant', '') != variant:
+        return None
+    return cache.get('sha256')
+
+
+def cache_digest(container_file: Path, digest: str, variant: str = '') -> None:
+    """
+    Saves the SHA-256 digest of a local container file next to the file.
+    Failing to save the digest is not an error, the digest will be recomputed next time.
+
+    container_file  - Path of the container tar.gz file in a local file system.
+    digest          - The hex SHA-256 digest of the file.
+    variant         - Identifies a transformation of the file the digest has been computed
+                      after, e.g. a recompression. Empty for the file as it is.
+    """
+    cache = {'sha256': digest, **_get_file_signature(container_file)}
+    if variant:
+        cache['variant'] = variant
+    try:
+        _get_cache_path(container_file).write_text(json.dumps(cache))
+    except OSError as ex:
+        logger.debug("Cannot cache the digest of %s: %s", container_file, ex)
+
+
+def get_container_digest(container_file: Path) -> str:
+    """
+    Returns the SHA-256 digest of a local container file, using the cached value if
+    it is still valid. Otherwise, computes the digest and caches it.
+
+    container_file  - Path of the container tar.gz file in a local file system.
+    """
+    digest = get_cached_digest(container_file)
+    if digest is None:
+        with open(container_file, 'rb') as f:
+            reader = HashingReader(f)
+            while reader.read(_READ_CHUNK_SIZE):
+                pass
+        digest = reader.hexdigest()
+        cache_digest(container_file, digest)
+    return digest
+
+
+def get_manifest_path(bucket_file_path: bfs.path.PathLike) -> bfs.path.PathLike:
+    """
+    Returns the path of the manifest file for a container archive in the BucketFS.
+    """
+    return bucket_file_path.parent / (bucket_file_path.name + MANIFEST_SUFFIX)
+
+
+def read_manifest(bucket_file_path: bfs.path.PathLike) -> str | None:
+    """
+    Reads the SHA-256 digest recorded in the manifest of a container archive in the BucketFS.
+    Returns None if either the archive or its manifest doesn't exist.
+
+    bucket_file_path - Path of the container archive in the BucketFS.
+    """
+    manifest_path = get_manifest_path(bucket_file_path)
+    if not (bucket_file_path.exists() and manifest_path.exists()):
+        return None
+    content = b''.join(manifest_path.read()).decode('utf-8').split()
+    return content[0] if content else None
+
+
+def write_manifest(bucket_file_path: bfs.path.PathLike, digest: str) -> None:
+    """
+    Writes the manifest of a container archive in the BucketFS. The manifest has
+    the format of the sha256sum output.
+
+    bucket_file_path - Path of the container archive in the BucketFS.
+    digest           - The hex SHA-256 digest of the archive.
+    """
+    manifest_path = get_manifest_path(bucket_file_path)
+    manifest_path.write(f'{digest}  {bucket_file_path.name}\n'.encode('utf-8'))
+
+
+def remove_manifest(bucket_file_path: bfs.path.PathLike) -> None:
+    """
+    Deletes the manifest of a container archive in the BucketFS.
+
+    bucket_file_path - Path of the container archive in the BucketFS.
+    """
+    get_manifest_path(bucket_file_path).rm()
@@ -0,0 +1,263 @@
+from __future__ import annotations
+from typing import Optional, TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+import hashlib
+import logging
+import re
+
+from tenacity import retry, retry_if_not_exception_type
+from tenacity.wait import wait_exponential
+from tenacity.stop import stop_after_attempt
+
+if TYPE_CHECKING:
+    import requests     # type: ignore
+
+from exasol.python_extension_common.deployment.transfer_progress import (
+    OPERATION_DOWNLOAD, ProgressCallback, ProgressTracker)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONNECTIONS = 4
+
+# Files smaller than twice this size are downloaded in a single stream. A range request
+# has a fixed cost, which only pays off for large enough ranges.
+MIN_RANGE_SIZE = 8 * 1024 * 1024
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+DOWNLOAD_TIMEOUT = 300
+
+_CONTENT_RANGE_PATTERN = re.compile(r'bytes\s+(\d+)-(\d+)/(\d+|\*)')
+
+_SHA256_PATTERN = re.compile(r'[0-9a-fA-F]{64}')
+
+
+class RangesNotSupportedError(RuntimeError):
+    """
+    Raised when the server has answered a range request with something else
+    than the requested range, e.g. with the whole file.
+    """
+
+
+@dataclass(frozen=True)
+class DownloadInfo:
+    """
+    What the server has told about a file before it is downloaded.
+
+    url             - The address of the file, after following the redirects.
+    size            - Size of the file, None if it is unknown.
+    accepts_ranges  - True if the file can be downloaded in byte ranges.
+    etag            - The entity tag of the file, if provided.
+    """
+    url: str
+    size: Optional[int]
+    accepts_ranges: bool
+    etag: Optional[str] = None
+
+
+def _get_response_size(response: requests.Response) -> Optional[int]:
+    headers = response.headers
+    content_length = headers.get('Content-Length')
+    # A content-encoded response has no stable byte offsets.
+    return int(content_length) if (content_length and not headers.get('Content-Encoding')) \
+        else None
+
+
+def probe_download(url: str, timeout: int = DOWNLOAD_TIMEOUT) -> DownloadInfo:
+    """
+    Finds out the size of a file and whether the server supports range requests for it,
+    using a HEAD request.
+
+    url     - Address of the file.
+    timeout - The http request timeout, in seconds.
+    """
+    import requests     # type: ignore     # pylint: disable=import-outside-toplevel
+
+    with requests.head(url, allow_redirects=True, timeout=timeout) as response:
+        response.raise_for_status()
+        headers = response.headers
+        size = _get_response_size(response)
+        accepts_ranges = (size is not None) and (headers.get('Accept-Ranges', '').lower() == 'bytes')
+        return DownloadInfo(response.url, size, accepts_ranges, headers.get('ETag'))
+
+
+def get_published_checksum(url: str, timeout: int = DOWNLOAD_TIMEOUT) -> str:
+    """
+    Downloads a published SHA-256 checksum, e.g. a file in the sha256sum output format,
+    and returns the hex digest it starts with.
+
+    url     - Address of the checksum file.
+    timeout - The http request timeout, in seconds.
+    """
+    import requests     # type: ignore     # pylint: disable=import-outside-toplevel
+
+    response = requests.get(url, timeout=timeout)
+    response.raise_for_status()
+    match = _SHA256_PATTERN.match(response.text.strip())
+    if not match:
+        raise ValueError(f'No SHA-256 checksum found at {url}.')
+    return match.group(0).lower()
+
+
+def _get_ranges(size: int, connections: int, min_range_size: int) -> list[tuple[int, int]]:
+    """
+    Splits a file into up to the given number of ranges of equal size, each with at least
+    the min_range_size bytes. The ranges are pairs of the first and last byte position.
+    """
+    count = max(1, min(connections, size // max(min_range_size, 1)))
+    range_size = -(-size // count)
+    return [(start, min(start + range_size, size) - 1) for start in range(0, size, range_size)]
+
+
+def _check_content_range(response: requests.Response, first: int, last: int) -> None:
+    if response.status_code != 206:
+        raise RangesNotSupportedError(f'The server answered a range request with the status '
+                                      f'{response.status_code}.')
+    match = _CONTENT_RANGE_PATTERN.fullmatch(response.headers.get('Content-Range', '').strip())
+    if (not match) or (int(match.group(1)), int(match.group(2))) != (first, last):
+        raise RangesNotSupportedError(f'The server answered a request of the range {first}-{last} '
+                                      f'with the range {response.headers.get("Content-Range")}.')
+
+
+def _download_range(info: DownloadInfo, target: Path, first: int, last: int,
+                    chunk_size: int, timeout: int, tracker: Optional[ProgressTracker]) -> None:
+    import requests     # type: ignore     # pylint: disable=import-outside-toplevel
+
+    # A retried request starts again at the first byte of the range. Only the bytes beyond
+    # those already reported count as progress, so that the total doesn't exceed the size.
+    reported = first
+
+    @retry(reraise=True, retry=retry_if_not_exception_type(RangesNotSupportedError),
+           wait=wait_exponential(multiplier=1, min=1, max=10), stop=stop_after_attempt(3))
+    def download() -> None:
+        nonlocal reported
+        headers = {'Range': f'bytes={first}-{last}'}
+        if info.etag:
+            # Should the file change in between, the server will send all of it, not a range.
+            headers['If-Range'] = info.etag
+        with requests.get(info.url, headers=headers, stream=True, timeout=timeout) as response, \
+                open(target, 'r+b') as f:
+            response.raise_for_status()
+            _check_content_range(response, first, last)
+            f.seek(first)
+            position = first
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                f.write(chunk)
+                position += len(chunk)
+                if (tracker is not None) and (position > reported):
+                    tracker.update(position - reported)
+                    reported = position
+        if position != last + 1:
+            raise RuntimeError(f'The download of the range {first}-{last} ended at {position}.')
+
+    download()
+
+
+def _download_ranges(info: DownloadInfo, target: Path, ranges: list[tuple[int, int]],
+                     chunk_size: int, timeout: int, progress: Optional[ProgressCallback]) -> str:
+    assert info.size is not None
+    with open(target, 'wb') as f:
+        f.truncate(info.size)
+    tracker = ProgressTracker(OPERATION_DOWNLOAD, info.size, progress) if progress else None
+    with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+        futures = [executor.submit(_download_range, info, target, first, last, chunk_size,
+                                   timeout, tracker)
+                   for first, last in ranges]
+        for future in futures:
+            future.result()
+    if tracker is not None:
+        tracker.finish()
+
+    # The ranges arrive out of order, hence the digest can only be computed afterwards.
+    sha256 = hashlib.sha256()
+    with open(target, 'rb') as f:
+        while chunk := f.read(chunk_size):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def _download_stream(url: str, target: Path, chunk_size: int, timeout: int,
+                     size: Optional[int], progress: Optional[ProgressCallback]) -> str:
+    import requests     # type: ignore     # pylint: disable=import-outside-toplevel
+
+    sha256 = hashlib.sha256()
+    tracker = None
+    with requests.get(url, stream=True, timeout=timeout) as response, open(target, 'wb') as f:
+        response.raise_for_status()
+        if progress is not None:
+            if size is None:
+                size = _get_response_size(response)
+            tracker = ProgressTracker(OPERATION_DOWNLOAD, size, progress)
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            f.write(chunk)
+            sha256.update(chunk)
+            if tracker is not None:
+                tracker.update(len(chunk))
+    if tracker is not None:
+        tracker.finish()
+    return sha256.hexdigest()
+
+
+def download_container(url: str, target: Path,
+                       connections: int = DEFAULT_CONNECTIONS,
+                       checksum: Optional[str] = None,
+                       chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+                       min_range_size: int = MIN_RANGE_SIZE,
+                       timeout: int = DOWNLOAD_TIMEOUT,
+                       progress: Optional[ProgressCallback] = None) -> str:
+    """
+    Downloads a language container into a local file. If the server supports range requests
+    and the file is large enough, it is fetched in multiple byte ranges concurrently, each
+    written at its offset into the preallocated file. Otherwise, or if the server rejects
+    the HEAD request probing the file or turns out to ignore the ranges, the file is
+    downloaded in a single stream.
+
+    Returns the SHA-256 digest of the downloaded file. If a checksum is provided and the digest
+    doesn't match it, the file is deleted and a RuntimeError is raised.
+
+    url             - Address where the container will be downloaded from.
+    target          - Path of the local file the container is saved to.
+    connections     - The maximum number of concurrent range requests.
+    checksum        - The expected hex SHA-256 digest of the container.
+    chunk_size      - Size of the chunks the responses are read in.
+    min_range_size  - The minimum size of a range.
+    timeout         - The http request timeout, in seconds.
+    progress        - A function receiving the progress of the download.
+    """
+    import requests     # type: ignore     # pylint: disable=import-outside-toplevel
+
+    if connections < 1:
+        raise ValueError('The number of connections must be a positive number.')
+    try:
+        digest: Optional[str] = None
+        # A single connection downloads a single stream, which needs no probe.
+        info = DownloadInfo(url, size=None, accepts_ranges=False)
+        if connections > 1:
+            try:
+                info = probe_download(url, timeout)
+            except requests.RequestException as ex:
+                # Some servers reject the HEAD requests, e.g. with 403 or 405.
+                logger.info('Falling back to a single stream download of %s: %s', url, ex)
+        if info.accepts_ranges:
+            assert info.size is not None
+            ranges = _get_ranges(info.size, connections, min_range_size)
+            if len(ranges) > 1:
+                logger.debug('Downloading %s in %d ranges.', info.url, len(ranges))
+                try:
+                    digest = _download_ranges(info, target, ranges, chunk_size, timeout,
+                                              progress)
+                except RangesNotSupportedError as ex:
+                    logger.info('Falling back to a single stream download of %s: %s', url, ex)
+        if digest is None:
+            digest = _download_stream(info.url, target, chunk_size, timeout, info.size,
+                                      progress)
+
+        if checksum and (digest != checksum.lower()):
+            raise RuntimeError(f'The SHA-256 digest {digest} of the container downloaded '
+                               f'from {url} does not match the checksum {checksum}.')
+        return digest
+    except BaseException:
+        target.unlink(missing_ok=True)
+        raise
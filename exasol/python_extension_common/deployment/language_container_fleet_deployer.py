@@ -0,0 +1,366 @@
+from __future__ import annotations
+from typing import Any, BinaryIO, Callable, Generator
+from dataclasses import dataclass, field
+from datetime import timedelta
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, ExitStack
+import logging
+import queue
+import shutil
+import tempfile
+import threading
+import time
+
+from exasol.python_extension_common.deployment.language_container_deployer import (
+    LanguageContainerDeployer)
+from exasol.python_extension_common.deployment.language_container_uploader import (
+    STREAM_CHUNK_SIZE)
+from exasol.python_extension_common.deployment.language_container_digest import (
+    HashingReader, get_container_digest)
+from exasol.python_extension_common.deployment.sized_reader import CountingReader
+
+logger = logging.getLogger(__name__)
+
+# Number of chunks a fan-out reader can fall behind the source before it slows down the others.
+_FAN_OUT_QUEUE_SIZE = 8
+
+
+@dataclass
+class DeploymentTarget:
+    """
+    A database where a language container should be deployed.
+
+    name        - A name identifying the target in the deployment report.
+    parameters  - Parameters for the LanguageContainerDeployer.create, except the language alias.
+                  The parameters can describe either an On-Prem or a SaaS database.
+    """
+    name: str
+    parameters: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class TargetDeploymentResult:
+    """
+    Outcome of a language container deployment to one target.
+
+    target      - Name of the target.
+    uploaded    - True if the container has been uploaded, False if the upload has been
+                  skipped, or has not happened because of an error.
+    error       - The exception that failed the deployment, None if it succeeded.
+    duration    - Time spent on the target, from connecting to the database until the
+                  container became operational or the deployment failed.
+    ready_after - Time it took for the container to become operational after the activation,
+                  None if the deployment didn't wait for it.
+    """
+    target: str
+    uploaded: bool = False
+    error: Exception | None = None
+    duration: timedelta = timedelta()
+    ready_after: timedelta | None = None
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+class _FanOutReader(CountingReader):
+    """
+    One of the read-only binary streams fed by a _FanOut. Receives the chunks of
+    the source through a bounded queue.
+    """
+    def __init__(self) -> None:
+        super().__init__()
+        self._queue: queue.Queue[bytes] = queue.Queue(maxsize=_FAN_OUT_QUEUE_SIZE)
+        self._buffer = memoryview(b'')
+        self._eof = False
+        self._aborted = False
+
+    def _readinto(self, buffer) -> int:
+        while not (self._buffer or self._eof):
+            try:
+                chunk = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                if self._aborted:
+                    raise IOError('The source of the container stream has failed.')
+                continue
+            if chunk:
+                self._buffer = memoryview(chunk)
+            else:
+                self._eof = True
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+    def feed(self, chunk: bytes) -> bool:
+        """
+        Passes a chunk to the reader, waiting while the reader's queue is full.
+        An empty chunk marks the end of the stream. Returns False if the reader has been
+        closed and doesn't accept chunks anymore.
+        """
+        while not self.closed:
+            try:
+                self._queue.put(chunk, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def abort(self) -> None:
+        """
+        Tells the reader that no more chunks will come, because the source has failed.
+        """
+        self._aborted = True
+
+
+class _FanOut:
+    """
+    Reads a source stream once and passes each chunk to several readers, allowing the
+    same container to be uploaded to multiple destinations concurrently. The memory
+    consumption is limited by the chunk size times the readers' queue size. The slowest
+    reader determines the pace. A reader that gets closed, e.g. because its upload has
+    failed, is left behind without blocking the others.
+    """
+    def __init__(self, source: BinaryIO, num_readers: int,
+                 chunk_size: int = STREAM_CHUNK_SIZE) -> None:
+        self._source = source
+        self._chunk_size = chunk_size
+        self.readers = [_FanOutReader() for _ in range(num_readers)]
+
+    def run(self) -> None:
+        active = list(self.readers)
+        try:
+            while active:
+                chunk = self._source.read(self._chunk_size)
+                active = [reader for reader in active if reader.feed(chunk)]
+                if not chunk:
+                    break
+        except Exception:
+            for reader in active:
+                reader.abort()
+            raise
+
+
+@contextmanager
+def _local_container(container_file: Path | None,
+                     container_url: str | None) -> Generator[tuple[Path, str], None, None]:
+    """
+    Provides the local path and the SHA-256 digest of the container. A container given
+    by its url gets downloaded once, to a temporary file, with the digest computed on the way.
+    """
+    if container_file is not None:
+        yield container_file, get_container_digest(container_file)
+    elif container_url:
+        import requests     # type: ignore     # pylint: disable=import-outside-toplevel
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_file = Path(tmp_dir) / 'container.tar.gz'
+            with requests.get(container_url, stream=True, timeout=300) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                reader = HashingReader(response.raw)     # type: ignore
+                with open(tmp_file, 'wb') as f:
+                    shutil.copyfileobj(reader, f, STREAM_CHUNK_SIZE)
+            yield tmp_file, reader.hexdigest()
+    else:
+        raise ValueError('Either a container file or a container url must be specified.')
+
+
+class LanguageContainerFleetDeployer:
+    """
+    Deploys the same language container to multiple databases, On-Prem and/or SaaS,
+    concurrently.
+
+    The deployment goes through the following phases, each executed concurrently for
+    all targets, with the number of simultaneously served targets limited by the
+    max_concurrency.
+    - Connecting to the databases.
+    - Uploading the container. The container is downloaded, if needed, only once. The local
+      file is read once for every group of up to max_concurrency targets and fanned out to
+      all uploads in the group.
+    - Activating the container and waiting until it becomes operational.
+    The connections are closed at the end, whether the deployment succeeds or not. The
+    duration of a target is counted from the moment the deployer starts connecting to it.
+
+    A failure at one target doesn't stop the deployment to the others. The outcome for
+    each target is returned in a report.
+
+    language_alias  - Language alias the container is activated with at all targets.
+    targets         - The list of databases.
+    max_concurrency - The maximum number of targets served in parallel.
+    deployer_factory - The function creating a deployer for a target. It is called with the
+                      language alias and the target parameters. The default factory is
+                      LanguageContainerDeployer.create.
+    """
+    def __init__(self,
+                 language_alias: str,
+                 targets: list[DeploymentTarget],
+                 max_concurrency: int = 8,
+                 deployer_factory: Callable[..., LanguageContainerDeployer] | None = None
+                 ) -> None:
+        if max_concurrency < 1:
+            raise ValueError('The max_concurrency must be a positive number.')
+        if len({target.name for target in targets}) != len(targets):
+            raise ValueError('The target names must be unique.')
+        self._language_alias = language_alias
+        self._targets = targets
+        self._max_concurrency = max_concurrency
+        self._deployer_factory = deployer_factory or LanguageContainerDeployer.create
+
+    def run(self, container_file: Path | None = None,
+            container_url: str | None = None,
+            bucket_file_path: str | None = None,
+            alter_system: bool = True,
+            allow_override: bool = False,
+            wait_for_completion: bool = True,
+            skip_if_unchanged: bool = False) -> list[TargetDeploymentResult]:
+        """
+        Deploys the language container to all targets. Returns the deployment report.
+
+        container_file   - Path of the container tar.gz file in a local file system.
+        container_url    - Address where the container will be downloaded from, if the
+                           container_file is not provided.
+        bucket_file_path - Path within the designated bucket where the container should be uploaded.
+                           If not specified the name of the container file will be used instead.
+        alter_system     - If True will try to activate the container at the System level.
+        allow_override   - If True the activation of a language container with the same alias will be
+                           overriden, otherwise a RuntimeException will be thrown.
+        wait_for_completion - If True will wait until the language container becomes operational.
+        skip_if_unchanged - If True the upload will be skipped at the targets where the same
+                           container is already in the bucket.
+        """
+        if not bucket_file_path:
+            if not container_file:
+                raise ValueError('Either a container file or a bucket file path must be specified.')
+            bucket_file_path = container_file.name
+
+        results = {target.name: TargetDeploymentResult(target.name) for target in self._targets}
+        # The time of a target is counted from the start of its own work, since the targets
+        # beyond the max_concurrency wait for the others.
+        start_times: dict[str, float] = {}
+
+        def finish(name: str) -> None:
+            results[name].duration = timedelta(seconds=time.monotonic() - start_times[name])
+
+        deployers = self._create_deployers(results, start_times)
+        try:
+            for name in results:
+                if name not in deployers:
+                    finish(name)
+
+            with _local_container(container_file, container_url) as (local_file, digest):
+                self._upload(deployers, results, local_file, digest, bucket_file_path,
+                             skip_if_unchanged)
+            for name in deployers:
+                if not results[name].success:
+                    finish(name)
+
+            def activate(name: str) -> None:
+                try:
+                    results[name].ready_after = deployers[name].activate_and_wait(
+                        bucket_file_path, alter_system, allow_override, wait_for_completion)
+                except Exception as ex:     # pylint: disable=broad-exception-caught
+                    self._fail(results[name], ex, 'activation')
+                finally:
+                    finish(name)
+
+            self._map(activate, [name for name in deployers if results[name].success])
+        finally:
+            self._close_deployers(deployers)
+        return [results[target.name] for target in self._targets]
+
+    @staticmethod
+    def _close_deployers(deployers: dict[str, LanguageContainerDeployer]) -> None:
+        for name, deployer in deployers.items():
+            try:
+                deployer.close()
+            except Exception:     # pylint: disable=broad-exception-caught
+                logger.warning("Failed to close the connection to %s.", name, exc_info=True)
+
+    def _map(self, func: Callable[[Any], None], items: list[Any]) -> None:
+        if items:
+            with ThreadPoolExecutor(max_workers=self._max_concurrency) as executor:
+                list(executor.map(func, items))
+
+    @staticmethod
+    def _fail(result: TargetDeploymentResult, ex: Exception, phase: str) -> None:
+        logger.error("Deployment to %s failed at the %s: %s", result.target, phase, ex)
+        result.error = ex
+
+    def _create_deployers(self, results: dict[str, TargetDeploymentResult],
+                          start_times: dict[str, float]) -> dict[str, LanguageContainerDeployer]:
+        deployers: dict[str, LanguageContainerDeployer] = {}
+        lock = threading.Lock()
+
+        def create(target: DeploymentTarget) -> None:
+            start_times[target.name] = time.monotonic()
+            try:
+                deployer = self._deployer_factory(language_alias=self._language_alias,
+                                                  **target.parameters)
+                with lock:
+                    deployers[target.name] = deployer
+            except Exception as ex:     # pylint: disable=broad-exception-caught
+                self._fail(results[target.name], ex, 'connection')
+
+        self._map(create, self._targets)
+        return deployers
+
+    def _upload(self, deployers: dict[str, LanguageContainerDeployer],
+                results: dict[str, TargetDeploymentResult],
+                local_file: Path, digest: str, bucket_file_path: str,
+                skip_if_unchanged: bool) -> None:
+
+        def needs_upload(name: str) -> None:
+            try:
+                if skip_if_unchanged and \
+                        (deployers[name].get_uploaded_digest(bucket_file_path) == digest):
+                    logger.info("Container is already in the bucketfs of %s, "
+                                "the upload is skipped.", name)
+                else:
+                    with lock:
+                        to_upload.append(name)
+            except Exception as ex:     # pylint: disable=broad-exception-caught
+                self._fail(results[name], ex, 'upload')
+
+        to_upload: list[str] = []
+        lock = threading.Lock()
+        self._map(needs_upload, list(deployers))
+
+        def upload(name_and_reader: tuple[str, _FanOutReader]) -> None:
+            name, reader = name_and_reader
+            try:
+                with reader:
+                    deployers[name].upload_container_stream(reader, bucket_file_path,
+                                                            size, digest)
+                results[name].uploaded = True
+            except Exception as ex:     # pylint: disable=broad-exception-caught
+                self._fail(results[name], ex, 'upload')
+
+        size = local_file.stat().st_size
+        for start in range(0, len(to_upload), self._max_concurrency):
+            group = to_upload[start:start + self._max_concurrency]
+            with ExitStack() as stack:
+                source = stack.enter_context(open(local_file, 'rb'))
+                fan_out = _FanOut(source, len(group))
+                executor = stack.enter_context(ThreadPoolExecutor(max_workers=len(group)))
+                futures = [executor.submit(upload, item)
+                           for item in zip(group, fan_out.readers)]
+                fan_out.run()
+                for future in futures:
+                    future.result()
+
+
+def format_deployment_report(results: list[TargetDeploymentResult]) -> str:
+    """
+    Formats the fleet deployment report as a text table, one line per target.
+    """
+    lines = [f'{"TARGET":<30} {"STATUS":<8} {"UPLOADED":<9} {"SECONDS":>8}  ERROR']
+    for result in results:
+        status = 'OK' if result.success else 'FAILED'
+        error = '' if result.error is None else str(result.error)
+        lines.append(f'{result.target:<30} {status:<8} {str(result.uploaded):<9} '
+                     f'{result.duration.total_seconds():>8.1f}  {error}')
+    succeeded = sum(result.success for result in results)
+    lines.append(f'Deployed to {succeeded} out of {len(results)} targets.')
+    return '\n'.join(lines)
@@ -0,0 +1,160 @@
+from __future__ import annotations
+from typing import Optional
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+import gzip
+import os
+import struct
+import time
+import zlib
+
+from exasol.python_extension_common.deployment.sized_reader import CountingReader
+
+DEFAULT_COMPRESSION_LEVEL = 6
+
+# Size of the uncompressed blocks compressed in parallel.
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+
+# The deflate window. Each block is compressed with the end of the previous one as
+# the dictionary, so the parallel compression is almost as good as the sequential one.
+_DICTIONARY_SIZE = 32 * 1024
+
+# The gzip header: magic, deflate, no flags, no modification time, no extra flags, unknown OS.
+_GZIP_HEADER = b'\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff'
+
+# An empty final deflate block, ending the stream.
+_FINAL_BLOCK = b'\x03\x00'
+
+
+def _compress_block(block: bytes, dictionary: bytes, level: int) -> bytes:
+    # zlib releases the GIL while compressing, so the blocks are compressed in parallel.
+    if dictionary:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=dictionary)
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    # The sync flush ends the block at a byte boundary, so that the blocks can be concatenated.
+    return compressor.compress(block) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+
+@dataclass
+class RecompressionReport:
+    """
+    Outcome of a recompression.
+
+    original_size   - Size of the original container.
+    size            - Size of the recompressed container.
+    seconds         - Duration of the recompression, including the upload it was streamed into.
+    """
+    original_size: int
+    size: int
+    seconds: float
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.original_size - self.size
+
+    @property
+    def saved_seconds(self) -> float:
+        """
+        An estimate of the upload time saved, assuming the original container would have been
+        uploaded at the same throughput. Negative if the recompressed container is larger.
+        """
+        return self.seconds * self.saved_bytes / self.size if self.size else 0.
+
+    def __str__(self) -> str:
+        ratio = 100. * self.saved_bytes / self.original_size if self.original_size else 0.
+        return (f'{self.original_size} -> {self.size} bytes ({ratio:.1f}% saved) '
+                f'in {self.seconds:.1f} s, about {self.saved_seconds:.1f} s of upload saved')
+
+
+class RecompressingReader(CountingReader):
+    """
+    A read-only binary stream recompressing a tar.gz container on the fly, using all cores.
+
+    The container is decompressed in one thread, and its content is split into blocks, which
+    are compressed in parallel. The compressed blocks are joined into a single gzip member,
+    in the same way as the pigz does it, so that any gzip decompressor can extract the archive.
+    The number of blocks in flight is limited, hence so is the memory consumption. The output
+    doesn't depend on the number of threads.
+
+    The size of the output is not known in advance. An upload of the stream is therefore sent
+    without the Content-Length.
+
+    container_file  - Path of the container tar.gz file in a local file system.
+    level           - The compression level, from 1 (fastest) to 9 (smallest).
+    block_size      - Size of the uncompressed blocks.
+    threads         - The number of compressing threads, by default the number of CPUs.
+    """
+    def __init__(self, container_file: Path, level: int = DEFAULT_COMPRESSION_LEVEL,
+                 block_size: int = DEFAULT_BLOCK_SIZE, threads: Optional[int] = None) -> None:
+        super().__init__()
+        if not 1 <= level <= 9:
+            raise ValueError('The compression level must be between 1 and 9.')
+        if block_size < 1:
+            raise ValueError('The block size must be a positive number.')
+        self._level = level
+        self._block_size = block_size
+        self._threads = threads or os.cpu_count() or 1
+        self.original_size = container_file.stat().st_size
+        self._source = gzip.open(container_file, 'rb')
+        self._executor = ThreadPoolExecutor(max_workers=self._threads,
+                                            thread_name_prefix='recompression')
+        self._pending: deque[Future] = deque()
+        self._dictionary = b''
+        self._crc = 0
+        self._input_size = 0
+        self._source_done = False
+        self._buffer = memoryview(_GZIP_HEADER)
+        self._finished = False
+        self._started = time.perf_counter()
+
+    def _submit_blocks(self) -> None:
+        # Keeps twice as many blocks in flight as there are threads, so that none is idle.
+        while (not self._source_done) and (len(self._pending) < 2 * self._threads):
+            block = self._source.read(self._block_size)
+            if not block:
+                self._source_done = True
+                break
+            self._crc = zlib.crc32(block, self._crc)
+            self._input_size += len(block)
+            self._pending.append(self._executor.submit(_compress_block, block, self._dictionary,
+                                                       self._level))
+            self._dictionary = block[-_DICTIONARY_SIZE:]
+
+    def _next_buffer(self) -> bool:
+        self._submit_blocks()
+        if self._pending:
+            self._buffer = memoryview(self._pending.popleft().result())
+        elif not self._finished:
+            self._buffer = memoryview(_FINAL_BLOCK + struct.pack(
+                '<II', self._crc, self._input_size & 0xffffffff))
+            self._finished = True
+        else:
+            return False
+        return True
+
+    def _readinto(self, buffer) -> int:
+        while not self._buffer:
+            if not self._next_buffer():
+                return 0
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+    def report(self) -> RecompressionReport:
+        """
+        Returns the sizes and the duration of the recompression, so far.
+        """
+        return RecompressionReport(self.original_size, self.bytes_read,
+                                   time.perf_counter() - self._started)
+
+    def close(self) -> None:
+        if not self.closed:
+            for future in self._pending:
+                future.cancel()
+            self._executor.shutdown(wait=True)
+            self._source.close()
+        super().close()
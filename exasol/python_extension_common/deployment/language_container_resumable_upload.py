@@ -0,0 +1,160 @@
+from __future__ import annotations
+from typing import Callable, TYPE_CHECKING
+from pathlib import Path
+import io
+import json
+import logging
+
+from tenacity import retry
+from tenacity.wait import wait_exponential
+from tenacity.stop import stop_after_attempt
+if TYPE_CHECKING:
+    import exasol.bucketfs as bfs   # type: ignore
+
+from exasol.python_extension_common.deployment.language_container_digest import (
+    HashingReader, get_container_digest, write_manifest)
+from exasol.python_extension_common.deployment.sized_reader import CountingReader, with_length
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PART_SIZE = 64 * 1024 * 1024
+
+# Suffix of the local journal file, stored next to the container file.
+JOURNAL_SUFFIX = '.upload.json'
+
+# Suffix of the directory in the BucketFS where the parts are uploaded to.
+PARTS_SUFFIX = '.parts'
+
+# A function that assembles the uploaded parts, given in the order of their offsets,
+# into the target file, next to them in the BucketFS. The BucketFS can neither append
+# to a file nor concatenate files. Hence, the assembly must be done by a component
+# with a write access to the bucket close to the BucketFS service, e.g. a UDF or
+# a server-side job. No such assembler is provided, hence the resumable upload is
+# experimental and not used by the deployer.
+PartAssembler = Callable[[list['bfs.path.PathLike'], 'bfs.path.PathLike'], None]
+
+
+class _FileSliceReader(CountingReader):
+    """
+    A read-only binary stream over a slice of a file.
+    """
+    def __init__(self, file: io.BufferedIOBase, offset: int, size: int) -> None:
+        super().__init__()
+        self._file = file
+        self._offset = offset
+        self._slice_size = size
+
+    def _readinto(self, buffer) -> int:
+        size = min(len(buffer), self._slice_size - self.bytes_read)
+        if size <= 0:
+            return 0
+        self._file.seek(self._offset + self.bytes_read)
+        return self._file.readinto(memoryview(buffer)[:size]) or 0
+
+
+class UploadJournal:
+    """
+    A local record of the parts of a container confirmed as uploaded to the BucketFS.
+    The journal is bound to the container file, its destination and the part size.
+    A journal of a different upload, or of a container that has changed, is discarded.
+
+    journal_file    - Path of the journal in a local file system.
+    container_file  - Path of the container tar.gz file in a local file system.
+    destination     - Path of the container file in the BucketFS.
+    part_size       - Size of the parts the container is split into.
+    """
+    def __init__(self, journal_file: Path, container_file: Path, destination: str,
+                 part_size: int) -> None:
+        self._journal_file = journal_file
+        stat = container_file.stat()
+        self._key = {'destination': destination, 'part_size': part_size,
+                     'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        self.confirmed: dict[int, str] = {}
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            journal = json.loads(self._journal_file.read_text())
+        except (OSError, ValueError):
+            return
+        if isinstance(journal, dict) and (journal.get('key') == self._key):
+            self.confirmed = {int(index): digest
+                              for index, digest in journal.get('parts', {}).items()}
+        else:
+            logger.info('Discarding the journal %s of a different upload.', self._journal_file)
+
+    def confirm(self, index: int, digest: str) -> None:
+        """
+        Records a part as uploaded. The journal is replaced atomically.
+        """
+        self.confirmed[index] = digest
+        tmp_file = self._journal_file.with_name(self._journal_file.name + '.tmp')
+        tmp_file.write_text(json.dumps({'key': self._key, 'parts': self.confirmed}))
+        tmp_file.replace(self._journal_file)
+
+    def remove(self) -> None:
+        self._journal_file.unlink(missing_ok=True)
+
+
+def get_parts_path(file_path: bfs.path.PathLike) -> bfs.path.PathLike:
+    """
+    Returns the directory in the BucketFS where the parts of a container are uploaded to.
+    """
+    return file_path.parent / (file_path.name + PARTS_SUFFIX)
+
+
+def upload_container_resumable(container_file: Path,
+                               file_path: bfs.path.PathLike,
+                               assembler: PartAssembler,
+                               part_size: int = DEFAULT_PART_SIZE,
+                               max_attempts: int = 5,
+                               journal_file: Path | None = None) -> str:
+    """
+    Uploads a container to the BucketFS in parts, so that an interrupted upload can be
+    resumed. Each part is uploaded as a separate file and recorded in a local journal once
+    confirmed. A failed part is retried with an exponential back-off. If all attempts fail,
+    calling this function again continues with the first part not confirmed in the journal.
+    When all parts are uploaded they are assembled into the target file, which is followed
+    by writing the manifest, removing the parts and the journal.
+
+    Returns the SHA-256 digest of the container.
+
+    container_file  - Path of the container tar.gz file in a local file system.
+    file_path       - Path of the container file in the BucketFS.
+    assembler       - Function assembling the parts into the target file.
+    part_size       - Size of the parts the container is split into.
+    max_attempts    - The maximum number of attempts to upload one part.
+    journal_file    - Path of the journal in a local file system. By default, the journal
+                      is stored next to the container file.
+    """
+    if part_size <= 0:
+        raise ValueError('The part size must be a positive number.')
+    journal_file = journal_file or container_file.with_name(container_file.name + JOURNAL_SUFFIX)
+    journal = UploadJournal(journal_file, container_file, str(file_path), part_size)
+    parts_path = get_parts_path(file_path)
+    size = container_file.stat().st_size
+    part_paths = [parts_path / f'{index:06d}'
+                  for index in range((size + part_size - 1) // part_size or 1)]
+
+    @retry(reraise=True, stop=stop_after_attempt(max_attempts),
+           wait=wait_exponential(multiplier=0.5, max=30))
+    def upload_part(f: io.BufferedIOBase, index: int) -> str:
+        offset = index * part_size
+        slice_size = min(part_size, size - offset)
+        reader = HashingReader(_FileSliceReader(f, offset, slice_size))
+        part_paths[index].write(with_length(reader, slice_size))
+        return reader.hexdigest()
+
+    with open(container_file, 'rb') as f:
+        for index in range(len(part_paths)):
+            if index in journal.confirmed:
+                continue
+            journal.confirm(index, upload_part(f, index))
+            logger.debug('Part %d of %d is uploaded.', index + 1, len(part_paths))
+
+    assembler(part_paths, file_path)
+    digest = get_container_digest(container_file)
+    write_manifest(file_path, digest)
+    parts_path.rmdir(recursive=True)
+    journal.remove()
+    return digest
@@ -0,0 +1,257 @@
+from __future__ import annotations
+from typing import Iterable, Optional, TYPE_CHECKING
+from dataclasses import dataclass, field
+from datetime import timedelta
+from pathlib import PurePosixPath
+import json
+import logging
+import posixpath
+import re
+import time
+
+if TYPE_CHECKING:
+    import exasol.bucketfs as bfs   # type: ignore
+
+from exasol.python_extension_common.deployment.language_container_digest import (
+    MANIFEST_SUFFIX, get_manifest_path)
+from exasol.python_extension_common.deployment.language_container_resumable_upload import (
+    PARTS_SUFFIX)
+from exasol.python_extension_common.deployment.script_languages import ScriptLanguages
+
+logger = logging.getLogger(__name__)
+
+# Suffixes of the container archives subject to the retention.
+CONTAINER_SUFFIXES = ('.tar.gz', '.tgz')
+
+# Name of the file in the BucketFS where the retention records when it first saw each archive.
+RETENTION_STATE_FILE = '.slc_retention.json'
+
+_NUMBER_PATTERN = re.compile(r'(\d+)')
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """
+    Defines which of the containers that are not referenced in the language settings
+    can be deleted. If both limits are set, a container is deleted only if it exceeds both.
+    The referenced containers are never deleted.
+
+    keep_last   - The number of the newest containers that are kept, whether they are
+                  referenced or not.
+    max_age     - Containers not older than this are kept. The BucketFS doesn't report the
+                  time a file was written. The age of a container is therefore counted from
+                  the first garbage collection that saw it in the bucket.
+    """
+    keep_last: Optional[int] = None
+    max_age: Optional[timedelta] = None
+
+    def __post_init__(self) -> None:
+        if (self.keep_last is None) and (self.max_age is None):
+            raise ValueError('The retention policy must limit either the number '
+                             'or the age of the containers.')
+        if (self.keep_last is not None) and (self.keep_last < 0):
+            raise ValueError('The number of the kept containers cannot be negative.')
+        if (self.max_age is not None) and (self.max_age < timedelta(0)):
+            raise ValueError('The maximum age of the containers cannot be negative.')
+
+
+@dataclass
+class RetentionReport:
+    """
+    Outcome of a garbage collection. The containers are given by their paths relative to
+    the BucketFS location, the newest first.
+
+    dry_run     - True if the containers have not actually been deleted.
+    referenced  - Containers referenced in the language settings, with the aliases
+                  that reference them.
+    kept        - Containers not referenced, but kept by the policy.
+    deleted     - Containers deleted, or to be deleted in the dry-run mode.
+    failed      - Containers that could not be deleted.
+    """
+    dry_run: bool
+    referenced: dict[str, list[str]] = field(default_factory=dict)
+    kept: list[str] = field(default_factory=list)
+    deleted: list[str] = field(default_factory=list)
+    failed: list[str] = field(default_factory=list)
+
+    def __str__(self) -> str:
+        total = len(self.referenced) + len(self.kept) + len(self.deleted) + len(self.failed)
+        verb = 'Would delete' if self.dry_run else 'Deleted'
+        lines = [f'{verb} {len(self.deleted)} of {total} containers, '
+                 f'{len(self.referenced)} referenced, {len(self.kept)} kept by the policy'
+                 + (f', {len(self.failed)} failed' if self.failed else '') + '.']
+        lines.extend(f'  referenced {name} ({", ".join(aliases)})'
+                     for name, aliases in self.referenced.items())
+        lines.extend(f'  kept       {name}' for name in self.kept)
+        lines.extend(f'  {"delete    " if self.dry_run else "deleted   "} {name}'
+                     for name in self.deleted)
+        lines.extend(f'  failed     {name}' for name in self.failed)
+        return '\n'.join(lines)
+
+
+def _natural_key(name: str) -> list:
+    # Compares the numbers in the names by value, so that slc-1.10 is newer than slc-1.9.
+    return [(0, int(part), '') if part.isdigit() else (1, 0, part)
+            for part in _NUMBER_PATTERN.split(name)]
+
+
+def list_containers(bucket_path: bfs.path.PathLike, recursive: bool = False) -> list[str]:
+    """
+    Returns the paths of the container archives at a BucketFS location, relative to it.
+    Only the archives with a manifest are considered, i.e. those uploaded by the deployer.
+    The parts of the resumable uploads are skipped.
+
+    bucket_path - The BucketFS location where the containers are uploaded to.
+    recursive   - If True, the subdirectories of the location are searched as well.
+    """
+    containers: list[str] = []
+
+    def scan(dir_path: bfs.path.PathLike, prefix: PurePosixPath) -> None:
+        children = list(dir_path.iterdir())
+        names = {child.name for child in children}
+        for child in children:
+            # A mounted BucketFS also reports an archive as a directory, the extracted one.
+            if child.is_file():
+                if child.name.endswith(CONTAINER_SUFFIXES) and \
+                        (child.name + MANIFEST_SUFFIX) in names:
+                    containers.append(str(prefix / child.name))
+            elif recursive and not child.name.endswith(PARTS_SUFFIX):
+                scan(child, prefix / child.name)
+
+    if bucket_path.is_dir():
+        scan(bucket_path, PurePosixPath())
+    return containers
+
+
+def is_bucket_root(bucket_path: bfs.path.PathLike) -> bool:
+    """
+    Tells if the BucketFS location is the root of a bucket.
+    """
+    return posixpath.normpath(str(bucket_path)) in ('.', '/')
+
+
+def get_referenced_containers(bucket_path: bfs.path.PathLike, containers: Iterable[str],
+                              language_settings: Iterable[str]) -> dict[str, list[str]]:
+    """
+    Finds which containers are referenced in the language settings. Returns the
+    referencing aliases of each referenced container.
+
+    bucket_path         - The BucketFS location where the containers are uploaded to.
+    containers          - Paths of the containers relative to the BucketFS location.
+    language_settings   - Values of the SCRIPT_LANGUAGES parameter, e.g. at the SYSTEM and
+                          the SESSION level.
+    """
+    aliases: dict[PurePosixPath, list[str]] = {}
+    for settings in language_settings:
+        for definition in ScriptLanguages.parse(settings or '').definitions():
+            if definition.container_path:
+                aliases.setdefault(PurePosixPath(definition.container_path), []).append(
+                    definition.alias)
+
+    referenced: dict[str, list[str]] = {}
+    for container in containers:
+        # The same path the activation puts into the language definition, see get_udf_path,
+        # without the leading /buckets.
+        path_in_udf = PurePosixPath((bucket_path / container).as_udf_path())
+        container_aliases = aliases.get(PurePosixPath(*path_in_udf.parts[2:]))
+        if container_aliases:
+            referenced[container] = sorted(set(container_aliases))
+    return referenced
+
+
+def _read_state(bucket_path: bfs.path.PathLike) -> dict[str, float]:
+    state_path = bucket_path / RETENTION_STATE_FILE
+    try:
+        if not state_path.exists():
+            return {}
+        state = json.loads(b''.join(state_path.read()).decode('utf-8'))
+        return {name: float(seen) for name, seen in state['first_seen'].items()}
+    except (OSError, ValueError, TypeError, KeyError, AttributeError):
+        logger.warning('Cannot read the retention state %s, starting afresh.', state_path,
+                       exc_info=True)
+        return {}
+
+
+def _write_state(bucket_path: bfs.path.PathLike, first_seen: dict[str, float]) -> None:
+    state = json.dumps({'first_seen': first_seen}, indent=2, sort_keys=True)
+    (bucket_path / RETENTION_STATE_FILE).write(state.encode('utf-8'))
+
+
+def _remove_container(file_path: bfs.path.PathLike) -> None:
+    file_path.rm()
+    manifest_path = get_manifest_path(file_path)
+    if manifest_path.exists():
+        manifest_path.rm()
+
+
+def collect_garbage(bucket_path: bfs.path.PathLike, language_settings: Iterable[str],
+                    policy: RetentionPolicy, dry_run: bool = False,
+                    recursive: bool = False, allow_bucket_root: bool = False,
+                    now: Optional[float] = None) -> RetentionReport:
+    """
+    Deletes the containers at a BucketFS location that are neither referenced in the
+    language settings nor kept by the retention policy, together with their manifests.
+    Only the archives with a manifest are considered, see the list_containers.
+
+    A bucket can hold other archives too, e.g. models, so the collection refuses to run at
+    the root of a bucket, unless this is explicitly allowed. It raises a ValueError instead.
+
+    The containers are ordered from the newest to the oldest by the time they were first seen
+    by a garbage collection, and then by their names, comparing the numbers in the names by
+    value. The time a container was first seen is recorded in a state file at the BucketFS
+    location.
+
+    Only the settings passed in are checked. A container activated at the SESSION level in
+    another session, or in another database sharing the bucket, is not protected, unless
+    the policy keeps it.
+
+    bucket_path         - The BucketFS location where the containers are uploaded to.
+    language_settings   - Values of the SCRIPT_LANGUAGES parameter, e.g. at the SYSTEM and
+                          the SESSION level.
+    policy              - The retention policy.
+    dry_run             - If True, only reports which containers would be deleted. Neither the
+                          containers nor the state file are changed.
+    recursive           - If True, the containers in the subdirectories of the location are
+                          collected as well.
+    allow_bucket_root   - If True, the location can be the root of a bucket.
+    now                 - The current time in seconds since the epoch, for testing.
+    """
+    if (not allow_bucket_root) and is_bucket_root(bucket_path):
+        raise ValueError('The garbage collection at the root of a bucket must be allowed '
+                         'explicitly.')
+    now = time.time() if now is None else now
+    containers = list_containers(bucket_path, recursive)
+    first_seen = {name: seen for name, seen in _read_state(bucket_path).items()
+                  if name in containers}
+    for name in containers:
+        first_seen.setdefault(name, now)
+    containers.sort(key=lambda name: (first_seen[name], _natural_key(name)), reverse=True)
+
+    report = RetentionReport(dry_run)
+    report.referenced = get_referenced_containers(bucket_path, containers, language_settings)
+    for position, name in enumerate(containers):
+        if name in report.referenced:
+            continue
+        within_count = (policy.keep_last is not None) and (position < policy.keep_last)
+        within_age = (policy.max_age is not None) and \
+            (now - first_seen[name] <= policy.max_age.total_seconds())
+        if within_count or within_age:
+            report.kept.append(name)
+            continue
+        if dry_run:
+            report.deleted.append(name)
+            continue
+        try:
+            _remove_container(bucket_path / name)
+        except Exception:     # pylint: disable=broad-exception-caught
+            logger.warning('Failed to delete the container %s from the bucket.', name,
+                           exc_info=True)
+            report.failed.append(name)
+        else:
+            report.deleted.append(name)
+            del first_seen[name]
+
+    if not dry_run:
+        _write_state(bucket_path, first_seen)
+    logger.info('%s', report)
+    return report
@@ -0,0 +1,410 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Optional, Dict, List, Iterable, Iterator, Callable, TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+import hashlib
+import logging
+import tempfile
+
+if TYPE_CHECKING:
+    # The backends are imported where they are used, so that importing this module,
+    # e.g. by a cli invoked with --help, doesn't pay for loading them.
+    import requests     # type: ignore
+    import exasol.bucketfs as bfs   # type: ignore
+    from exasol.python_extension_common.deployment.language_container_cache import (
+        ContainerCache)
+
+from exasol.python_extension_common.deployment.language_container_digest import (
+    HashingReader, get_container_digest, get_cached_digest, cache_digest, read_manifest,
+    write_manifest, remove_manifest
+)
+from exasol.python_extension_common.deployment.language_container_download import (
+    download_container
+)
+from exasol.python_extension_common.deployment.transfer_progress import (
+    OPERATION_UPLOAD, ProgressCallback, ProgressReader, ProgressTracker
+)
+from exasol.python_extension_common.deployment.language_container_check import (
+    ContainerChecker, CheckingReader, InvalidContainerError
+)
+from exasol.python_extension_common.deployment.language_container_recompression import (
+    RecompressingReader, RecompressionReport
+)
+from exasol.python_extension_common.deployment.sized_reader import (
+    CountingReader, ReadableStream, with_length)
+from exasol.python_extension_common.deployment.mapped_file import (
+    DEFAULT_BUFFER_SIZE, ChunkObserver, MappedFileBody
+)
+from exasol.python_extension_common.deployment.deployment_metrics import (
+    DeploymentMetrics, PHASE_DOWNLOAD, PHASE_HASH, PHASE_UPLOAD
+)
+
+logger = logging.getLogger(__name__)
+
+# Size of the chunks in which a container is passed from the download to the upload stream.
+# This is the upper limit of the memory held by the stream at any moment.
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+
+def _get_content_length(response: requests.Response) -> Optional[int]:
+    """
+    Returns the size of the response content as it will be delivered by the iter_content,
+    or None if it is unknown.
+    """
+    content_length = response.headers.get('Content-Length')
+    if (not content_length) or response.headers.get('Content-Encoding'):
+        return None
+    return int(content_length)
+
+
+class _IterableReader(CountingReader):
+    """
+    A read-only binary stream over an iterable of byte chunks.
+
+    It allows a chunked source, e.g. a streamed http response, to be passed where a file
+    object is expected. Only the current chunk is kept in memory.
+
+    chunks  - The chunks of the stream.
+    """
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        super().__init__()
+        self._chunks: Iterator[bytes] = iter(chunks)
+        self._buffer = memoryview(b'')
+
+    def _readinto(self, buffer) -> int:
+        while not self._buffer:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._buffer = memoryview(chunk)
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
+@dataclass
+class ContainerSpec:
+    """
+    One of the language containers deployed together by the LanguageContainerDeployer.run_batch.
+    A container with neither a file nor a url is assumed to be uploaded already and only
+    gets activated.
+
+    language_alias   - Language alias the container is activated with.
+    container_file   - Path of the container tar.gz file in a local file system.
+    container_url    - Address where the container will be downloaded from, if the
+                       container_file is not provided.
+    bucket_file_path - Path within the designated bucket where the container should be uploaded.
+                       If not specified the name of the container file will be used instead.
+    """
+    language_alias: str
+    container_file: Optional[Path] = None
+    container_url: Optional[str] = None
+    bucket_file_path: Optional[str] = None
+
+    @property
+    def has_source(self) -> bool:
+        return bool(self.container_file or self.container_url)
+
+    def get_bucket_file_path(self) -> str:
+        if self.bucket_file_path:
+            return self.bucket_file_path
+        if self.container_file:
+            return self.container_file.name
+        raise ValueError(f'The bucket file path of the container {self.language_alias} '
+                         'must be specified, unless a container file is provided.')
+
+
+class LanguageContainerUploader:
+    """
+    Uploads language containers to the BucketFS, each with a manifest holding its SHA-256
+    digest. This is the upload part of the LanguageContainerDeployer.
+
+    bucketfs_path       - The BucketFS location where the containers are uploaded to.
+    metrics             - Collector of the deployment phase timings. A new one is created
+                          if not provided. It is available as the metrics attribute.
+    progress_callback   - Optional function receiving the progress of the container uploads
+                          and downloads, see the transfer_progress module. It is available
+                          as the progress_callback attribute.
+    check_container     - If True, the integrity and the structure of a container are verified
+                          while it's being uploaded. It is available as the check_container
+                          attribute.
+    zero_copy_upload    - If True, local container files are sent from their memory mapping,
+                          see the MappedFileBody. Not supported by the mounted BucketFS.
+                          It is available as the zero_copy_upload attribute.
+    upload_buffer_size  - Size of the chunks a local container file is sent in, in the zero-copy
+                          mode. It is available as the upload_buffer_size attribute.
+    recompression_level - If positive, local container files are recompressed at this level,
+                          using all cores, while they are being uploaded, see the
+                          RecompressingReader. It is available as the recompression_level
+                          attribute. The recompressed container is uploaded without the
+                          Content-Length, so this is not supported for a SaaS database.
+    """
+
+    def __init__(self,
+                 bucketfs_path: bfs.path.PathLike,
+                 metrics: Optional[DeploymentMetrics] = None,
+                 progress_callback: Optional[ProgressCallback] = None,
+                 check_container: bool = False,
+                 zero_copy_upload: bool = False,
+                 upload_buffer_size: int = DEFAULT_BUFFER_SIZE,
+                 recompression_level: int = 0) -> None:
+        self._bucketfs_path = bucketfs_path
+        self.metrics = metrics or DeploymentMetrics()
+        self.progress_callback = progress_callback
+        self.check_container = check_container
+        self.zero_copy_upload = zero_copy_upload
+        self.upload_buffer_size = upload_buffer_size
+        self.recompression_level = recompression_level
+        # Reports of the recompressions, keyed by the path of the container in the bucket.
+        self.recompression_reports: Dict[str, RecompressionReport] = {}
+
+    def upload_container(self, container_file: Path,
+                         bucket_file_path: Optional[str] = None,
+                         skip_if_unchanged: bool = False) -> bool:
+        """
+        Upload the language container to the BucketFS.
+
+        The SHA-256 digest of the container is computed while it is being uploaded and stored
+        in a manifest file next to the container in the bucket. The digest is also cached next
+        to the local file. In the skip_if_unchanged mode, the upload is skipped if the manifest
+        matches the digest of the local container. If the zero_copy_upload attribute is True,
+        the container is sent directly from its memory mapping, see the MappedFileBody.
+
+        If the recompression_level attribute is positive, the container is recompressed while
+        it is being uploaded, and the manifest has the digest of the recompressed container.
+        In the skip_if_unchanged mode, the upload is then skipped only if the same file has been
+        recompressed at the same level and uploaded before from this machine.
+
+        Returns True if the container has been uploaded, False if the upload has been skipped.
+
+        container_file   - Path of the container tar.gz file in a local file system.
+        bucket_file_path - Path within the designated bucket where the container should be uploaded.
+                           If not specified the name of the container file will be used instead.
+        skip_if_unchanged - If True the upload will be skipped if the same container is already in
+                           the bucket.
+        """
+        if not container_file.is_file():
+            raise RuntimeError(f"Container file {container_file} "
+                               f"is not a file.")
+        bucket_file_path = bucket_file_path or container_file.name
+        # The digest of a recompressed container is known only after it has been uploaded.
+        variant = f'gzip-{self.recompression_level}' if self.recompression_level > 0 else ''
+        if skip_if_unchanged:
+            uploaded_digest = self.get_uploaded_digest(bucket_file_path)
+            if uploaded_digest is not None:
+                with self.metrics.phase(PHASE_HASH) as record:
+                    record.size = container_file.stat().st_size
+                    local_digest = get_cached_digest(container_file, variant) if variant \
+                        else get_container_digest(container_file)
+                if uploaded_digest == local_digest:
+                    logging.info("Container %s is already in the bucketfs, the upload is skipped.",
+                                 container_file)
+                    return False
+                # The manifest must not outlive the archive it describes, should the upload fail.
+                remove_manifest(self._bucketfs_path / bucket_file_path)
+
+        if variant:
+            digest = self._upload_recompressed_container(container_file, bucket_file_path)
+        else:
+            digest = self._upload_container_file(container_file, bucket_file_path)
+        cache_digest(container_file, digest, variant)
+        return True
+
+    def upload_container_stream(self, stream: ReadableStream, bucket_file_path: str,
+                                size: Optional[int] = None,
+                                digest: Optional[str] = None) -> str:
+        """
+        Uploads the language container from a binary stream to the BucketFS and writes
+        the manifest with the container's SHA-256 digest next to it. Returns the digest.
+
+        stream           - Binary stream the container is read from.
+        bucket_file_path - Path within the designated bucket where the container should be uploaded.
+        size             - Size of the container, if known. Allows sending the Content-Length.
+        digest           - Hex SHA-256 digest of the container, if known in advance.
+                           Otherwise, it will be computed while the container is being uploaded.
+
+        If the check_container attribute is True, the container is verified in the same pass,
+        see the ContainerChecker. An invalid container is removed from the bucket after the
+        upload and an InvalidContainerError is raised.
+        """
+        return self._upload_stream(stream, bucket_file_path, size, digest)
+
+    def _upload_stream(self, stream: ReadableStream, bucket_file_path: str,
+                       size: Optional[int] = None,
+                       digest: Optional[str] = None, **labels) -> str:
+        checker = ContainerChecker() if self.check_container else None
+        if checker is not None:
+            stream = CheckingReader(stream, checker)
+        if self.progress_callback is not None:
+            stream = ProgressReader(stream, ProgressTracker(OPERATION_UPLOAD, size,
+                                                            self.progress_callback))
+
+        def write(file_path: bfs.path.PathLike) -> tuple[str, Optional[int]]:
+            reader = HashingReader(stream) if digest is None else stream
+            file_path.write(with_length(reader, size))
+            if isinstance(reader, HashingReader):
+                return reader.hexdigest(), reader.bytes_read
+            return digest, size     # type: ignore
+
+        return self._write_container(bucket_file_path, write, checker, **labels)
+
+    def _upload_recompressed_container(self, container_file: Path, bucket_file_path: str) -> str:
+        with RecompressingReader(container_file, self.recompression_level) as reader:
+            digest = self._upload_stream(reader, bucket_file_path,
+                                         mode='recompressed', level=self.recompression_level)
+            report = reader.report()
+        self.recompression_reports[bucket_file_path] = report
+        logger.info('The container %s has been recompressed: %s.', container_file, report)
+        return digest
+
+    def _upload_container_file(self, container_file: Path, bucket_file_path: str,
+                               digest: Optional[str] = None) -> str:
+        size = container_file.stat().st_size
+        if not self.zero_copy_upload:
+            with open(container_file, 'rb') as f:
+                return self.upload_container_stream(f, bucket_file_path, size, digest)
+
+        checker = ContainerChecker() if self.check_container else None
+        sha256 = hashlib.sha256() if digest is None else None
+        tracker = ProgressTracker(OPERATION_UPLOAD, size, self.progress_callback) \
+            if self.progress_callback is not None else None
+        observers: list[ChunkObserver] = []
+        if checker is not None:
+            observers.append(checker.update)
+        if tracker is not None:
+            observers.append(lambda chunk: tracker.update(len(chunk)))     # type: ignore
+        if sha256 is not None:
+            observers.append(sha256.update)
+
+        def write(file_path: bfs.path.PathLike) -> tuple[str, Optional[int]]:
+            with MappedFileBody(container_file, self.upload_buffer_size, observers) as body:
+                file_path.write(body)
+            if tracker is not None:
+                tracker.finish()
+            return digest or sha256.hexdigest(), size     # type: ignore
+
+        return self._write_container(bucket_file_path, write, checker, mode='zero-copy')
+
+    def _write_container(self, bucket_file_path: str,
+                         write: Callable[[bfs.path.PathLike], tuple[str, Optional[int]]],
+                         checker: Optional[ContainerChecker], **labels) -> str:
+        """
+        Runs an upload of a container, passed in as a function writing the container to
+        the given path and returning its digest and size. Then verifies the container, if
+        a checker is provided, and writes the manifest.
+        """
+        file_path = self._bucketfs_path / bucket_file_path
+        with self.metrics.phase(PHASE_UPLOAD, **labels) as record:
+            digest, record.size = write(file_path)
+        if checker is not None:
+            try:
+                checker.verify()
+            except InvalidContainerError:
+                self._remove_invalid_container(file_path)
+                raise
+        write_manifest(file_path, digest)
+        logging.debug("Container is uploaded to bucketfs")
+        return digest
+
+    @staticmethod
+    def _remove_invalid_container(file_path: bfs.path.PathLike) -> None:
+        try:
+            file_path.rm()
+        except Exception:     # pylint: disable=broad-exception-caught
+            logger.warning('Failed to remove the invalid container %s from the bucket.',
+                           file_path, exc_info=True)
+
+    def get_uploaded_digest(self, bucket_file_path: str) -> Optional[str]:
+        """
+        Returns the SHA-256 digest of a container already uploaded to the BucketFS, as recorded
+        in its manifest, or None if either the container or its manifest is not in the bucket.
+
+        bucket_file_path - Path within the designated bucket where the container is uploaded.
+        """
+        return read_manifest(self._bucketfs_path / bucket_file_path)
+
+    def upload_container_from_url(self, url: str, bucket_file_path: str,
+                                  chunk_size: int = STREAM_CHUNK_SIZE,
+                                  connections: int = 1,
+                                  checksum: Optional[str] = None,
+                                  cache: Optional[ContainerCache] = None) -> None:
+        """
+        Streams the language container from the provided url to the BucketFS.
+        The downloaded chunks are passed to the upload as they arrive, so the memory
+        consumption is limited by the chunk size, regardless of the container size.
+
+        If multiple connections or a checksum are requested, the container is instead
+        downloaded into a temporary local file first, see the download_container function.
+        The upload starts only when the whole container has been downloaded and verified.
+        If a cache is provided, the container is taken from the cache and uploaded from there.
+
+        url              - Address where the container will be downloaded from.
+        bucket_file_path - Path within the designated bucket where the container should be uploaded.
+        chunk_size       - Size of the chunks the container is streamed in.
+        connections      - The maximum number of concurrent range requests of the download.
+        checksum         - The expected hex SHA-256 digest of the container.
+        cache            - A local cache of the downloaded containers.
+        """
+        if cache is not None:
+            container_file = cache.get(url, connections=connections, checksum=checksum,
+                                       progress=self.progress_callback)
+            self.upload_container(container_file, bucket_file_path)
+            return
+        if (connections > 1) or checksum:
+            self._download_and_upload_container(url, bucket_file_path, connections, checksum)
+            return
+
+        import requests     # type: ignore     # pylint: disable=import-outside-toplevel
+
+        # The download phase includes the upload, since the two run in one stream.
+        with self.metrics.phase(PHASE_DOWNLOAD) as record, \
+                requests.get(url, stream=True, timeout=300) as response:
+            response.raise_for_status()
+            size = _get_content_length(response)
+            reader = _IterableReader(response.iter_content(chunk_size=chunk_size))
+            self.upload_container_stream(reader, bucket_file_path, size)
+            record.size = reader.tell()
+        logging.debug("Container is streamed from %s to bucketfs", url)
+
+    def _download_and_upload_container(self, url: str, bucket_file_path: str,
+                                       connections: int, checksum: Optional[str]) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            container_file = Path(tmp_dir) / PurePosixPath(bucket_file_path).name
+            with self.metrics.phase(PHASE_DOWNLOAD, connections=connections) as record:
+                digest = download_container(url, container_file, connections=connections,
+                                            checksum=checksum, progress=self.progress_callback)
+                record.size = container_file.stat().st_size
+            self._upload_container_file(container_file, bucket_file_path, digest)
+        logging.debug("Container is downloaded from %s and uploaded to bucketfs", url)
+
+    def upload_containers(self, containers: List[ContainerSpec],
+                          skip_if_unchanged: bool = False,
+                          max_concurrency: int = 4) -> None:
+        """
+        Uploads several language containers concurrently, up to max_concurrency at a time.
+        The containers with neither a file nor a url are skipped.
+
+        containers       - The containers to be uploaded.
+        skip_if_unchanged - If True the upload of a container file will be skipped if the same
+                           container is already in the bucket.
+        max_concurrency  - The maximum number of containers uploaded in parallel.
+        """
+        if max_concurrency < 1:
+            raise ValueError('The max_concurrency must be a positive number.')
+
+        def upload(container: ContainerSpec) -> None:
+            bucket_file_path = container.get_bucket_file_path()
+            if container.container_file:
+                self.upload_container(container.container_file, bucket_file_path,
+                                      skip_if_unchanged=skip_if_unchanged)
+            elif container.container_url:
+                self.upload_container_from_url(container.container_url, bucket_file_path)
+
+        to_upload = [container for container in containers if container.has_source]
+        if to_upload:
+            with ThreadPoolExecutor(max_workers=min(max_concurrency, len(to_upload))) as executor:
+                futures = [executor.submit(upload, container) for container in to_upload]
+                for future in futures:
+                    future.result()
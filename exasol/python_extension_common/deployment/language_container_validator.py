@@ -1,65 +1,255 @@
 from __future__ import annotations
-from typing import Generator
+from typing import AsyncGenerator, Callable, Generator, TYPE_CHECKING
+from concurrent.futures import Executor
+from dataclasses import dataclass
 from datetime import timedelta
+import asyncio
+import logging
 import random
 import string
-from contextlib import contextmanager
+import time
+from contextlib import asynccontextmanager, contextmanager, ExitStack
 from textwrap import dedent
 
-from tenacity import retry
-from tenacity.wait import wait_fixed
+from tenacity import retry, AsyncRetrying, RetryCallState
+from tenacity.wait import wait_base, wait_fixed, wait_exponential_jitter
 from tenacity.stop import stop_after_delay, stop_after_attempt
 
-import pyexasol     # type: ignore
+if TYPE_CHECKING:
+    import pyexasol     # type: ignore
+
+from exasol.python_extension_common.deployment.deployment_metrics import (
+    DeploymentMetrics, PHASE_VALIDATION_ATTEMPT)
+
+logger = logging.getLogger(__name__)
 
 _DUMMY_UDF_NAME = 'DUMMY_UDF'
 
+# The probe query spreads this many rows per node over the cluster. The rows are distributed
+# by a hash, so with one row per node some nodes are likely to get none. With 16 rows per node,
+# the chance of missing a node of a 64 node cluster is below 1e-5.
+DEFAULT_ROWS_PER_NODE = 16
+
+# The maximum number of the not ready nodes listed in an error message.
+_MAX_LISTED_NODES = 10
+
+# In a warm-up, each probe UDF call lasts at least this long, so that the calls overlap,
+# and the database starts multiple VMs on each node.
+DEFAULT_WARM_UP_HOLD = timedelta(milliseconds=100)
+
+
+@dataclass(frozen=True)
+class NodeReadiness:
+    """
+    The state of a language container on the cluster nodes, as seen by the probe UDF.
+
+    nproc       - Number of the cluster nodes.
+    latencies   - The nodes where the probe UDF has run, with the time from the start of
+                  the probe query until the UDF started on the node. It includes the start
+                  of the language container, if it wasn't running on the node yet.
+    """
+    nproc: int
+    latencies: dict[int, timedelta]
+
+    @property
+    def ready_nodes(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def missing_nodes(self) -> list[int]:
+        """ The nodes where the probe UDF hasn't run yet. """
+        return [node for node in range(self.nproc) if node not in self.latencies]
+
+    @property
+    def all_ready(self) -> bool:
+        return not self.missing_nodes
+
+    def __str__(self) -> str:
+        return f'{self.ready_nodes}/{self.nproc} nodes ready'
 
-def _get_test_udf_name(schema: str | None) -> str:
+
+ReadinessCallback = Callable[[str, NodeReadiness], None]
+
+
+@dataclass(frozen=True)
+class WarmUpReport:
+    """
+    The result of a warm-up of a language container on the cluster nodes.
+
+    nproc       - Number of the cluster nodes.
+    latencies   - The warmed-up nodes, with the time from the start of the warm-up query
+                  until the language container was running in all warmed-up VMs of the node.
+    vms         - Number of the VMs the probe UDF has run in, per node.
+    """
+    nproc: int
+    latencies: dict[int, timedelta]
+    vms: dict[int, int]
+
+    @property
+    def missing_nodes(self) -> list[int]:
+        """ The nodes the warm-up hasn't reached. """
+        return [node for node in range(self.nproc) if node not in self.latencies]
+
+    def __str__(self) -> str:
+        text = f'{len(self.latencies)}/{self.nproc} nodes warmed up'
+        if self.latencies:
+            slowest_node = max(self.latencies, key=self.latencies.__getitem__)
+            text += (f', the slowest node {slowest_node} in '
+                     f'{self.latencies[slowest_node].total_seconds():.1f} s')
+        return text
+
+
+class NodesNotReadyError(AssertionError):
+    """
+    Raised when the language container is not operational on all cluster nodes yet.
+    It's an AssertionError, which the validation used to raise in this case.
+
+    readiness   - The state of the language container on the nodes.
+    """
+    def __init__(self, readiness: NodeReadiness) -> None:
+        missing_nodes = readiness.missing_nodes
+        listed_nodes = ', '.join(str(node) for node in missing_nodes[:_MAX_LISTED_NODES])
+        if len(missing_nodes) > _MAX_LISTED_NODES:
+            listed_nodes += ', ...'
+        super().__init__(f'The language container is operational on {readiness.ready_nodes} '
+                         f'of {readiness.nproc} nodes. Not ready nodes: {listed_nodes}.')
+        self.readiness = readiness
+
+
+def adaptive_wait(initial: timedelta = timedelta(milliseconds=250),
+                  maximum: timedelta = timedelta(seconds=30),
+                  jitter: timedelta = timedelta(milliseconds=250)) -> wait_base:
+    """
+    The default wait strategy of the wait_language_container. Starts with quick probes,
+    then backs off exponentially, with a random jitter, up to the maximum interval.
+
+    initial     - Interval before the second attempt. It doubles with each attempt.
+    maximum     - The maximum interval between two attempts.
+    jitter      - The maximum random time added to each interval.
+    """
+    return wait_exponential_jitter(initial=initial.total_seconds(),
+                                   max=maximum.total_seconds(),
+                                   jitter=jitter.total_seconds())
+
+
+class _wait_within(wait_base):  # pylint: disable=invalid-name
+    """
+    Cuts the waiting time of a strategy, so that it never extends beyond the deadline.
+    This allows a last attempt to be made right before the timeout expires.
+    """
+    def __init__(self, wait: wait_base, timeout: timedelta) -> None:
+        self._wait = wait
+        self._timeout = timeout.total_seconds()
+
+    def __call__(self, retry_state: RetryCallState) -> float:
+        remaining = self._timeout - (retry_state.seconds_since_start or 0.)
+        return max(0., min(self._wait(retry_state), remaining))
+
+
+def _get_wait_strategy(interval: timedelta | None,
+                       wait_strategy: wait_base | None) -> wait_base:
+    if interval is not None:
+        return wait_fixed(interval)
+    if wait_strategy is None:
+        return adaptive_wait()
+    return wait_strategy
+
+
+def _get_test_udf_name(schema: str | None, udf_name: str = _DUMMY_UDF_NAME) -> str:
 
     if schema:
-        return f'"{schema}"."{_DUMMY_UDF_NAME}"'
-    return f'"{_DUMMY_UDF_NAME}"'
+        return f'"{schema}"."{udf_name}"'
+    return f'"{udf_name}"'
 
 
 def _create_dummy_udf(conn: pyexasol.ExaConnection, language_alias: str,
-                      schema: str | None) -> None:
+                      schema: str | None, udf_name: str = _DUMMY_UDF_NAME) -> None:
 
-    # The dummy UDF returns the ID of the node it is running at.
-    udf_name = _get_test_udf_name(schema)
+    # The dummy UDF emits the IDs of the node and the VM it is running at, and the time
+    # since the start of the query, given in seconds since the epoch. Then it holds the VM
+    # for the given number of seconds.
+    udf_name = _get_test_udf_name(schema, udf_name)
     sql = dedent(f"""
-    CREATE OR REPLACE {language_alias} SET SCRIPT {udf_name}(i DECIMAL(10, 0))
-    RETURNS DECIMAL(10, 0) AS
+    CREATE OR REPLACE {language_alias} SET SCRIPT {udf_name}(
+        i DECIMAL(10, 0), query_start DOUBLE, hold DOUBLE)
+    EMITS (node_id DECIMAL(10, 0), vm_id VARCHAR(100), latency DOUBLE) AS
+    import time
 
     def run(ctx):
-        return exa.meta.node_id
+        ctx.emit(exa.meta.node_id, str(exa.meta.vm_id), time.time() - ctx.query_start)
+        if ctx.hold > 0:
+            time.sleep(ctx.hold)
     /
     """)
     conn.execute(sql)
 
 
-def _call_dummy_udf(conn: pyexasol.ExaConnection, schema: str | None) -> None:
+def _get_nproc(conn: pyexasol.ExaConnection) -> int:
 
-    # First, need to find out the number of nodes.
     sql = "SELECT NPROC();"
-    nproc = conn.execute(sql).fetchval()
+    return conn.execute(sql).fetchval()
+
+
+def _call_dummy_udf(conn: pyexasol.ExaConnection, schema: str | None,
+                    nproc: int | None = None, udf_name: str = _DUMMY_UDF_NAME,
+                    rows_per_node: int = DEFAULT_ROWS_PER_NODE) -> dict[int, timedelta]:
+    """
+    Runs the dummy UDF, aiming at all nodes. Returns the nodes it has run on,
+    with the latency at each of them.
+    """
+    # First, need to find out the number of nodes.
+    if nproc is None:
+        nproc = _get_nproc(conn)
 
-    # This query should run the dummy udf on all nodes.
-    udf_name = _get_test_udf_name(schema)
+    # This query should run the dummy udf on all nodes, and return one row per node.
+    udf_name = _get_test_udf_name(schema, udf_name)
     sql = dedent(f"""
-    SELECT {udf_name}(i) FROM VALUES BETWEEN 1 AND {nproc} t(i)
-    GROUP BY i;
+    SELECT node_id, MIN(latency) FROM (
+        SELECT {udf_name}(i, POSIX_TIME(CURRENT_TIMESTAMP), 0)
+        FROM VALUES BETWEEN 1 AND {nproc * rows_per_node} t(i)
+        GROUP BY i
+    ) GROUP BY node_id;
     """)
-    # The expected result is a collection of distinct node IDs from 0 to nproc - 1.
     result = conn.execute(sql).fetchall()
-    set_result = {row[0] for row in result}
+    return {int(node_id): _get_latency(latency) for node_id, latency in result}
 
-    assert set_result == set(range(nproc))
 
+def _get_latency(seconds: float) -> timedelta:
+    # The clocks of the nodes may be slightly off, hence the latency is kept non-negative.
+    return timedelta(seconds=max(float(seconds), 0.))
 
-def _delete_dummy_udf(conn: pyexasol.ExaConnection, schema: str | None) -> None:
 
-    udf_name = _get_test_udf_name(schema)
+def _warm_up_dummy_udf(conn: pyexasol.ExaConnection, schema: str | None, nproc: int,
+                       udf_name: str, vms_per_node: int, rows_per_node: int,
+                       hold: timedelta) -> WarmUpReport:
+    """
+    Runs the dummy UDF in enough overlapping calls to start the given number of VMs
+    on each node.
+    """
+    udf_name = _get_test_udf_name(schema, udf_name)
+    # The first call in a VM waits for the VM to start, the later calls in the same VM
+    # wait for the earlier ones. Hence, the start of a VM is the minimum latency in it,
+    # and a node is warmed up when its slowest VM has started.
+    sql = dedent(f"""
+    SELECT node_id, COUNT(vm_id), MAX(vm_latency) FROM (
+        SELECT node_id, vm_id, MIN(latency) AS vm_latency FROM (
+            SELECT {udf_name}(i, POSIX_TIME(CURRENT_TIMESTAMP), {hold.total_seconds()})
+            FROM VALUES BETWEEN 1 AND {nproc * rows_per_node * vms_per_node} t(i)
+            GROUP BY i
+        ) GROUP BY node_id, vm_id
+    ) GROUP BY node_id;
+    """)
+    result = conn.execute(sql).fetchall()
+    return WarmUpReport(nproc,
+                        latencies={int(node_id): _get_latency(latency)
+                                   for node_id, _, latency in sorted(result)},
+                        vms={int(node_id): int(vms) for node_id, vms, _ in sorted(result)})
+
+
+def _delete_dummy_udf(conn: pyexasol.ExaConnection, schema: str | None,
+                      udf_name: str = _DUMMY_UDF_NAME) -> None:
+
+    udf_name = _get_test_udf_name(schema, udf_name)
     sql = dedent(f"""
     DROP SCRIPT IF EXISTS {udf_name};
     """)
@@ -82,6 +272,120 @@ def _delete_schema(conn: pyexasol.ExaConnection, schema: str) -> None:
     conn.execute(query=sql)
 
 
+class ValidationSession:
+    """
+    A context manager for validating a language container repeatedly, at the minimal cost
+    per attempt. The probe UDF is created, and the number of nodes is queried, only once,
+    at the first attempt that gets that far. Subsequent attempts only run the probe query.
+    The UDF is dropped when the session is closed.
+
+    conn            - pyexasol connection. The language container must be activated either
+                    at the SYSTEM level or at the SESSION associated with this connection.
+    language_alias  - Language alias of the language container.
+    schema          - The schema to run the tests in. If not specified the current schema
+                    is assumed.
+    udf_name        - Name of the probe UDF. Sessions validating different containers
+                    in the same schema must use different names.
+    rows_per_node   - Number of rows the probe query spreads over the cluster, per node.
+
+    A node where the probe UDF has run once is considered ready in the subsequent attempts.
+    Hence, a node missed by the distribution of the rows in one attempt only needs to be
+    reached in another one.
+    """
+    def __init__(self, conn: pyexasol.ExaConnection,
+                 language_alias: str,
+                 schema: str | None = None,
+                 udf_name: str = _DUMMY_UDF_NAME,
+                 rows_per_node: int = DEFAULT_ROWS_PER_NODE) -> None:
+        self._conn = conn
+        self._language_alias = language_alias
+        self._schema = schema
+        self._udf_name = udf_name
+        self._rows_per_node = rows_per_node
+        self._nproc: int | None = None
+        self._latencies: dict[int, timedelta] = {}
+        self._udf_created = False
+        self._udf_needs_drop = False
+        self.readiness: NodeReadiness | None = None
+
+    def __enter__(self) -> ValidationSession:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def validate(self) -> NodeReadiness:
+        """
+        Runs one validation attempt. Will raise an exception if the language container
+        is not operational, a NodesNotReadyError if it's not operational on all nodes yet.
+        Returns the state of the container on the nodes, which is also available as the
+        readiness attribute.
+        """
+        nproc = self._prepare()
+        latencies = _call_dummy_udf(self._conn, self._schema, nproc, self._udf_name,
+                                    self._rows_per_node)
+        for node, latency in latencies.items():
+            self._latencies.setdefault(node, latency)
+        self.readiness = NodeReadiness(nproc, dict(sorted(self._latencies.items())))
+        if not self.readiness.all_ready:
+            raise NodesNotReadyError(self.readiness)
+        return self.readiness
+
+    def warm_up(self, vms_per_node: int = 1,
+                hold: timedelta = DEFAULT_WARM_UP_HOLD) -> WarmUpReport:
+        """
+        Starts the language container on all nodes, in the given number of VMs per node, so
+        that the first real UDF call doesn't pay for the extraction of the container and the
+        start of the interpreter. The probe UDF calls are held for a while, so that the database
+        runs them in parallel VMs. The database decides how many VMs it starts on a node though,
+        so it may be fewer than requested. Returns the time each node took to warm up.
+
+        vms_per_node    - Number of VMs to start on each node.
+        hold            - The minimum duration of a probe UDF call.
+        """
+        nproc = self._prepare()
+        return _warm_up_dummy_udf(self._conn, self._schema, nproc, self._udf_name,
+                                  vms_per_node, self._rows_per_node, hold)
+
+    def _prepare(self) -> int:
+        # Creates the probe UDF, retrying the CREATE in the next attempt if it fails.
+        # Returns the number of nodes, which is queried once.
+        if not self._udf_created:
+            # A failed CREATE may still have left the UDF behind, so it gets dropped anyway.
+            self._udf_needs_drop = True
+            _create_dummy_udf(self._conn, self._language_alias, self._schema, self._udf_name)
+            self._udf_created = True
+        if self._nproc is None:
+            self._nproc = _get_nproc(self._conn)
+        return self._nproc
+
+    def close(self) -> None:
+        """
+        Drops the probe UDF, if its creation has been attempted.
+        """
+        if self._udf_needs_drop:
+            self._udf_needs_drop = False
+            self._udf_created = False
+            _delete_dummy_udf(self._conn, self._schema, self._udf_name)
+
+
+def _validate(session: ValidationSession, language_alias: str,
+              metrics: DeploymentMetrics | None,
+              readiness_callback: ReadinessCallback | None = None) -> None:
+    try:
+        if metrics is None:
+            session.validate()
+        else:
+            with metrics.phase(PHASE_VALIDATION_ATTEMPT, language_alias=language_alias):
+                session.validate()
+    except NodesNotReadyError as ex:
+        logger.info('The language container %s: %s.', language_alias, ex.readiness)
+        raise
+    finally:
+        if (readiness_callback is not None) and (session.readiness is not None):
+            readiness_callback(language_alias, session.readiness)
+
+
 def validate_language_container(conn: pyexasol.ExaConnection,
                                 language_alias: str,
                                 schema: str | None = None
@@ -96,21 +400,23 @@ def validate_language_container(conn: pyexasol.ExaConnection,
     schema          - The schema to run the tests in. If not specified the current schema
                     is assumed.
     """
-    try:
-        _create_dummy_udf(conn, language_alias, schema)
-        _call_dummy_udf(conn, schema)
-    finally:
-        _delete_dummy_udf(conn, schema)
+    with ValidationSession(conn, language_alias, schema) as session:
+        session.validate()
 
 
 def wait_language_container(conn: pyexasol.ExaConnection,
                             language_alias: str,
                             schema: str | None = None,
                             timeout: timedelta = timedelta(minutes=5),
-                            interval: timedelta = timedelta(seconds=5),
-                            ) -> None:
+                            interval: timedelta | None = None,
+                            wait_strategy: wait_base | None = None,
+                            metrics: DeploymentMetrics | None = None,
+                            readiness_callback: ReadinessCallback | None = None,
+                            ) -> timedelta:
     """
-    Keeps calling validate_language_container until it succeeds or the timeout expires.
+    Keeps validating the language container until it succeeds or the timeout expires.
+    All attempts share one ValidationSession, so the probe UDF is created and dropped only once.
+    Returns the time it took for the language container to become operational.
 
     conn            - pyexasol connection. The language container must be activated either
                     at the SYSTEM level or at the SESSION associated with this connection.
@@ -118,15 +424,119 @@ def wait_language_container(conn: pyexasol.ExaConnection,
     schema          - The schema to run the tests in. If not specified the current schema
                     is assumed.
     timeout         - Will give up after this timeout expires. The last exception thrown
-                    by the validate_language_container will be re-raised.
-    interval        - The calls to validate_language_container are spaced by this time
+                    by the validation will be re-raised.
+    interval        - If provided, the validation attempts are spaced by this fixed time
+                    interval.
+    wait_strategy   - A tenacity wait strategy, defining the intervals between the validation
+                    attempts. Ignored if the interval is provided.
+                    Defaults to the adaptive_wait.
+    metrics         - If provided, each validation attempt is recorded in it.
+    readiness_callback - If provided, it receives the language alias and the state of
+                    the container on the nodes after each validation attempt, e.g.
+                    58/64 nodes ready.
+    """
+    wait_strategy = _get_wait_strategy(interval, wait_strategy)
+    start_time = time.monotonic()
+    with ValidationSession(conn, language_alias, schema) as session:
+
+        @retry(reraise=True, wait=_wait_within(wait_strategy, timeout),
+               stop=stop_after_delay(timeout))
+        def repeat_validate_language_container():
+            _validate(session, language_alias, metrics, readiness_callback)
+
+        repeat_validate_language_container()
+    elapsed = timedelta(seconds=time.monotonic() - start_time)
+    logger.debug('The language container %s became operational in %s', language_alias, elapsed)
+    return elapsed
+
+
+def wait_language_containers(conn: pyexasol.ExaConnection,
+                             language_aliases: list[str],
+                             schema: str | None = None,
+                             timeout: timedelta = timedelta(minutes=5),
+                             interval: timedelta | None = None,
+                             wait_strategy: wait_base | None = None,
+                             metrics: DeploymentMetrics | None = None,
+                             readiness_callback: ReadinessCallback | None = None,
+                             ) -> dict[str, timedelta]:
+    """
+    Keeps validating several language containers until all of them succeed or the timeout
+    expires. Each container gets its own ValidationSession, with a distinct probe UDF,
+    in the same schema. An attempt only validates the containers that haven't yet become
+    operational. Returns the time it took for each language container to become operational.
+
+    conn            - pyexasol connection. The language containers must be activated either
+                    at the SYSTEM level or at the SESSION associated with this connection.
+    language_aliases - Language aliases of the language containers.
+    schema          - The schema to run the tests in. If not specified the current schema
+                    is assumed.
+    timeout         - Will give up after this timeout expires. The last exception thrown
+                    by the validation will be re-raised.
+    interval        - If provided, the validation attempts are spaced by this fixed time
                     interval.
+    wait_strategy   - A tenacity wait strategy, defining the intervals between the validation
+                    attempts. Ignored if the interval is provided.
+                    Defaults to the adaptive_wait.
+    metrics         - If provided, each validation attempt is recorded in it.
+    readiness_callback - If provided, it receives the language alias and the state of
+                    the container on the nodes after each validation attempt.
+    """
+    wait_strategy = _get_wait_strategy(interval, wait_strategy)
+    start_time = time.monotonic()
+    ready: dict[str, timedelta] = {}
+    with ExitStack() as stack:
+        sessions = {
+            language_alias: stack.enter_context(ValidationSession(
+                conn, language_alias, schema, f'{_DUMMY_UDF_NAME}_{index}'))
+            for index, language_alias in enumerate(dict.fromkeys(language_aliases))
+        }
+
+        @retry(reraise=True, wait=_wait_within(wait_strategy, timeout),
+               stop=stop_after_delay(timeout))
+        def repeat_validate_language_containers():
+            error: Exception | None = None
+            for language_alias, session in sessions.items():
+                if language_alias in ready:
+                    continue
+                try:
+                    _validate(session, language_alias, metrics, readiness_callback)
+                    ready[language_alias] = timedelta(seconds=time.monotonic() - start_time)
+                    logger.debug('The language container %s became operational in %s',
+                                 language_alias, ready[language_alias])
+                except Exception as ex:     # pylint: disable=broad-exception-caught
+                    error = ex
+            if error is not None:
+                raise error
+
+        repeat_validate_language_containers()
+    return ready
+
+
+def warm_up_language_container(conn: pyexasol.ExaConnection,
+                               language_alias: str,
+                               schema: str | None = None,
+                               vms_per_node: int = 1,
+                               hold: timedelta = DEFAULT_WARM_UP_HOLD) -> WarmUpReport:
     """
-    @retry(reraise=True, wait=wait_fixed(interval), stop=stop_after_delay(timeout))
-    def repeat_validate_language_container():
-        validate_language_container(conn, language_alias, schema)
+    Starts an operational language container on all nodes of the cluster, see the
+    ValidationSession.warm_up. The nodes the warm-up hasn't reached are logged, but not
+    treated as an error. Returns the time each node took to warm up.
 
-    repeat_validate_language_container()
+    conn            - pyexasol connection. The language container must be activated either
+                    at the SYSTEM level or at the SESSION associated with this connection.
+    language_alias  - Language alias of the language container.
+    schema          - The schema to run the probe UDF in. If not specified the current schema
+                    is assumed.
+    vms_per_node    - Number of VMs to start on each node.
+    hold            - The minimum duration of a probe UDF call.
+    """
+    with ValidationSession(conn, language_alias, schema) as session:
+        report = session.warm_up(vms_per_node, hold)
+    logger.info('The language container %s: %s.', language_alias, report)
+    if report.missing_nodes:
+        logger.warning('The warm-up of the language container %s has not reached the nodes %s.',
+                       language_alias, ', '.join(str(node) for node in report.missing_nodes))
+    return report
 
 
 @contextmanager
@@ -147,3 +557,66 @@ def temp_schema(conn: pyexasol.ExaConnection,
         yield schema
     finally:
         _delete_schema(conn, schema)
+
+
+async def validate_language_container_async(conn: pyexasol.ExaConnection,
+                                            language_alias: str,
+                                            schema: str | None = None,
+                                            executor: Executor | None = None) -> None:
+    """
+    A coroutine equivalent of the validate_language_container. The database calls are
+    executed in the executor, by default the one of the event loop.
+    """
+    await asyncio.get_running_loop().run_in_executor(
+        executor, validate_language_container, conn, language_alias, schema)
+
+
+async def wait_language_container_async(conn: pyexasol.ExaConnection,
+                                        language_alias: str,
+                                        schema: str | None = None,
+                                        timeout: timedelta = timedelta(minutes=5),
+                                        interval: timedelta | None = None,
+                                        wait_strategy: wait_base | None = None,
+                                        metrics: DeploymentMetrics | None = None,
+                                        executor: Executor | None = None,
+                                        readiness_callback: ReadinessCallback | None = None,
+                                        ) -> timedelta:
+    """
+    A coroutine equivalent of the wait_language_container. Each validation attempt is
+    executed in the executor, by default the one of the event loop. The waiting between
+    the attempts doesn't occupy a thread.
+    """
+    wait_strategy = _get_wait_strategy(interval, wait_strategy)
+    loop = asyncio.get_running_loop()
+    start_time = time.monotonic()
+    session = ValidationSession(conn, language_alias, schema)
+    try:
+        async for attempt in AsyncRetrying(reraise=True, wait=_wait_within(wait_strategy, timeout),
+                                           stop=stop_after_delay(timeout)):
+            with attempt:
+                await loop.run_in_executor(executor, _validate, session, language_alias, metrics,
+                                           readiness_callback)
+    finally:
+        await loop.run_in_executor(executor, session.close)
+    elapsed = timedelta(seconds=time.monotonic() - start_time)
+    logger.debug('The language container %s became operational in %s', language_alias, elapsed)
+    return elapsed
+
+
+@asynccontextmanager
+async def temp_schema_async(conn: pyexasol.ExaConnection,
+                            schema_name_length: int = 20,
+                            executor: Executor | None = None
+                            ) -> AsyncGenerator[str, None]:
+    """
+    An asynchronous equivalent of the temp_schema context manager. The database calls are
+    executed in the executor, by default the one of the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    schema = ''
+    try:
+        schema = await loop.run_in_executor(executor, _create_random_schema, conn,
+                                            schema_name_length)
+        yield schema
+    finally:
+        await loop.run_in_executor(executor, _delete_schema, conn, schema)
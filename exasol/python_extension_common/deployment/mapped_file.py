@@ -0,0 +1,94 @@
+from __future__ import annotations
+from typing import Callable, Iterable, Iterator, Optional
+from pathlib import Path
+import mmap
+
+# The default size of the chunks a memory-mapped file is sent in.
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+# A function receiving each chunk of the file, e.g. the update method of a hash.
+ChunkObserver = Callable[[memoryview], None]
+
+
+class MappedFileBody:
+    """
+    An upload body sending a local file directly from its memory mapping.
+
+    Iterating over the body yields read-only memoryview slices of the mapping, of the buffer
+    size. An http client accepting an iterable body, such as requests, passes them to the
+    socket as they are, so the file content is not copied through the Python buffers, and
+    the number of the Python level operations doesn't depend on the client's block size.
+    The length of the body is the file size, so that an upload can send the Content-Length.
+    The pages already sent are released from the mapping, so that the resident memory of
+    the process doesn't grow with the file size.
+
+    Each chunk is passed to the observers before it's yielded. Should the body be iterated
+    more than once, e.g. by a client inspecting the first chunk, the observers still receive
+    every part of the file exactly once, and in order.
+
+    The body is not a file object. Storage backends accepting only file objects, such as
+    the mounted BucketFS, can't upload it.
+
+    path        - Path of the file in a local file system.
+    buffer_size - Size of the chunks the file is sent in.
+    observers   - Functions receiving the chunks.
+    """
+    def __init__(self, path: Path, buffer_size: int = DEFAULT_BUFFER_SIZE,
+                 observers: Iterable[ChunkObserver] = ()) -> None:
+        if buffer_size < 1:
+            raise ValueError('The buffer size must be a positive number.')
+        self._buffer_size = buffer_size
+        self._observers = list(observers)
+        self._observed = 0
+        self._released = 0
+        self._mmap: Optional[mmap.mmap] = None
+        with open(path, 'rb') as f:
+            self._size = f.seek(0, 2)
+            # An empty file cannot be mapped.
+            if self._size:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if (self._mmap is not None) and hasattr(mmap, 'MADV_SEQUENTIAL'):
+            # Lets the kernel read ahead more aggressively and drop the pages sent.
+            self._mmap.madvise(mmap.MADV_SEQUENTIAL)
+
+    def __enter__(self) -> MappedFileBody:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[memoryview]:
+        if self._mmap is None:
+            return
+        with memoryview(self._mmap) as view:
+            for start in range(0, self._size, self._buffer_size):
+                chunk = view[start:start + self._buffer_size]
+                if start == self._observed:
+                    for observer in self._observers:
+                        observer(chunk)
+                    self._observed += len(chunk)
+                yield chunk
+                self._release(start + len(chunk))
+
+    def _release(self, end: int) -> None:
+        # The pages stay in the page cache. Should a released part be accessed again,
+        # it is mapped back in.
+        end -= end % mmap.PAGESIZE
+        if (self._mmap is not None) and hasattr(mmap, 'MADV_DONTNEED') and \
+                (end > self._released):
+            self._mmap.madvise(mmap.MADV_DONTNEED, self._released, end - self._released)
+            self._released = end
+
+    def close(self) -> None:
+        """
+        Unmaps the file. If a chunk is still referenced, the mapping is released with it.
+        """
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass
+            self._mmap = None
@@ -0,0 +1,179 @@
+from __future__ import annotations
+from typing import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import PurePosixPath
+from urllib.parse import urlsplit, parse_qs
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# Path of the UDF client in a Python language container, relative to the container root.
+PYTHON_CLIENT_PATH = 'exaudf/exaudfclient_py3'
+
+_TOKEN_PATTERN = re.compile(r'(\s*)(\S+)')
+
+
+@dataclass(frozen=True)
+class LanguageDefinition:
+    """
+    A single definition in the SCRIPT_LANGUAGES parameter, i.e. ALIAS=URL.
+    Built-in languages have just a name instead of the URL, e.g. PYTHON3=builtin_python3.
+
+    alias   - The language alias.
+    url     - Everything after the equal sign, exactly as it appears in the settings.
+    """
+    alias: str
+    url: str
+
+    @classmethod
+    def parse(cls, definition: str) -> LanguageDefinition:
+        alias, sep, url = definition.partition('=')
+        if not (alias and sep and url):
+            raise ValueError(f'Invalid language definition "{definition}". '
+                             'The expected format is ALIAS=URL.')
+        return cls(alias, url)
+
+    @classmethod
+    def for_container(cls, alias: str, path_in_udf: PurePosixPath,
+                      lang: str = 'python',
+                      client_path: str = PYTHON_CLIENT_PATH) -> LanguageDefinition:
+        """
+        Creates a definition of a language container uploaded to the BucketFS.
+
+        alias           - The language alias.
+        path_in_udf     - Path of the container, as it's seen from a UDF, e.g.
+                          /buckets/bfsdefault/default/container/my_slc
+        lang            - The language of the container.
+        client_path     - Path of the UDF client, relative to the container root.
+        """
+        path_in_udf_without_buckets = PurePosixPath(*path_in_udf.parts[2:])
+        return cls(alias, f'localzmq+protobuf:///{path_in_udf_without_buckets}?'
+                          f'lang={lang}#{path_in_udf}/{client_path}')
+
+    @property
+    def is_builtin(self) -> bool:
+        return '://' not in self.url
+
+    @property
+    def container_path(self) -> str | None:
+        """
+        Path of the container in the BucketFS, relative to the /buckets directory,
+        e.g. bfsdefault/default/container/my_slc. None for a built-in language.
+        """
+        return None if self.is_builtin else urlsplit(self.url).path.lstrip('/')
+
+    @property
+    def lang(self) -> str | None:
+        """ The language of the container, e.g. python. None for a built-in language. """
+        if self.is_builtin:
+            return None
+        values = parse_qs(urlsplit(self.url).query).get('lang')
+        return values[0] if values else None
+
+    @property
+    def client_path(self) -> str | None:
+        """ Full path of the UDF client, as it's seen from a UDF. None for a built-in language. """
+        if self.is_builtin:
+            return None
+        return urlsplit(self.url).fragment or None
+
+    def __str__(self) -> str:
+        return f'{self.alias}={self.url}'
+
+
+class ScriptLanguages:
+    """
+    A parsed value of the SCRIPT_LANGUAGES parameter - an ordered map of language aliases
+    to their definitions. An unmodified object converts back to exactly the string it has
+    been parsed from. New and replaced definitions are appended to the end.
+
+    The database doesn't validate the parameter. A token that is not a definition, or a
+    repeated definition of an alias, is kept as it is, but it's not accessible by the alias.
+    Replacing or removing the alias removes its repeated definitions too.
+    """
+    def __init__(self, definitions: Iterable[LanguageDefinition] = ()) -> None:
+        # Alias => (whitespace preceding the definition, definition). An unparsed token
+        # is stored as a string under a key of its own.
+        self._definitions: dict[object, tuple[str, LanguageDefinition | str]] = {}
+        self._trailer = ''
+        for definition in definitions:
+            self.set(definition)
+
+    @classmethod
+    def parse(cls, settings: str) -> ScriptLanguages:
+        """
+        Parses the value of the SCRIPT_LANGUAGES parameter. Logs a warning about the tokens
+        that are not valid definitions and the repeated aliases.
+        """
+        languages = cls()
+        end = 0
+        for match in _TOKEN_PATTERN.finditer(settings):
+            whitespace, token = match.groups()
+            end = match.end()
+            try:
+                definition = LanguageDefinition.parse(token)
+            except ValueError:
+                logger.warning('Invalid language definition "%s" in the SCRIPT_LANGUAGES '
+                               'is kept as it is.', token)
+                languages._definitions[object()] = (whitespace, token)
+                continue
+            if definition.alias in languages:
+                logger.warning('Duplicate definition of the language alias %s in the '
+                               'SCRIPT_LANGUAGES is kept as it is.', definition.alias)
+                languages._definitions[object()] = (whitespace, token)
+                continue
+            languages._definitions[definition.alias] = (whitespace, definition)
+        languages._trailer = settings[end:]
+        return languages
+
+    def __str__(self) -> str:
+        return ''.join(whitespace + str(definition)
+                       for whitespace, definition in self._definitions.values()) + self._trailer
+
+    def __contains__(self, alias: object) -> bool:
+        return isinstance(alias, str) and (alias in self._definitions)
+
+    def __getitem__(self, alias: str) -> LanguageDefinition:
+        return self._definitions[alias][1]     # type: ignore
+
+    def __iter__(self) -> Iterator[str]:
+        return iter([alias for alias in self._definitions if isinstance(alias, str)])
+
+    def __len__(self) -> int:
+        return sum(isinstance(alias, str) for alias in self._definitions)
+
+    def definitions(self) -> list[LanguageDefinition]:
+        return [definition for _, definition in self._definitions.values()
+                if isinstance(definition, LanguageDefinition)]
+
+    def set(self, definition: LanguageDefinition) -> None:
+        """
+        Adds a new definition, or replaces an existing one with the same alias.
+        Either way, the definition goes to the end.
+        """
+        self.remove([definition.alias])
+        whitespace = ' ' if self._definitions else ''
+        self._definitions[definition.alias] = (whitespace, definition)
+
+    def update(self, definitions: Iterable[LanguageDefinition]) -> None:
+        """
+        Adds or replaces multiple definitions.
+        """
+        for definition in definitions:
+            self.set(definition)
+
+    def remove(self, aliases: Iterable[str]) -> None:
+        """
+        Removes the definitions of the specified aliases, ignoring those not defined.
+        """
+        first_key = next(iter(self._definitions), None)
+        prefixes = tuple(f'{alias}=' for alias in aliases)
+        for key, (_, definition) in list(self._definitions.items()):
+            if str(definition).startswith(prefixes):
+                del self._definitions[key]
+        # The new first definition shall not be preceded by a separator.
+        if self._definitions and (first_key not in self._definitions):
+            first_key = next(iter(self._definitions))
+            whitespace, definition = self._definitions[first_key]
+            self._definitions[first_key] = (whitespace.lstrip(' '), definition)
@@ -0,0 +1,79 @@
+from __future__ import annotations
+from typing import BinaryIO, Iterator, Optional, Union
+import io
+
+# Size of the chunks a stream is iterated in.
+ITER_CHUNK_SIZE = 1024 * 1024
+
+# A binary stream a container can be read from, e.g. an open file or one of the readers.
+ReadableStream = Union[BinaryIO, io.RawIOBase]
+
+
+class CountingReader(io.RawIOBase):
+    """
+    Base of the read-only binary streams passed to the BucketFS uploads. Counts the bytes
+    read, which is also the position of the stream. A subclass implements the _readinto.
+
+    The stream has no length. The http client calls len() on any body that has the __len__,
+    hence only a stream of a known size may have it, see the with_length. A stream without
+    the length is sent with the chunked transfer encoding.
+
+    The stream is iterated in chunks of a fixed size, not in lines, so that an http client
+    iterating the body doesn't read the binary data byte by byte.
+    """
+    def __init__(self) -> None:
+        super().__init__()
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.bytes_read
+
+    def readinto(self, buffer) -> int:
+        size = self._readinto(buffer)
+        self.bytes_read += size
+        return size
+
+    def _readinto(self, buffer) -> int:
+        """
+        Reads up to len(buffer) bytes into the buffer and returns the number of bytes read,
+        0 at the end of the stream.
+        """
+        raise NotImplementedError
+
+    def __iter__(self) -> Iterator[bytes]:      # type: ignore
+        return iter(lambda: self.read(ITER_CHUNK_SIZE), b'')
+
+
+class LengthReader(CountingReader):
+    """
+    A read-only binary stream reporting the known size of the underlying stream as its
+    length, so that an upload can send the Content-Length. The data is read directly into
+    the caller's buffer, it is not copied.
+
+    stream  - The underlying stream.
+    size    - Size of the underlying stream.
+    """
+    def __init__(self, stream: ReadableStream, size: int) -> None:
+        super().__init__()
+        self._stream = stream
+        self._size = size
+
+    def _readinto(self, buffer) -> int:
+        return self._stream.readinto(buffer) or 0    # type: ignore
+
+    def __len__(self) -> int:
+        return self._size
+
+
+def with_length(stream: ReadableStream, size: Optional[int]) -> ReadableStream:
+    """
+    Returns a stream to be passed to an upload. That's a LengthReader if the size of the
+    stream is known, or the stream itself otherwise.
+
+    stream  - The stream to be uploaded.
+    size    - Size of the stream, if known.
+    """
+    return stream if size is None else LengthReader(stream, size)
@@ -0,0 +1,182 @@
+from __future__ import annotations
+from typing import Callable, Optional
+from collections import deque
+from dataclasses import dataclass
+from datetime import timedelta
+import threading
+import time
+
+from exasol.python_extension_common.deployment.sized_reader import CountingReader, ReadableStream
+
+# Names of the transfers reported by the deployer.
+OPERATION_DOWNLOAD = 'download'
+OPERATION_UPLOAD = 'upload'
+
+# The minimum time between two progress reports, in seconds.
+DEFAULT_REPORT_INTERVAL = 0.2
+
+# The throughput is measured over this time window, in seconds.
+_RATE_WINDOW = 5.0
+
+_UNITS = ['B', 'KiB', 'MiB', 'GiB', 'TiB']
+
+
+@dataclass(frozen=True)
+class TransferProgress:
+    """
+    A snapshot of a running transfer.
+
+    operation       - What is being transferred, e.g. upload.
+    transferred     - Number of bytes transferred so far.
+    total           - Total number of bytes, None if unknown.
+    elapsed         - Seconds since the transfer started.
+    bytes_per_second - The recent throughput.
+    done            - True in the last report of the transfer.
+    """
+    operation: str
+    transferred: int
+    total: Optional[int]
+    elapsed: float
+    bytes_per_second: float
+    done: bool = False
+
+    @property
+    def fraction(self) -> Optional[float]:
+        """ The transferred part of the total, None if the total is unknown. """
+        if not self.total:
+            return None
+        return min(self.transferred / self.total, 1.)
+
+    @property
+    def eta(self) -> Optional[timedelta]:
+        """ The expected remaining time, None if the total or the throughput is unknown. """
+        if self.done:
+            return timedelta(0)
+        if (self.total is None) or (self.bytes_per_second <= 0):
+            return None
+        remaining = max(self.total - self.transferred, 0)
+        return timedelta(seconds=round(remaining / self.bytes_per_second))
+
+
+ProgressCallback = Callable[[TransferProgress], None]
+
+
+def format_size(size: float) -> str:
+    """
+    Formats a number of bytes with a binary unit, e.g. 1.5 GiB.
+    """
+    for unit in _UNITS[:-1]:
+        if abs(size) < 1024:
+            return f'{size:.1f} {unit}' if unit != 'B' else f'{size:.0f} B'
+        size /= 1024
+    return f'{size:.1f} {_UNITS[-1]}'
+
+
+def format_progress(progress: TransferProgress, bar_width: int = 30) -> str:
+    """
+    Formats a progress report as a single line with a progress bar, e.g.
+    upload [#########.....................]  30.0% 1.2 GiB/4.0 GiB  85.3 MiB/s ETA 0:00:34
+
+    progress    - The progress report.
+    bar_width   - Number of characters of the bar. A transfer of an unknown size has no bar.
+    """
+    fraction = progress.fraction
+    parts = [progress.operation]
+    if fraction is not None:
+        filled = int(fraction * bar_width)
+        parts.append(f'[{"#" * filled}{"." * (bar_width - filled)}] {fraction * 100:5.1f}%')
+        parts.append(f'{format_size(progress.transferred)}/{format_size(progress.total or 0)}')
+    else:
+        parts.append(format_size(progress.transferred))
+    parts.append(f'{format_size(progress.bytes_per_second)}/s')
+    eta = progress.eta
+    if eta is not None:
+        parts.append(f'ETA {eta}')
+    return ' '.join(parts)
+
+
+class ProgressTracker:
+    """
+    Counts the bytes of a transfer and passes the progress to a callback, not more often
+    than the report interval, plus once when the transfer is finished. The counting is
+    thread-safe, so that multiple streams of a parallel transfer can share a tracker.
+
+    operation       - What is being transferred, e.g. upload.
+    total           - Total number of bytes, if known.
+    callback        - The function receiving the progress reports.
+    report_interval - The minimum time between two reports, in seconds.
+    """
+    def __init__(self, operation: str, total: Optional[int], callback: ProgressCallback,
+                 report_interval: float = DEFAULT_REPORT_INTERVAL) -> None:
+        self._operation = operation
+        self._total = total
+        self._callback = callback
+        self._report_interval = report_interval
+        self._transferred = 0
+        self._start_time = time.monotonic()
+        self._last_report = -report_interval
+        # Samples of the time and transferred bytes, for the throughput measurement.
+        self._samples: deque[tuple[float, int]] = deque([(self._start_time, 0)])
+        self._done = False
+        self._lock = threading.Lock()
+
+    @property
+    def transferred(self) -> int:
+        return self._transferred
+
+    def _make_report(self, now: float, done: bool) -> TransferProgress:
+        self._samples.append((now, self._transferred))
+        while (len(self._samples) > 2) and (now - self._samples[1][0] >= _RATE_WINDOW):
+            self._samples.popleft()
+        first_time, first_transferred = self._samples[0]
+        rate = (self._transferred - first_transferred) / (now - first_time) \
+            if now > first_time else 0.
+        return TransferProgress(self._operation, self._transferred, self._total,
+                                now - self._start_time, rate, done)
+
+    def update(self, size: int) -> None:
+        """
+        Adds the number of bytes transferred since the previous update.
+        """
+        report = None
+        with self._lock:
+            self._transferred += size
+            now = time.monotonic()
+            if now - self._last_report >= self._report_interval:
+                self._last_report = now
+                report = self._make_report(now, False)
+        if report is not None:
+            self._callback(report)
+
+    def finish(self) -> None:
+        """
+        Sends the final report. Subsequent calls have no effect.
+        """
+        with self._lock:
+            if self._done:
+                return
+            self._done = True
+            report = self._make_report(time.monotonic(), True)
+        self._callback(report)
+
+
+class ProgressReader(CountingReader):
+    """
+    A read-only binary stream reporting the progress of reading the underlying stream.
+    The data is read directly into the caller's buffer, it is not copied.
+
+    stream  - The underlying stream.
+    tracker - The tracker the progress is reported to.
+    """
+    def __init__(self, stream: ReadableStream, tracker: ProgressTracker) -> None:
+        super().__init__()
+        self._stream = stream
+        self._tracker = tracker
+
+    def _readinto(self, buffer) -> int:
+        size = self._stream.readinto(buffer)     # type: ignore
+        if size:
+            self._tracker.update(size)
+        else:
+            self._tracker.finish()
+        return size or 0
@@ -0,0 +1,112 @@
+from __future__ import annotations
+from pathlib import Path
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from test.utils.bucketfs_stand_in import bucketfs_stand_in
+
+# Container sizes, in MiB, can be overridden with a comma separated list, e.g. 10,100,1000,4096.
+SIZES_MB = [int(size) for size in os.environ.get('SLC_BENCHMARK_SIZES_MB', '10,100').split(',')]
+
+# If set, the measurements are written to this file as JSON.
+REPORT_FILE = os.environ.get('SLC_BENCHMARK_REPORT')
+
+# The memory used by a streaming transfer must not grow with the container size.
+MAX_PEAK_RSS_INCREASE = 64 * 1024 * 1024
+
+_MIB = 1024 * 1024
+
+_ROOT_DIR = Path(__file__).parents[2]
+
+_results: list[dict] = []
+
+
+@pytest.fixture(scope='module', autouse=True)
+def report():
+    yield
+    lines = [f'{"mode":<10}{"conn":>5}{"zero-copy":>10}{"buffer KiB":>11}{"MiB":>8}{"MiB/s":>10}'
+             f'{"CPU s":>10}{"CPU s/GiB":>10}{"peak RSS MiB":>14}']
+    for result in _results:
+        lines.append(f'{result["mode"]:<10}{result["connections"]:>5}'
+                     f'{"yes" if result["zero_copy"] else "no":>10}'
+                     f'{result["buffer_size"] // 1024:>11}'
+                     f'{result["size"] / _MIB:>8.0f}{result["mib_per_second"]:>10.1f}'
+                     f'{result["cpu_seconds"]:>10.2f}{result["cpu_seconds_per_gib"]:>10.2f}'
+                     f'{result["peak_rss"] / _MIB:>14.1f}')
+    print('\n' + '\n'.join(lines))
+    if REPORT_FILE:
+        Path(REPORT_FILE).write_text(json.dumps(_results, indent=2))
+
+
+@pytest.fixture(scope='module')
+def stand_in(tmp_path_factory):
+    with bucketfs_stand_in(tmp_path_factory.mktemp('bucket')) as stand_in:
+        yield stand_in
+
+
+def _make_container(path: Path, size_mb: int) -> None:
+    # Random data doesn't compress, like a real gzip archive.
+    block = os.urandom(_MIB)
+    with open(path, 'wb') as f:
+        for _ in range(size_mb):
+            f.write(block)
+
+
+@pytest.fixture(scope='module', params=SIZES_MB, ids=lambda size: f'{size}MB')
+def container_file(request, tmp_path_factory, stand_in) -> Path:
+    size_mb = request.param
+    container_file = tmp_path_factory.mktemp('containers') / f'slc_{size_mb}mb.tar.gz'
+    _make_container(container_file, size_mb)
+    # A copy in the stand-in serves as the source of the downloads.
+    source = stand_in.root / 'source' / container_file.name
+    source.parent.mkdir(exist_ok=True)
+    os.link(container_file, source)
+    yield container_file
+    source.unlink()
+    container_file.unlink()
+
+
+def _run_case(stand_in, container_file: Path, mode: str, connections: int = 1,
+              zero_copy: bool = False, buffer_size: int = _MIB) -> dict:
+    source_url = f'{stand_in.url}/default/source/{container_file.name}'
+    args = [sys.executable, '-m', 'test.benchmark.upload_benchmark', '--mode', mode,
+            '--bucketfs-url', stand_in.url, '--container-file', str(container_file),
+            '--source-url', source_url, '--connections', str(connections),
+            '--buffer-size', str(buffer_size)]
+    if zero_copy:
+        args.append('--zero-copy')
+    output = subprocess.run(args, cwd=_ROOT_DIR, check=True, capture_output=True,
+                            text=True).stdout
+    # The deployer may print the activation commands before the result.
+    result = json.loads(output.strip().splitlines()[-1])
+    _results.append(result)
+    return result
+
+
+@pytest.mark.benchmark
+def test_upload_container(stand_in, container_file):
+    result = _run_case(stand_in, container_file, 'upload')
+    assert (stand_in.root / 'container' / 'bench.tar.gz').stat().st_size == result['size']
+    assert result['peak_rss_increase'] < MAX_PEAK_RSS_INCREASE
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize('buffer_size', [64 * 1024, _MIB, 4 * _MIB],
+                         ids=lambda size: f'{size // 1024}KiB')
+def test_upload_container_zero_copy(stand_in, container_file, buffer_size):
+    result = _run_case(stand_in, container_file, 'upload', zero_copy=True,
+                       buffer_size=buffer_size)
+    assert (stand_in.root / 'container' / 'bench.tar.gz').stat().st_size == result['size']
+    assert result['peak_rss_increase'] < MAX_PEAK_RSS_INCREASE
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize('connections', [1, 4])
+def test_download_and_run(stand_in, container_file, connections):
+    result = _run_case(stand_in, container_file, 'download', connections)
+    assert (stand_in.root / 'container' / 'bench.tar.gz').stat().st_size == result['size']
+    assert result['peak_rss_increase'] < MAX_PEAK_RSS_INCREASE
@@ -0,0 +1,104 @@
+"""
+Runs one upload benchmark case and prints its measurements as JSON.
+
+Every case runs in a fresh process, so that the peak RSS and the CPU time are those of
+the deployer alone. The BucketFS stand-in runs in the calling process.
+"""
+from __future__ import annotations
+from pathlib import Path
+import argparse
+import json
+import resource
+import time
+
+import exasol.bucketfs as bfs
+
+from exasol.python_extension_common.deployment.language_container_deployer import (
+    LanguageContainerDeployer)
+from exasol.python_extension_common.deployment.mapped_file import DEFAULT_BUFFER_SIZE
+
+MODE_UPLOAD = 'upload'
+MODE_DOWNLOAD = 'download'
+
+
+class _NoDatabaseConnection:
+    """
+    Stands in for the database connection, whose calls are not benchmarked. Reports
+    empty language settings and accepts any ALTER command.
+    """
+    class _Result:
+        def fetchall(self):
+            return [('', '')]
+
+    is_closed = False
+
+    def execute(self, *args, **kwargs):
+        return self._Result()
+
+    def close(self):
+        pass
+
+
+def _get_peak_rss() -> int:
+    # The ru_maxrss is in kilobytes on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _get_cpu_time() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def run_case(mode: str, bucketfs_url: str, container_file: Path, source_url: str,
+             connections: int, zero_copy: bool = False,
+             buffer_size: int = DEFAULT_BUFFER_SIZE) -> dict:
+    bucketfs_path = bfs.path.build_path(backend=bfs.path.StorageBackend.onprem, url=bucketfs_url,
+                                        username='w', password='write', bucket_name='default',
+                                        service_name='bfsdefault', verify=False,
+                                        path='container')
+    deployer = LanguageContainerDeployer(_NoDatabaseConnection(), 'PYTHON3_BENCH',  # type: ignore
+                                         bucketfs_path, zero_copy_upload=zero_copy,
+                                         upload_buffer_size=buffer_size)
+    size = container_file.stat().st_size
+    rss_before = _get_peak_rss()
+    cpu_before = _get_cpu_time()
+    start_time = time.perf_counter()
+    if mode == MODE_UPLOAD:
+        deployer.upload_container(container_file, 'bench.tar.gz')
+    else:
+        deployer.download_and_run(source_url, 'bench.tar.gz', alter_system=False,
+                                  wait_for_completion=False, connections=connections)
+    seconds = time.perf_counter() - start_time
+    cpu_seconds = _get_cpu_time() - cpu_before
+    return {
+        'mode': mode,
+        'connections': connections,
+        'zero_copy': zero_copy,
+        'buffer_size': buffer_size,
+        'size': size,
+        'seconds': seconds,
+        'mib_per_second': size / seconds / (1024 * 1024),
+        'cpu_seconds': cpu_seconds,
+        'cpu_seconds_per_gib': cpu_seconds / size * 1024 ** 3,
+        'peak_rss': _get_peak_rss(),
+        'peak_rss_increase': _get_peak_rss() - rss_before,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--mode', choices=[MODE_UPLOAD, MODE_DOWNLOAD], required=True)
+    parser.add_argument('--bucketfs-url', required=True)
+    parser.add_argument('--container-file', type=Path, required=True)
+    parser.add_argument('--source-url', default='')
+    parser.add_argument('--connections', type=int, default=1)
+    parser.add_argument('--zero-copy', action='store_true')
+    parser.add_argument('--buffer-size', type=int, default=DEFAULT_BUFFER_SIZE)
+    args = parser.parse_args()
+    result = run_case(args.mode, args.bucketfs_url, args.container_file, args.source_url,
+                      args.connections, args.zero_copy, args.buffer_size)
+    print(json.dumps(result))
+
+
+if __name__ == '__main__':
+    main()
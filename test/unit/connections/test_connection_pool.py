@@ -0,0 +1,170 @@
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from exasol.python_extension_common.connections.connection_pool import (
+    PyexasolConnectionPool, get_connection_key)
+from exasol.python_extension_common.connections.pyexasol_connection import open_pyexasol_connection
+
+
+def make_connection(*args, schema: str = '', **kwargs):
+    conn = MagicMock()
+    conn.is_closed = False
+    conn.attr = {'autocommit': True, 'currentSchema': schema}
+
+    def close():
+        conn.is_closed = True
+
+    def open_schema(new_schema):
+        conn.attr['currentSchema'] = new_schema
+
+    conn.close.side_effect = close
+    conn.open_schema.side_effect = open_schema
+    conn.current_schema.side_effect = lambda: conn.attr['currentSchema']
+    return conn
+
+
+@pytest.fixture
+def connect_func():
+    return MagicMock(side_effect=make_connection)
+
+
+def test_connection_key():
+    key = get_connection_key({'dsn': 'my_cluster:123', 'user': 'me', 'password': 'secret',
+                              'websocket_sslopt': {'cert_reqs': 0}})
+    assert 'secret' not in str(key)
+    assert key == get_connection_key({'websocket_sslopt': {'cert_reqs': 0}, 'password': 'secret',
+                                      'user': 'me', 'dsn': 'my_cluster:123'})
+    assert key != get_connection_key({'dsn': 'my_cluster:123', 'user': 'me', 'password': 'other',
+                                      'websocket_sslopt': {'cert_reqs': 0}})
+
+
+def test_pool_reuses_connection(connect_func):
+    pool = PyexasolConnectionPool(connect_func=connect_func)
+    with pool.connect(dsn='my_cluster:123', user='me', password='secret') as conn1:
+        conn1.execute('SELECT 1')
+        wrapped = conn1.connection
+    with pool.connect(dsn='my_cluster:123', user='me', password='secret') as conn2:
+        assert conn2.connection is wrapped
+    conn3 = pool.connect(dsn='my_cluster:123', user='me', password='other')
+    assert conn3.connection is not wrapped
+    assert connect_func.call_count == 2
+    assert not wrapped.is_closed
+
+
+def test_pool_borrowed_connection_not_shared(connect_func):
+    pool = PyexasolConnectionPool(connect_func=connect_func)
+    conn1 = pool.connect(dsn='my_cluster:123')
+    conn2 = pool.connect(dsn='my_cluster:123')
+    assert conn1.connection is not conn2.connection
+    conn1.close()
+    assert conn1.is_closed
+    with pytest.raises(RuntimeError):
+        conn1.execute('SELECT 1')
+
+
+def test_pool_health_check(connect_func):
+    health_check = MagicMock(return_value=False)
+    pool = PyexasolConnectionPool(check_after=timedelta(0), health_check=health_check,
+                                  connect_func=connect_func)
+    pool.connect(dsn='my_cluster:123').close()
+    conn = pool.connect(dsn='my_cluster:123')
+    health_check.assert_called_once()
+    assert health_check.call_args.args[0].is_closed
+    assert connect_func.call_count == 2
+    assert not conn.is_closed
+
+
+def test_pool_max_size(connect_func):
+    pool = PyexasolConnectionPool(max_size=2, connect_func=connect_func)
+    conns = [pool.connect(dsn=f'my_cluster_{i}:123') for i in range(3)]
+    wrapped = [conn.connection for conn in conns]
+    for conn in conns:
+        conn.close()
+    assert pool.idle_count == 2
+    assert [conn.is_closed for conn in wrapped] == [True, False, False]
+
+
+def test_pool_max_idle(connect_func):
+    pool = PyexasolConnectionPool(max_idle=timedelta(0), connect_func=connect_func)
+    conn = pool.connect(dsn='my_cluster:123')
+    wrapped = conn.connection
+    conn.close()
+    pool.connect(dsn='my_cluster:123')
+    assert wrapped.is_closed
+    assert connect_func.call_count == 2
+
+
+def test_pool_close(connect_func):
+    pool = PyexasolConnectionPool(connect_func=connect_func)
+    idle_conn = pool.connect(dsn='my_cluster:123')
+    borrowed_conn = pool.connect(dsn='my_cluster:123')
+    idle_wrapped, borrowed_wrapped = idle_conn.connection, borrowed_conn.connection
+    idle_conn.close()
+    pool.close()
+    assert idle_wrapped.is_closed
+    borrowed_conn.close()
+    assert borrowed_wrapped.is_closed
+    assert pool.idle_count == 0
+
+
+def test_pool_resets_returned_connection(connect_func):
+    pool = PyexasolConnectionPool(connect_func=connect_func)
+    with pool.connect(dsn='my_cluster:123', schema='MY_SCHEMA') as conn:
+        conn.open_schema('OTHER_SCHEMA')
+        wrapped = conn.connection
+    wrapped.rollback.assert_called_once()
+    assert wrapped.current_schema() == 'MY_SCHEMA'
+    with pool.connect(dsn='my_cluster:123', schema='MY_SCHEMA') as conn:
+        assert conn.connection is wrapped
+
+
+def test_pool_drops_altered_connection(connect_func):
+    pool = PyexasolConnectionPool(connect_func=connect_func)
+    with pool.connect(dsn='my_cluster:123') as conn:
+        conn.attr['autocommit'] = False
+        wrapped = conn.connection
+    assert wrapped.is_closed
+    assert pool.idle_count == 0
+
+
+def test_pool_drops_connection_failing_reset(connect_func):
+    pool = PyexasolConnectionPool(connect_func=connect_func)
+    with pool.connect(dsn='my_cluster:123') as conn:
+        conn.rollback.side_effect = RuntimeError('connection lost')
+        wrapped = conn.connection
+    assert wrapped.is_closed
+    assert pool.idle_count == 0
+
+
+def test_pool_evicts_on_release(connect_func):
+    pool = PyexasolConnectionPool(max_idle=timedelta(0), connect_func=connect_func)
+    conn1 = pool.connect(dsn='my_cluster_1:123')
+    conn2 = pool.connect(dsn='my_cluster_2:123')
+    wrapped1 = conn1.connection
+    conn1.close()
+    conn2.close()
+    assert wrapped1.is_closed
+    assert pool.idle_count == 1
+
+
+def test_pool_close_idle(connect_func):
+    pool = PyexasolConnectionPool(max_idle=timedelta(0), connect_func=connect_func)
+    conn = pool.connect(dsn='my_cluster:123')
+    wrapped = conn.connection
+    conn.close()
+    pool.close_idle()
+    assert wrapped.is_closed
+    assert pool.idle_count == 0
+
+
+@patch('pyexasol.connect')
+def test_open_pyexasol_connection_pooled(mock_connect):
+    mock_connect.side_effect = make_connection
+    params = {'dsn': 'my_cluster:123', 'db_user': 'me', 'db_pass': 'secret'}
+    with PyexasolConnectionPool() as pool:
+        open_pyexasol_connection(**params, pool=pool).close()
+        open_pyexasol_connection(**params, pool=pool).close()
+        open_pyexasol_connection(**params, schema='other', pool=pool).close()
+    assert mock_connect.call_count == 2
@@ -0,0 +1,121 @@
+import json
+import stat
+from datetime import timedelta
+from unittest.mock import create_autospec, patch
+
+import pytest
+
+from exasol.python_extension_common.connections.saas_lookup_cache import SaasLookupCache
+from exasol.python_extension_common.connections.pyexasol_connection import open_pyexasol_connection
+
+SAAS_URL = 'https://saas_fake_service.com'
+ACCOUNT_ID = 'saas_fake_account_id'
+DATABASE_NAME = 'saas_fake_database'
+DATABASE_ID = 'saas_fake_database_id'
+TOKEN = 'saas_fake_pat'
+
+
+@pytest.fixture
+def mock_saas_api():
+    with patch('exasol.saas.client.api_access.get_connection_params') as mock_params, \
+            patch('exasol.saas.client.api_access.get_database_id') as mock_database_id:
+        mock_params.side_effect = lambda pat, **kwargs: {
+            'dsn': 'xyz.fake_saas.exasol.com:1234', 'user': 'fake_saas_user', 'password': pat}
+        mock_database_id.return_value = DATABASE_ID
+        yield mock_params, mock_database_id
+
+
+def test_cached_connection_params(mock_saas_api):
+    mock_params, _ = mock_saas_api
+    cache = SaasLookupCache()
+    params1 = cache.get_connection_params(SAAS_URL, ACCOUNT_ID, TOKEN, database_name=DATABASE_NAME)
+    params2 = cache.get_connection_params(SAAS_URL, ACCOUNT_ID, TOKEN, database_name=DATABASE_NAME)
+    assert params1 == params2
+    assert params2['password'] == TOKEN
+    mock_params.assert_called_once()
+
+    # A different token must not get the cached entry.
+    params3 = cache.get_connection_params(SAAS_URL, ACCOUNT_ID, 'other_pat',
+                                          database_name=DATABASE_NAME)
+    assert params3['password'] == 'other_pat'
+    assert mock_params.call_count == 2
+
+
+def test_cached_database_id(mock_saas_api):
+    _, mock_database_id = mock_saas_api
+    cache = SaasLookupCache()
+    for _ in range(2):
+        assert cache.get_database_id(SAAS_URL, ACCOUNT_ID, TOKEN, DATABASE_NAME) == DATABASE_ID
+    mock_database_id.assert_called_once()
+
+
+def test_expired_entries(mock_saas_api):
+    _, mock_database_id = mock_saas_api
+    cache = SaasLookupCache(ttl=timedelta(seconds=-1))
+    for _ in range(2):
+        cache.get_database_id(SAAS_URL, ACCOUNT_ID, TOKEN, DATABASE_NAME)
+    assert mock_database_id.call_count == 2
+
+
+def test_cache_file(mock_saas_api, tmp_path):
+    mock_params, mock_database_id = mock_saas_api
+    cache_file = tmp_path / 'saas_cache.json'
+    cache = SaasLookupCache(cache_file=cache_file)
+    cache.get_database_id(SAAS_URL, ACCOUNT_ID, TOKEN, DATABASE_NAME)
+    cache.get_connection_params(SAAS_URL, ACCOUNT_ID, TOKEN, database_id=DATABASE_ID)
+
+    assert TOKEN not in cache_file.read_text()
+    assert stat.S_IMODE(cache_file.stat().st_mode) == 0o600
+    assert len(json.loads(cache_file.read_text())) == 2
+
+    # Another process reads the entries from the file.
+    cache = SaasLookupCache(cache_file=cache_file)
+    assert cache.get_database_id(SAAS_URL, ACCOUNT_ID, TOKEN, DATABASE_NAME) == DATABASE_ID
+    params = cache.get_connection_params(SAAS_URL, ACCOUNT_ID, TOKEN, database_id=DATABASE_ID)
+    assert params['password'] == TOKEN
+    assert (mock_params.call_count, mock_database_id.call_count) == (1, 1)
+
+
+def test_invalidate(mock_saas_api, tmp_path):
+    mock_params, mock_database_id = mock_saas_api
+    cache_file = tmp_path / 'saas_cache.json'
+    cache = SaasLookupCache(cache_file=cache_file)
+    cache.get_database_id(SAAS_URL, ACCOUNT_ID, TOKEN, DATABASE_NAME)
+    cache.get_connection_params(SAAS_URL, ACCOUNT_ID, TOKEN, database_id=DATABASE_ID)
+    cache.invalidate(SAAS_URL, ACCOUNT_ID, TOKEN, database_id=DATABASE_ID,
+                     database_name=DATABASE_NAME)
+    assert json.loads(cache_file.read_text()) == {}
+
+    cache.get_database_id(SAAS_URL, ACCOUNT_ID, TOKEN, DATABASE_NAME)
+    cache.get_connection_params(SAAS_URL, ACCOUNT_ID, TOKEN, database_id=DATABASE_ID)
+    assert (mock_params.call_count, mock_database_id.call_count) == (2, 2)
+
+
+@patch('pyexasol.connect')
+def test_open_pyexasol_connection_invalidates_cache(mock_connect, mock_saas_api):
+    mock_params, _ = mock_saas_api
+    mock_connect.side_effect = ConnectionError('Connection refused')
+    cache = SaasLookupCache()
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            open_pyexasol_connection(saas_url=SAAS_URL, saas_account_id=ACCOUNT_ID,
+                                     saas_database_name=DATABASE_NAME, saas_token=TOKEN,
+                                     saas_cache=cache)
+    assert mock_params.call_count == 2
+
+    mock_connect.side_effect = None
+    for _ in range(2):
+        open_pyexasol_connection(saas_url=SAAS_URL, saas_account_id=ACCOUNT_ID,
+                                 saas_database_name=DATABASE_NAME, saas_token=TOKEN,
+                                 saas_cache=cache)
+    assert mock_params.call_count == 3
+
+
+@patch('pyexasol.connect')
+def test_open_pyexasol_connection_onprem_with_cache(mock_connect):
+    mock_connect.side_effect = ConnectionError('Connection refused')
+    cache = create_autospec(SaasLookupCache)
+    with pytest.raises(ConnectionError, match='Connection refused'):
+        open_pyexasol_connection(dsn='my_cluster:123', db_user='me', db_pass='secret',
+                                 saas_cache=cache)
+    cache.invalidate.assert_not_called()
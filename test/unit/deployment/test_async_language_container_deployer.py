@@ -0,0 +1,121 @@
+import asyncio
+from pathlib import Path
+from unittest.mock import create_autospec, MagicMock, patch
+
+import exasol.bucketfs as bfs
+from pyexasol import ExaConnection
+
+from exasol.python_extension_common.deployment.language_container_deployer import (
+    LanguageContainerDeployer, LanguageActivationLevel)
+from exasol.python_extension_common.deployment.async_language_container_deployer import (
+    AsyncLanguageContainerDeployer)
+from exasol.python_extension_common.deployment.deployment_metrics import (
+    DeploymentMetrics, PHASE_VALIDATION)
+from exasol.python_extension_common.deployment.language_container_cache import ContainerCache
+
+
+def _create_deployer(language_alias: str, bucketfs_path: bfs.path.PathLike,
+                     metrics: DeploymentMetrics | None = None) -> LanguageContainerDeployer:
+    conn = create_autospec(ExaConnection)
+    conn.execute.return_value.fetchall.return_value = [('R=builtin_r', 'R=builtin_r')]
+    deployer = LanguageContainerDeployer(pyexasol_connection=conn,
+                                         language_alias=language_alias,
+                                         bucketfs_path=bucketfs_path,
+                                         metrics=metrics)
+    deployer.activate_container = MagicMock()
+    return deployer
+
+
+@patch('exasol.python_extension_common.deployment.async_language_container_deployer.'
+       'wait_language_container_async')
+def test_async_deployer_run(mock_wait_slc, tmp_path):
+    container_file = tmp_path / 'container_xyz.tar.gz'
+    container_file.write_bytes(b'container content')
+    bucketfs_path = bfs.path.BucketPath('', bfs.path.MountedBucket(base_path=str(tmp_path)))
+    metrics = DeploymentMetrics()
+    deployer = _create_deployer('PYTHON3_TEST', bucketfs_path / 'bucket', metrics)
+
+    asyncio.run(AsyncLanguageContainerDeployer(deployer).run(container_file=container_file,
+                                                             alter_system=True))
+
+    assert (tmp_path / 'bucket' / container_file.name).read_bytes() == b'container content'
+    assert deployer.activate_container.call_count == 2
+    deployer.activate_container.assert_any_call(container_file.name,
+                                                LanguageActivationLevel.System, False)
+    mock_wait_slc.assert_called_once()
+    assert mock_wait_slc.call_args.args[1] == 'PYTHON3_TEST'
+    assert any(record.phase == PHASE_VALIDATION for record in metrics.records)
+
+
+@patch('exasol.python_extension_common.deployment.async_language_container_deployer.'
+       'wait_language_container_async')
+def test_async_deployer_run_concurrently(mock_wait_slc, tmp_path):
+    # Deployments to different databases run on one loop, while all of them are waiting
+    # for their containers to become operational.
+    waiting = []
+    all_waiting = asyncio.Event()
+
+    async def wait_slc(conn, language_alias, *args, **kwargs):
+        waiting.append(language_alias)
+        if len(waiting) == 3:
+            all_waiting.set()
+        await asyncio.wait_for(all_waiting.wait(), timeout=5)
+
+    mock_wait_slc.side_effect = wait_slc
+    deployers = [
+        _create_deployer(f'PYTHON3_TEST{i}', create_autospec(bfs.path.PathLike))
+        for i in range(3)
+    ]
+
+    async def run_all():
+        await asyncio.gather(*(
+            AsyncLanguageContainerDeployer(deployer).run(bucket_file_path='container.tar.gz',
+                                                         alter_system=False,
+                                                         wait_for_completion=True)
+            for deployer in deployers
+        ))
+        await asyncio.gather(*(
+            AsyncLanguageContainerDeployer(deployer).activate_and_wait('container.tar.gz',
+                                                                       alter_system=False)
+            for deployer in deployers
+        ))
+
+    asyncio.run(run_all())
+    assert sorted(waiting) == ['PYTHON3_TEST0', 'PYTHON3_TEST1', 'PYTHON3_TEST2']
+
+
+@patch('exasol.python_extension_common.deployment.async_language_container_deployer.'
+       'wait_language_container_async')
+def test_async_deployer_download_and_run_cached(mock_wait_slc, tmp_path):
+    container_file = tmp_path / 'container_xyz.tar.gz'
+    container_file.write_bytes(b'container content')
+    bucketfs_path = bfs.path.BucketPath('', bfs.path.MountedBucket(base_path=str(tmp_path)))
+    deployer = _create_deployer('PYTHON3_TEST', bucketfs_path / 'bucket')
+    deployer.progress_callback = MagicMock()
+    cache = create_autospec(ContainerCache)
+    cache.get.return_value = container_file
+
+    asyncio.run(AsyncLanguageContainerDeployer(deployer).download_and_run(
+        'http://my_server/my_container', 'container.tar.gz', alter_system=False, cache=cache))
+
+    # The download from the cache reports its progress, same as the synchronous one.
+    cache.get.assert_called_once_with('http://my_server/my_container', connections=1,
+                                      checksum=None, progress=deployer.progress_callback)
+    assert (tmp_path / 'bucket' / 'container.tar.gz').read_bytes() == b'container content'
+    mock_wait_slc.assert_called_once()
+
+
+@patch('exasol.bucketfs.path.build_path')
+@patch('pyexasol.connect')
+def test_async_deployer_create(mock_connect, mock_build_path):
+    async def create():
+        return await AsyncLanguageContainerDeployer.create(
+            language_alias='PYTHON3_TEST', dsn='localhost:8888', db_user='user',
+            db_password='password', bucketfs_host='localhost', bucketfs_port=2580,
+            bucketfs_name='bfsdefault', bucket='default', bucketfs_user='w',
+            bucketfs_password='write', use_ssl_cert_validation=False)
+
+    deployer = asyncio.run(create())
+    assert isinstance(deployer.deployer, LanguageContainerDeployer)
+    assert deployer.deployer.language_alias == 'PYTHON3_TEST'
+    mock_connect.assert_called_once()
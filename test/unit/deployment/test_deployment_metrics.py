@@ -0,0 +1,92 @@
+import json
+from unittest.mock import create_autospec
+
+import pytest
+import exasol.bucketfs as bfs
+from pyexasol import ExaConnection
+
+from exasol.python_extension_common.deployment.deployment_metrics import (
+    DeploymentMetrics, PhaseRecord)
+from exasol.python_extension_common.deployment.language_container_deployer import (
+    LanguageContainerDeployer, LanguageActivationLevel)
+
+
+def test_phase_recorded():
+    received = []
+    metrics = DeploymentMetrics(callbacks=[received.append])
+    with metrics.phase('upload', language_alias='PYTHON3_TEST') as record:
+        record.size = 1000
+
+    assert received == metrics.records
+    record = metrics.records[0]
+    assert (record.phase, record.size, record.success) == ('upload', 1000, True)
+    assert record.labels == {'language_alias': 'PYTHON3_TEST'}
+    assert record.seconds > 0
+    assert record.throughput == pytest.approx(1000 / record.seconds)
+
+
+def test_failed_phase_recorded():
+    metrics = DeploymentMetrics()
+    with pytest.raises(RuntimeError):
+        with metrics.phase('alter', level='SYSTEM'):
+            raise RuntimeError('Insufficient privileges')
+    assert not metrics.records[0].success
+
+
+def test_failing_callback_ignored():
+    def callback(record):
+        raise ValueError(record.phase)
+
+    metrics = DeploymentMetrics(callbacks=[callback])
+    with metrics.phase('hash'):
+        pass
+    assert len(metrics.records) == 1
+
+
+def test_to_json():
+    metrics = DeploymentMetrics()
+    metrics.add(PhaseRecord('upload', started=1.0, seconds=2.0, size=100))
+    phases = json.loads(metrics.to_json())['phases']
+    assert phases == [{'phase': 'upload', 'started': 1.0, 'seconds': 2.0, 'size': 100,
+                       'success': True, 'labels': {}, 'throughput': 50.0}]
+
+
+def test_to_prometheus():
+    metrics = DeploymentMetrics()
+    for success in [False, False, True]:
+        metrics.add(PhaseRecord('validation_attempt', seconds=0.5, success=success,
+                                labels={'language_alias': 'PY"3'}))
+    metrics.add(PhaseRecord('upload', seconds=2.0, size=100))
+    text = metrics.to_prometheus(prefix='test')
+
+    assert '# TYPE test_phase_seconds_total counter' in text
+    assert 'test_phase_seconds_total{phase="validation_attempt",language_alias="PY\\"3"} 1.5' in text
+    assert 'test_phase_executions_total{phase="validation_attempt",language_alias="PY\\"3"} 3' in text
+    assert 'test_phase_failures_total{phase="validation_attempt",language_alias="PY\\"3"} 2' in text
+    assert 'test_phase_bytes_total{phase="upload"} 100' in text
+
+
+@pytest.mark.parametrize('metrics_format', ['json', 'prometheus'])
+def test_write(tmp_path, metrics_format):
+    metrics = DeploymentMetrics()
+    metrics.add(PhaseRecord('upload', seconds=2.0, size=100))
+    metrics_file = tmp_path / 'metrics.txt'
+    metrics.write(metrics_file, metrics_format)
+    assert 'upload' in metrics_file.read_text()
+    assert list(tmp_path.iterdir()) == [metrics_file]
+
+
+def test_deployer_phases(tmp_path):
+    bucketfs_path = bfs.path.build_path(backend=bfs.path.StorageBackend.mounted,
+                                        base_path=str(tmp_path))
+    container_file = tmp_path / 'container.tar.gz'
+    container_file.write_bytes(b'container content')
+    conn = create_autospec(ExaConnection)
+    conn.execute.return_value.fetchall.return_value = [('R=builtin_r', 'R=builtin_r')]
+    deployer = LanguageContainerDeployer(conn, 'PYTHON3_TEST', bucketfs_path.joinpath('bucket'))
+    deployer.upload_container(container_file)
+    deployer.upload_container(container_file, skip_if_unchanged=True)
+    deployer.activate_container('container.tar.gz', LanguageActivationLevel.System)
+
+    phases = [(record.phase, record.size, record.labels) for record in deployer.metrics.records]
+    assert phases == [('upload', 17, {}), ('hash', 17, {}), ('alter', None, {'level': 'SYSTEM'})]
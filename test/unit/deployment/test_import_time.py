@@ -0,0 +1,42 @@
+import subprocess
+import sys
+
+import pytest
+
+CLI_MODULE = 'exasol.python_extension_common.deployment.language_container_deployer_cli'
+
+# Modules that must not be loaded just by importing the cli.
+DEFERRED_MODULES = ['pyexasol', 'requests', 'exasol.bucketfs', 'exasol.saas.client.api_access']
+
+
+def _run_python(code: str) -> str:
+    return subprocess.run([sys.executable, '-c', code], check=True, capture_output=True,
+                          text=True).stdout.strip()
+
+
+def _get_import_time(modules: list[str], repeat: int = 3) -> float:
+    """ Returns the shortest time it took to import the modules in a fresh interpreter. """
+    code = (f'import time; start = time.perf_counter(); '
+            f'import {", ".join(modules)}; print(time.perf_counter() - start)')
+    return min(float(_run_python(code)) for _ in range(repeat))
+
+
+def test_cli_import_defers_backends():
+    code = (f'import sys, {CLI_MODULE}; '
+            f'print(",".join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))')
+    assert _run_python(code) == ''
+
+
+@pytest.mark.parametrize('module', DEFERRED_MODULES)
+def test_deferred_module_importable(module):
+    # The deferred imports must still resolve when the backends are actually needed.
+    _run_python(f'import {module}')
+
+
+def test_cli_import_time():
+    # A regression re-introducing a heavy import makes the cli at least as slow to import
+    # as the deferred backends. Comparing the two keeps the check independent of the machine.
+    cli_time = _get_import_time([CLI_MODULE])
+    backends_time = _get_import_time(DEFERRED_MODULES)
+    assert cli_time < backends_time, \
+        f'Importing the cli took {cli_time:.3f}s, the backends {backends_time:.3f}s.'
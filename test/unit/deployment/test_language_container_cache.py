@@ -0,0 +1,144 @@
+from __future__ import annotations
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Generator
+import hashlib
+import threading
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from exasol.python_extension_common.deployment.language_container_cache import ContainerCache
+from exasol.python_extension_common.deployment.language_container_digest import get_cached_digest
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.files: dict[str, bytes] = {}
+        self.downloads: list[str] = []
+
+    def get_etag(self, path: str) -> str:
+        return '"' + hashlib.sha256(self.files[path]).hexdigest()[:16] + '"'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: _Server
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        if self.path not in self.server.files:
+            self.send_error(404)
+            return
+        etag = self.server.get_etag(self.path)
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        content = self.server.files[self.path]
+        self.server.downloads.append(self.path)
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(content)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(content)
+
+
+@pytest.fixture
+def http_server() -> Generator[_Server, None, None]:
+    server = _Server(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _get_url(server: _Server, path: str) -> str:
+    return f'http://127.0.0.1:{server.server_address[1]}{path}'
+
+
+def test_container_cache_hit(http_server, tmp_path):
+    http_server.files['/slc.tar.gz'] = b'container content'
+    cache = ContainerCache(tmp_path / 'cache')
+    url = _get_url(http_server, '/slc.tar.gz')
+
+    path1 = cache.get(url)
+    path2 = ContainerCache(tmp_path / 'cache').get(url)
+
+    assert path1 == path2
+    assert path1.read_bytes() == b'container content'
+    assert http_server.downloads == ['/slc.tar.gz']
+    assert get_cached_digest(path1) == hashlib.sha256(b'container content').hexdigest()
+
+
+def test_container_cache_changed(http_server, tmp_path):
+    http_server.files['/slc.tar.gz'] = b'container content'
+    cache = ContainerCache(tmp_path / 'cache')
+    url = _get_url(http_server, '/slc.tar.gz')
+    cache.get(url)
+
+    http_server.files['/slc.tar.gz'] = b'new container content'
+    path = cache.get(url)
+
+    assert path.read_bytes() == b'new container content'
+    assert http_server.downloads == ['/slc.tar.gz', '/slc.tar.gz']
+    assert get_cached_digest(path) == hashlib.sha256(b'new container content').hexdigest()
+
+
+def test_container_cache_checksum(http_server, tmp_path):
+    http_server.files['/slc.tar.gz'] = b'container content'
+    cache = ContainerCache(tmp_path / 'cache')
+    url = _get_url(http_server, '/slc.tar.gz')
+
+    with pytest.raises(RuntimeError, match='does not match'):
+        cache.get(url, checksum='0' * 64)
+    assert not list((tmp_path / 'cache').iterdir())
+
+    checksum = hashlib.sha256(b'container content').hexdigest()
+    assert cache.get(url, checksum=checksum).read_bytes() == b'container content'
+
+
+def test_container_cache_offline(http_server, tmp_path):
+    http_server.files['/slc.tar.gz'] = b'container content'
+    cache = ContainerCache(tmp_path / 'cache')
+    url = _get_url(http_server, '/slc.tar.gz')
+    cache.get(url)
+
+    with patch('requests.get', side_effect=requests.ConnectionError):
+        assert cache.get(url).read_bytes() == b'container content'
+
+
+def test_container_cache_download_interrupted(http_server, tmp_path):
+    http_server.files['/slc.tar.gz'] = b'container content'
+    cache = ContainerCache(tmp_path / 'cache')
+    url = _get_url(http_server, '/slc.tar.gz')
+    path = cache.get(url)
+
+    http_server.files['/slc.tar.gz'] = b'new container content'
+    with patch('requests.Response.iter_content', side_effect=requests.ConnectionError), \
+            pytest.raises(requests.ConnectionError):
+        cache.get(url)
+    assert path.read_bytes() == b'container content'
+
+
+def test_container_cache_lru_eviction(http_server, tmp_path):
+    for name in ['a', 'b', 'c']:
+        http_server.files[f'/{name}.tar.gz'] = name.encode() * 100
+    cache = ContainerCache(tmp_path / 'cache', max_size=250)
+
+    path_a = cache.get(_get_url(http_server, '/a.tar.gz'))
+    path_b = cache.get(_get_url(http_server, '/b.tar.gz'))
+    # Using the "a" makes the "b" the least recently used entry.
+    cache.get(_get_url(http_server, '/a.tar.gz'))
+    path_c = cache.get(_get_url(http_server, '/c.tar.gz'))
+
+    assert path_a.is_file()
+    assert not path_b.exists()
+    assert path_c.is_file()
+    assert sorted(path.name for path in (tmp_path / 'cache').iterdir()
+                  if not path.name.startswith((path_a.name[:32], path_c.name[:32]))) == []
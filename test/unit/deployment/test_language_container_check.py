@@ -0,0 +1,86 @@
+from __future__ import annotations
+import gzip
+import io
+import tarfile
+
+import pytest
+
+from exasol.python_extension_common.deployment.language_container_check import (
+    ContainerChecker, CheckingReader, InvalidContainerError, check_container)
+
+
+def _make_container(names: list[str], tar_format: int = tarfile.GNU_FORMAT) -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode='w:gz', format=tar_format) as tar:
+        for name in names:
+            content = name.encode() * 100
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+    return buffer.getvalue()
+
+
+def _check(data: bytes, chunk_size: int = 1000) -> None:
+    checker = ContainerChecker()
+    for start in range(0, len(data), chunk_size):
+        checker.update(data[start:start + chunk_size])
+    checker.verify()
+
+
+LONG_NAME = 'usr/lib/' + 'x' * 150 + '/module.py'
+
+
+@pytest.mark.parametrize('tar_format', [tarfile.GNU_FORMAT, tarfile.PAX_FORMAT])
+@pytest.mark.parametrize('chunk_size', [7, 512, 100000])
+def test_check_container_valid(tar_format, chunk_size):
+    _check(_make_container([LONG_NAME, './exaudf/exaudfclient_py3', 'exaudf/other'], tar_format),
+           chunk_size)
+
+
+def test_check_container_long_required_path():
+    checker = ContainerChecker(required_paths=[LONG_NAME])
+    checker.update(_make_container([LONG_NAME], tarfile.PAX_FORMAT))
+    checker.verify()
+
+
+def test_check_container_multiple_gzip_members():
+    tar_data = gzip.decompress(_make_container(['exaudf/exaudfclient_py3']))
+    _check(gzip.compress(tar_data[:700]) + gzip.compress(tar_data[700:]))
+
+
+def test_check_container_missing_client():
+    with pytest.raises(InvalidContainerError, match='exaudf/exaudfclient_py3'):
+        _check(_make_container(['exaudf/exaudfclient_py2', 'bin/python3']))
+
+
+def test_check_container_truncated():
+    with pytest.raises(InvalidContainerError, match='truncated'):
+        _check(_make_container(['exaudf/exaudfclient_py3'])[:-30])
+
+
+def test_check_container_corrupt():
+    data = bytearray(_make_container(['exaudf/exaudfclient_py3', 'a', 'b']))
+    data[len(data) // 2] ^= 0xff
+    with pytest.raises(InvalidContainerError, match='not a valid tar.gz'):
+        _check(bytes(data))
+
+
+def test_check_container_not_gzip():
+    with pytest.raises(InvalidContainerError, match='not a valid tar.gz'):
+        _check(b'container content')
+
+
+def test_checking_reader():
+    data = _make_container(['exaudf/exaudfclient_py3'])
+    checker = ContainerChecker()
+    reader = CheckingReader(io.BytesIO(data), checker)
+    assert reader.read() == data
+    assert reader.tell() == len(data)
+    checker.verify()
+    assert checker.entries == 1
+
+
+def test_check_container_file(tmp_path):
+    container_file = tmp_path / 'container.tar.gz'
+    container_file.write_bytes(_make_container(['exaudf/exaudfclient_py3']))
+    check_container(container_file)
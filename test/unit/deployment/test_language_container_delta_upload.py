@@ -0,0 +1,192 @@
+import gzip
+import io
+import random
+import tarfile
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from exasol.python_extension_common.deployment.language_container_digest import (
+    get_container_digest, read_manifest, write_manifest)
+from exasol.python_extension_common.deployment.language_container_delta_upload import (
+    DeltaRecipe, OP_DELTA, split_chunks, compute_delta, apply_delta, upload_container_delta)
+
+from test.utils.bucketfs_stand_in import bucketfs_stand_in
+
+MAX_CHUNK_SIZE = 256 * 1024
+
+
+def make_container(container_file: Path, files: dict[str, bytes]) -> Path:
+    """ Writes a tar.gz container with the given files. """
+    with tarfile.open(container_file, 'w:gz') as tar:
+        for name, content in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+    return container_file
+
+
+@pytest.fixture
+def base_files() -> dict[str, bytes]:
+    rnd = random.Random(0)
+    files = {f'usr/lib/python3/site-packages/package_{i}/__init__.py':
+             rnd.randbytes(rnd.randint(10000, 100000)) for i in range(20)}
+    files['usr/lib/libbig.so'] = rnd.randbytes(2 * 1024 * 1024)
+    return files
+
+
+def _edit(files: dict[str, bytes]) -> dict[str, bytes]:
+    # Seven bytes of a large file are changed.
+    content = files['usr/lib/libbig.so']
+    return {**files, 'usr/lib/libbig.so': content[:1000000] + b'changed' + content[1000007:]}
+
+
+def _insert(files: dict[str, bytes]) -> dict[str, bytes]:
+    # A new package goes first, so all other files move in the archive.
+    return {'usr/lib/python3/site-packages/new_package/' + 'x' * 120 + '.py': b'new package',
+            **files}
+
+
+def _remove(files: dict[str, bytes]) -> dict[str, bytes]:
+    return {name: content for name, content in files.items()
+            if not name.endswith('_3/__init__.py')}
+
+
+@pytest.fixture(params=[_edit, _insert, _remove])
+def new_files(request, base_files) -> dict[str, bytes]:
+    return request.param(base_files)
+
+
+@pytest.fixture
+def base_file(tmp_path, base_files) -> Path:
+    return make_container(tmp_path / 'slc_1.tar.gz', base_files)
+
+
+@pytest.fixture
+def container_file(tmp_path, new_files) -> Path:
+    return make_container(tmp_path / 'slc_2.tar.gz', new_files)
+
+
+def test_split_chunks(base_file):
+    archive = gzip.decompress(base_file.read_bytes())
+    chunks = list(split_chunks(io.BytesIO(archive), MAX_CHUNK_SIZE))
+    assert sum(length for _, length in chunks) == len(archive)
+    assert all(length <= MAX_CHUNK_SIZE for _, length in chunks)
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        assert {member.offset for member in tar} <= {offset for offset, _ in chunks}
+
+
+def test_compute_and_apply_delta(base_file, container_file):
+    recipe = compute_delta(container_file, base_file, MAX_CHUNK_SIZE, level=9)
+    archive = gzip.decompress(container_file.read_bytes())
+    assert recipe.size == len(archive)
+    # Only the chunk with the change, and the end of the archive, have to be uploaded.
+    assert recipe.delta_size < MAX_CHUNK_SIZE + 20000
+    assert recipe.delta_size < container_file.stat().st_size // 8
+    recipe = DeltaRecipe.from_json(recipe.to_json())
+    assert recipe.level == 9
+
+    blocks = b''.join(archive[offset:offset + length]
+                      for offset, length in _get_delta_ranges(recipe))
+    target = io.BytesIO()
+    with open(base_file, 'rb') as base:
+        apply_delta(recipe, base, io.BytesIO(blocks), target)
+    assert gzip.decompress(target.getvalue()) == archive
+
+    with pytest.raises(ValueError):
+        apply_delta(recipe, io.BytesIO(gzip.compress(bytes(len(archive)))), io.BytesIO(blocks),
+                    io.BytesIO())
+
+
+def _get_delta_ranges(recipe: DeltaRecipe) -> list[tuple[int, int]]:
+    ranges, offset = [], 0
+    for kind, _, length in recipe.ops:
+        if kind == OP_DELTA:
+            ranges.append((offset, length))
+        offset += length
+    return ranges
+
+
+def test_upload_container_delta(tmp_path, base_file, container_file):
+    bucket_root = tmp_path / 'bucket'
+    bucket_root.mkdir()
+    (bucket_root / 'slc_1.tar.gz').write_bytes(base_file.read_bytes())
+    with bucketfs_stand_in(bucket_root) as stand_in:
+        base_file_path = stand_in.build_path() / 'slc_1.tar.gz'
+        write_manifest(base_file_path, get_container_digest(base_file))
+        file_path = stand_in.build_path() / 'slc_2.tar.gz'
+        bytes_before = stand_in.bytes_received
+        recipe = upload_container_delta(container_file, file_path, base_file, base_file_path,
+                                        stand_in.apply_delta, MAX_CHUNK_SIZE)
+        # The container in the bucket stands for the local one.
+        assert read_manifest(file_path) == get_container_digest(container_file)
+
+    assert gzip.decompress((bucket_root / 'slc_2.tar.gz').read_bytes()) == \
+        gzip.decompress(container_file.read_bytes())
+    assert not (bucket_root / 'slc_2.tar.gz.delta').exists()
+    assert stand_in.bytes_received - bytes_before < recipe.delta_size + 10000
+
+
+@pytest.mark.parametrize('new_files', [_edit], indirect=True)
+def test_upload_container_delta_base_mismatch(tmp_path, base_file, container_file):
+    # The base in the bucket is not the local one. Nothing is uploaded.
+    bucket_root = tmp_path / 'bucket'
+    bucket_root.mkdir()
+    with bucketfs_stand_in(bucket_root) as stand_in:
+        base_file_path = stand_in.build_path() / 'slc_1.tar.gz'
+        base_file_path.write(b'another container')
+        write_manifest(base_file_path, get_container_digest(container_file))
+        assert upload_container_delta(container_file, stand_in.build_path() / 'slc_2.tar.gz',
+                                      base_file, base_file_path, stand_in.apply_delta) is None
+    assert not (bucket_root / 'slc_2.tar.gz').exists()
+
+
+def test_upload_container_delta_no_savings(tmp_path, base_file):
+    # A container with nothing in common with the previous version is not uploaded as a delta.
+    container_file = make_container(tmp_path / 'slc_2.tar.gz',
+                                    {'other': random.Random(1).randbytes(100000)})
+    bucket_root = tmp_path / 'bucket'
+    bucket_root.mkdir()
+    (bucket_root / 'slc_1.tar.gz').write_bytes(base_file.read_bytes())
+    assembler = MagicMock()
+    with bucketfs_stand_in(bucket_root) as stand_in:
+        base_file_path = stand_in.build_path() / 'slc_1.tar.gz'
+        write_manifest(base_file_path, get_container_digest(base_file))
+        assert upload_container_delta(container_file, stand_in.build_path() / 'slc_2.tar.gz',
+                                      base_file, base_file_path, assembler) is None
+    assembler.assert_not_called()
+
+
+@pytest.mark.parametrize('new_files', [_edit], indirect=True)
+def test_upload_container_delta_same_path(tmp_path, base_file, container_file):
+    # The previous version is neither truncated nor replaced.
+    bucket_root = tmp_path / 'bucket'
+    bucket_root.mkdir()
+    (bucket_root / 'slc.tar.gz').write_bytes(base_file.read_bytes())
+    with bucketfs_stand_in(bucket_root) as stand_in:
+        file_path = stand_in.build_path() / 'slc.tar.gz'
+        write_manifest(file_path, get_container_digest(base_file))
+        with pytest.raises(ValueError):
+            upload_container_delta(container_file, file_path, base_file,
+                                   stand_in.build_path() / 'sub' / '..' / 'slc.tar.gz',
+                                   stand_in.apply_delta)
+    assert (bucket_root / 'slc.tar.gz').read_bytes() == base_file.read_bytes()
+
+
+@pytest.mark.parametrize('new_files', [_edit], indirect=True)
+def test_upload_container_delta_assembler_failure(tmp_path, base_file, container_file):
+    # The delta directory is removed if the rebuild fails.
+    bucket_root = tmp_path / 'bucket'
+    bucket_root.mkdir()
+    (bucket_root / 'slc_1.tar.gz').write_bytes(base_file.read_bytes())
+    assembler = MagicMock(side_effect=RuntimeError('The assembly failed'))
+    with bucketfs_stand_in(bucket_root) as stand_in:
+        base_file_path = stand_in.build_path() / 'slc_1.tar.gz'
+        write_manifest(base_file_path, get_container_digest(base_file))
+        with pytest.raises(RuntimeError):
+            upload_container_delta(container_file, stand_in.build_path() / 'slc_2.tar.gz',
+                                   base_file, base_file_path, assembler, MAX_CHUNK_SIZE)
+    assembler.assert_called_once()
+    assert sorted(path.name for path in bucket_root.iterdir()) == [
+        'slc_1.tar.gz', 'slc_1.tar.gz.sha256']
@@ -1,4 +1,8 @@
 from pathlib import Path, PurePosixPath
+from datetime import timedelta
+import hashlib
+import io
+import tarfile
 from unittest.mock import create_autospec, MagicMock, patch, call
 
 import pytest
@@ -6,7 +10,19 @@ import exasol.bucketfs as bfs
 from pyexasol import ExaConnection
 
 from exasol.python_extension_common.deployment.language_container_deployer import (
-    LanguageContainerDeployer, LanguageActivationLevel)
+    LanguageContainerDeployer, LanguageActivationLevel, ContainerSpec)
+from exasol.python_extension_common.deployment.script_languages import LanguageDefinition
+from exasol.python_extension_common.deployment.language_container_validator import (
+    WarmUpReport)
+from exasol.python_extension_common.deployment.language_container_cache import ContainerCache
+from exasol.python_extension_common.deployment.language_container_check import (
+    InvalidContainerError)
+from exasol.python_extension_common.deployment.language_container_retention import (
+    RetentionPolicy)
+from exasol.python_extension_common.connections.connection_pool import PyexasolConnectionPool
+from exasol.python_extension_common.connections.saas_lookup_cache import SaasLookupCache
+
+from test.utils.bucketfs_stand_in import bucketfs_stand_in
 
 
 @pytest.fixture(scope='module')
@@ -31,7 +47,10 @@ def container_bfs_path(container_file_name) -> str:
 
 @pytest.fixture(scope='module')
 def mock_pyexasol_conn() -> ExaConnection:
-    return create_autospec(ExaConnection)
+    conn = create_autospec(ExaConnection)
+    # Current SYSTEM and SESSION language settings.
+    conn.execute.return_value.fetchall.return_value = [('R=builtin_r', 'R=builtin_r')]
+    return conn
 
 
 @pytest.fixture
@@ -52,7 +71,8 @@ def test_slc_deployer_deploy(container_deployer, container_file_name, container_
                            allow_override=True,
                            wait_for_completion=False)
     container_deployer.upload_container.assert_called_once_with(container_file_path,
-                                                                container_file_name)
+                                                                container_file_name,
+                                                                skip_if_unchanged=False)
     expected_calls = [
         call(container_file_name, LanguageActivationLevel.Session, True),
         call(container_file_name, LanguageActivationLevel.System, True)
@@ -65,7 +85,8 @@ def test_slc_deployer_upload(container_deployer, container_file_name, container_
                            alter_system=False,
                            wait_for_completion=False)
     container_deployer.upload_container.assert_called_once_with(container_file_path,
-                                                                container_file_name)
+                                                                container_file_name,
+                                                                skip_if_unchanged=False)
     container_deployer.activate_container.assert_called_once_with(container_file_name,
                                                                   LanguageActivationLevel.Session,
                                                                   False)
@@ -84,12 +105,297 @@ def test_slc_deployer_activate(container_deployer, container_file_name):
     container_deployer.activate_container.assert_has_calls(expected_calls, any_order=True)
 
 
+@patch('exasol.python_extension_common.deployment.language_container_deployer.wait_language_container')
+@patch('exasol.python_extension_common.deployment.language_container_deployer.temp_schema')
+def test_slc_deployer_download_and_run(mock_temp_schema, mock_wait_slc,
+                                       container_deployer, container_file_name):
+    container_deployer.upload_container_from_url = MagicMock()
+    container_deployer.download_and_run('http://my_server/my_container', container_file_name,
+                                        alter_system=False, wait_for_completion=True)
+    container_deployer.upload_container_from_url.assert_called_once_with(
+        'http://my_server/my_container', container_file_name, connections=1, checksum=None,
+        cache=None)
+    container_deployer.upload_container.assert_not_called()
+    container_deployer.activate_container.assert_called_once_with(container_file_name,
+                                                                  LanguageActivationLevel.Session,
+                                                                  False)
+    mock_wait_slc.assert_called_once()
+
+
+@patch('exasol.python_extension_common.deployment.language_container_deployer.warm_up_language_container')
+@patch('exasol.python_extension_common.deployment.language_container_deployer.wait_language_container')
+@patch('exasol.python_extension_common.deployment.language_container_deployer.temp_schema')
+def test_slc_deployer_activate_and_warm_up(mock_temp_schema, mock_wait_slc, mock_warm_up,
+                                           mock_pyexasol_conn, language_alias,
+                                           container_file_name):
+    mock_temp_schema.return_value.__enter__.return_value = 'TEMP_SCHEMA'
+    report = WarmUpReport(2, {0: timedelta(seconds=1), 1: timedelta(seconds=3)}, {0: 4, 1: 4})
+    mock_warm_up.return_value = report
+    deployer = LanguageContainerDeployer(pyexasol_connection=mock_pyexasol_conn,
+                                         language_alias=language_alias,
+                                         bucketfs_path=create_autospec(bfs.path.PathLike),
+                                         warm_up_vms_per_node=4)
+    deployer.activate = MagicMock()
+    deployer.activate_and_wait(container_file_name, alter_system=False)
+
+    mock_warm_up.assert_called_once_with(mock_pyexasol_conn, language_alias, 'TEMP_SCHEMA', 4)
+    assert deployer.warm_up_reports == {language_alias: report}
+    assert [record.phase for record in deployer.metrics.records] == ['validation', 'warm_up']
+    assert str(report) == '2/2 nodes warmed up, the slowest node 1 in 3.0 s'
+
+@patch('exasol.python_extension_common.deployment.language_container_deployer.wait_language_container')
+@patch('exasol.python_extension_common.deployment.language_container_deployer.temp_schema')
+def test_slc_deployer_download_and_run_cached(mock_temp_schema, mock_wait_slc,
+                                              container_deployer, container_file_name):
+    container_deployer.progress_callback = MagicMock()
+    cache = create_autospec(ContainerCache)
+    cache.get.return_value = Path('/cache/container.tar.gz')
+    with patch('requests.get') as mock_get:
+        container_deployer.download_and_run('http://my_server/my_container', container_file_name,
+                                            alter_system=False, cache=cache)
+    cache.get.assert_called_once_with('http://my_server/my_container', connections=1,
+                                      checksum=None, progress=container_deployer.progress_callback)
+    container_deployer.upload_container.assert_called_once_with(
+        Path('/cache/container.tar.gz'), container_file_name)
+    mock_get.assert_not_called()
+
+
+@patch('requests.get')
+def test_slc_deployer_upload_container_from_url(mock_get, mock_pyexasol_conn, language_alias,
+                                                container_file_name):
+    chunks = [b'abc', b'', b'defgh', b'ij']
+    response = mock_get.return_value.__enter__.return_value
+    response.headers = {'Content-Length': '10'}
+    response.iter_content.return_value = iter(chunks)
+    uploaded_size = []
+    uploaded = []
+    bucketfs_path = create_autospec(bfs.path.PathLike)
+    file_path = bucketfs_path.__truediv__.return_value
+    file_path.name = container_file_name
+
+    def write(stream):
+        uploaded_size.append(len(stream))
+        uploaded.append(stream.read())
+
+    file_path.write.side_effect = write
+
+    deployer = LanguageContainerDeployer(pyexasol_connection=mock_pyexasol_conn,
+                                         language_alias=language_alias,
+                                         bucketfs_path=bucketfs_path)
+    deployer.upload_container_from_url('http://my_server/my_container', container_file_name,
+                                       chunk_size=5)
+
+    bucketfs_path.__truediv__.assert_called_once_with(container_file_name)
+    file_path.parent.__truediv__.assert_called_once_with(container_file_name + '.sha256')
+    response.raise_for_status.assert_called_once()
+    response.iter_content.assert_called_once_with(chunk_size=5)
+    assert uploaded == [b'abcdefghij']
+    assert uploaded_size == [10]
+
+
+@pytest.mark.parametrize('headers', [{}, {'Content-Length': '7', 'Content-Encoding': 'gzip'}])
+def test_slc_deployer_upload_container_from_url_unknown_size(mock_pyexasol_conn, language_alias,
+                                                             tmp_path, headers):
+    # Without the size of the content, the container is uploaded in chunks.
+    bucket_root = tmp_path / 'bucket'
+    bucket_root.mkdir()
+    with bucketfs_stand_in(bucket_root) as stand_in:
+        deployer = LanguageContainerDeployer(pyexasol_connection=mock_pyexasol_conn,
+                                             language_alias=language_alias,
+                                             bucketfs_path=stand_in.build_path())
+        with patch('requests.get') as mock_get:
+            response = mock_get.return_value.__enter__.return_value
+            response.headers = headers
+            response.iter_content.return_value = iter([b'abc', b'defgh', b'ij'])
+            deployer.upload_container_from_url('http://my_server/my_container', 'slc.tar.gz')
+        assert deployer.get_uploaded_digest('slc.tar.gz') == \
+            hashlib.sha256(b'abcdefghij').hexdigest()
+
+    assert (bucket_root / 'slc.tar.gz').read_bytes() == b'abcdefghij'
+
+
+@patch('exasol.python_extension_common.deployment.language_container_uploader.download_container')
+def test_slc_deployer_upload_container_from_url_parallel(mock_download, mock_pyexasol_conn,
+                                                         language_alias, container_file_name,
+                                                         tmp_path):
+    def download(url, target, connections, checksum, progress):
+        target.write_bytes(b'container content')
+        return 'digest'
+
+    mock_download.side_effect = download
+    bucket_root = tmp_path / 'bucket'
+    bucket_root.mkdir()
+    bucketfs_path = bfs.path.build_path(backend=bfs.path.StorageBackend.mounted,
+                                        base_path=str(bucket_root))
+    deployer = LanguageContainerDeployer(pyexasol_connection=mock_pyexasol_conn,
+                                         language_alias=language_alias,
+                                         bucketfs_path=bucketfs_path)
+    deployer.upload_container_from_url('http://my_server/my_container', container_file_name,
+                                       connections=4, checksum='digest')
+
+    assert mock_download.call_args.kwargs == {'connections': 4, 'checksum': 'digest',
+                                              'progress': None}
+    assert (bucket_root / container_file_name).read_bytes() == b'container content'
+    assert deployer.get_uploaded_digest(container_file_name) == 'digest'
+
+
+def test_slc_deployer_upload_skip_if_unchanged(mock_pyexasol_conn, language_alias,
+                                               container_file_name, tmp_path):
+    bucket_root = tmp_path / 'bucket'
+    bucket_root.mkdir()
+    bucketfs_path = bfs.path.build_path(backend=bfs.path.StorageBackend.mounted,
+                                        base_path=str(bucket_root))
+    container_file = tmp_path / container_file_name
+    container_file.write_bytes(b'container content')
+    deployer = LanguageContainerDeployer(pyexasol_connection=mock_pyexasol_conn,
+                                         language_alias=language_alias,
+                                         bucketfs_path=bucketfs_path)
+
+    assert deployer.upload_container(container_file, skip_if_unchanged=True)
+    assert (bucket_root / container_file_name).read_bytes() == b'container content'
+    assert not deployer.upload_container(container_file, skip_if_unchanged=True)
+
+    container_file.write_bytes(b'new container content')
+    assert deployer.upload_container(container_file, skip_if_unchanged=True)
+    assert (bucket_root / container_file_name).read_bytes() == b'new container content'
+
+    # An upload without the check must not leave a stale manifest behind.
+    container_file.write_bytes(b'container content')
+    assert deployer.upload_container(container_file)
+    assert not deployer.upload_container(container_file, skip_if_unchanged=True)
+
+
+def test_slc_deployer_upload_progress(mock_pyexasol_conn, language_alias, container_file_name,
+                                      tmp_path):
+    bucket_root = tmp_path / 'bucket'
+    bucket_root.mkdir()
+    bucketfs_path = bfs.path.build_path(backend=bfs.path.StorageBackend.mounted,
+                                        base_path=str(bucket_root))
+    container_file = tmp_path / container_file_name
+    container_file.write_bytes(b'container content')
+    reports = []
+    deployer = LanguageContainerDeployer(pyexasol_connection=mock_pyexasol_conn,
+                                         language_alias=language_alias,
+                                         bucketfs_path=bucketfs_path,
+                                         progress_callback=reports.append)
+    deployer.upload_container(container_file)
+
+    assert (bucket_root / container_file_name).read_bytes() == b'container content'
+    assert reports[-1].operation == 'upload'
+    assert reports[-1].done
+    assert reports[-1].transferred == reports[-1].total == len(b'container content')
+
+
+def test_slc_deployer_upload_check_container(mock_pyexasol_conn, language_alias,
+                                             container_file_name, tmp_path):
+    bucket_root = tmp_path / 'bucket'
+    bucket_root.mkdir()
+    bucketfs_path = bfs.path.build_path(backend=bfs.path.StorageBackend.mounted,
+                                        base_path=str(bucket_root))
+    container_file = tmp_path / container_file_name
+    container_file.write_bytes(b'container content')
+    deployer = LanguageContainerDeployer(pyexasol_connection=mock_pyexasol_conn,
+                                         language_alias=language_alias,
+                                         bucketfs_path=bucketfs_path,
+                                         check_container=True)
+
+    with pytest.raises(InvalidContainerError):
+        deployer.upload_container(container_file)
+    assert not (bucket_root / container_file_name).exists()
+    assert deployer.get_uploaded_digest(container_file_name) is None
+
+
+def test_slc_deployer_upload_zero_copy(mock_pyexasol_conn, language_alias, container_file_name,
+                                       tmp_path):
+    bucket_root = tmp_path / 'bucket'
+    bucket_root.mkdir()
+    container_file = tmp_path / container_file_name
+    container_content = bytes(range(256)) * 100
+    container_file.write_bytes(container_content)
+    reports = []
+    with bucketfs_stand_in(bucket_root) as stand_in:
+        deployer = LanguageContainerDeployer(pyexasol_connection=mock_pyexasol_conn,
+                                             language_alias=language_alias,
+                                             bucketfs_path=stand_in.build_path(),
+                                             progress_callback=reports.append,
+                                             zero_copy_upload=True,
+                                             upload_buffer_size=1000)
+        assert deployer.upload_container(container_file)
+        assert not deployer.upload_container(container_file, skip_if_unchanged=True)
+        assert deployer.get_uploaded_digest(container_file_name) == \
+            hashlib.sha256(container_content).hexdigest()
+
+    assert (bucket_root / container_file_name).read_bytes() == container_content
+    assert reports[-1].done
+    assert reports[-1].transferred == reports[-1].total == len(container_content)
+    assert deployer.metrics.records[0].labels == {'mode': 'zero-copy'}
+
+
+def test_slc_deployer_upload_recompressed(mock_pyexasol_conn, language_alias, tmp_path):
+    container_file = tmp_path / 'slc.tar.gz'
+    data = b'import os\n' * 100000
+    with tarfile.open(container_file, 'w:gz', compresslevel=1) as tar:
+        info = tarfile.TarInfo('exaudf/exaudfclient_py3')
+        info.size = len(data)
+        tar.addfile(info, io.BytesIO(data))
+    bucket_root = tmp_path / 'bucket'
+    bucket_root.mkdir()
+    with bucketfs_stand_in(bucket_root) as stand_in:
+        deployer = LanguageContainerDeployer(pyexasol_connection=mock_pyexasol_conn,
+                                             language_alias=language_alias,
+                                             bucketfs_path=stand_in.build_path(),
+                                             check_container=True,
+                                             recompression_level=9)
+        assert deployer.upload_container(container_file)
+        assert not deployer.upload_container(container_file, skip_if_unchanged=True)
+        digest = deployer.get_uploaded_digest('slc.tar.gz')
+
+    uploaded = (bucket_root / 'slc.tar.gz').read_bytes()
+    assert digest == hashlib.sha256(uploaded).hexdigest()
+    with tarfile.open(bucket_root / 'slc.tar.gz') as tar:
+        assert tar.extractfile('exaudf/exaudfclient_py3').read() == data
+    report = deployer.recompression_reports['slc.tar.gz']
+    assert report.size == len(uploaded) < report.original_size
+    assert deployer.metrics.records[0].labels == {'mode': 'recompressed', 'level': '9'}
+
+
+def test_slc_deployer_create_saas_recompression():
+    # Rejected before looking up the database.
+    with pytest.raises(ValueError, match='recompression'):
+        LanguageContainerDeployer.create(language_alias='PYTHON3_TEST',
+                                         saas_url='https://cloud.exasol.com',
+                                         saas_account_id='my_account', saas_database_id='my_db',
+                                         saas_token='my_token', recompression_level=9)
+
+
+def test_slc_deployer_collect_garbage(language_alias, tmp_path):
+    # The container activated at the SESSION level is kept, the older one is deleted.
+    bucket_root = tmp_path / 'bucket'
+    bucket_root.mkdir()
+    conn = create_autospec(ExaConnection)
+    with bucketfs_stand_in(bucket_root) as stand_in:
+        deployer = LanguageContainerDeployer(pyexasol_connection=conn,
+                                             language_alias=language_alias,
+                                             bucketfs_path=stand_in.build_path('slc'))
+        for name in ['slc_v1.tar.gz', 'slc_v2.tar.gz']:
+            deployer.upload_container_stream(io.BytesIO(b'container content'), name, 17)
+        conn.execute.return_value.fetchall.return_value = [
+            ('R=builtin_r', f'R=builtin_r {deployer.get_language_definition("slc_v2.tar.gz")}')]
+        report = deployer.collect_garbage(RetentionPolicy(keep_last=0))
+
+    assert report.referenced == {'slc_v2.tar.gz': [language_alias]}
+    assert report.deleted == ['slc_v1.tar.gz']
+    assert sorted(path.name for path in (bucket_root / 'slc').iterdir()) == [
+        '.slc_retention.json', 'slc_v2.tar.gz', 'slc_v2.tar.gz.sha256']
+
+
 @patch('exasol.python_extension_common.deployment.language_container_deployer.get_udf_path')
-@patch('exasol.python_extension_common.deployment.language_container_deployer.get_language_settings')
+@patch('exasol.python_extension_common.deployment.language_container_deployer.get_all_language_settings')
 def test_slc_deployer_generate_activation_command(mock_lang_settings, mock_udf_path,
                                                   container_deployer, language_alias,
                                                   container_file_name, container_bfs_path):
-    mock_lang_settings.return_value = 'R=builtin_r JAVA=builtin_java PYTHON3=builtin_python3'
+    mock_lang_settings.return_value = dict.fromkeys(
+        LanguageActivationLevel, 'R=builtin_r JAVA=builtin_java PYTHON3=builtin_python3')
     mock_udf_path.return_value = PurePosixPath(f'/buckets/{container_bfs_path}')
 
     alter_type = LanguageActivationLevel.Session
@@ -103,15 +409,16 @@ def test_slc_deployer_generate_activation_command(mock_lang_settings, mock_udf_p
 
 
 @patch('exasol.python_extension_common.deployment.language_container_deployer.get_udf_path')
-@patch('exasol.python_extension_common.deployment.language_container_deployer.get_language_settings')
+@patch('exasol.python_extension_common.deployment.language_container_deployer.get_all_language_settings')
 def test_slc_deployer_generate_activation_command_override(mock_lang_settings, mock_udf_path,
                                                            container_deployer, language_alias,
                                                            container_file_name, container_bfs_path):
     current_bfs_path = 'bfsdefault/default/container_abc'
-    mock_lang_settings.return_value = \
-        'R=builtin_r JAVA=builtin_java PYTHON3=builtin_python3 ' \
-        f'{language_alias}=localzmq+protobuf:///{current_bfs_path}?' \
-        f'lang=python#/buckets/{current_bfs_path}/exaudf/exaudfclient_py3'
+    mock_lang_settings.return_value = dict.fromkeys(
+        LanguageActivationLevel,
+        'R=builtin_r JAVA=builtin_java PYTHON3=builtin_python3 '
+        f'{language_alias}=localzmq+protobuf:///{current_bfs_path}?'
+        f'lang=python#/buckets/{current_bfs_path}/exaudf/exaudfclient_py3')
     mock_udf_path.return_value = PurePosixPath(f'/buckets/{container_bfs_path}')
 
     alter_type = LanguageActivationLevel.Session
@@ -126,15 +433,16 @@ def test_slc_deployer_generate_activation_command_override(mock_lang_settings, m
 
 
 @patch('exasol.python_extension_common.deployment.language_container_deployer.get_udf_path')
-@patch('exasol.python_extension_common.deployment.language_container_deployer.get_language_settings')
+@patch('exasol.python_extension_common.deployment.language_container_deployer.get_all_language_settings')
 def test_slc_deployer_generate_activation_command_failure(mock_lang_settings, mock_udf_path,
                                                           container_deployer, language_alias,
                                                           container_file_name, container_bfs_path):
     current_bfs_path = 'bfsdefault/default/container_abc'
-    mock_lang_settings.return_value = \
-        'R=builtin_r JAVA=builtin_java PYTHON3=builtin_python3 ' \
-        f'{language_alias}=localzmq+protobuf:///{current_bfs_path}?' \
-        f'lang=python#/buckets/{current_bfs_path}/exaudf/exaudfclient_py3'
+    mock_lang_settings.return_value = dict.fromkeys(
+        LanguageActivationLevel,
+        'R=builtin_r JAVA=builtin_java PYTHON3=builtin_python3 '
+        f'{language_alias}=localzmq+protobuf:///{current_bfs_path}?'
+        f'lang=python#/buckets/{current_bfs_path}/exaudf/exaudfclient_py3')
     mock_udf_path.return_value = PurePosixPath(f'/buckets/{container_bfs_path}')
 
     with pytest.raises(RuntimeError):
@@ -153,3 +461,118 @@ def test_slc_deployer_get_language_definition(mock_udf_path,
 
     command = container_deployer.get_language_definition(container_file_name)
     assert command == expected_command
+
+
+@patch('exasol.python_extension_common.deployment.language_container_deployer.get_udf_path')
+def test_slc_deployer_reads_language_settings_once(mock_udf_path, language_alias,
+                                                   container_file_name, container_bfs_path):
+    mock_udf_path.return_value = PurePosixPath(f'/buckets/{container_bfs_path}')
+    conn = create_autospec(ExaConnection)
+    conn.execute.return_value.fetchall.return_value = [('R=builtin_r', 'R=builtin_r')]
+    deployer = LanguageContainerDeployer(pyexasol_connection=conn,
+                                         language_alias=language_alias,
+                                         bucketfs_path=create_autospec(bfs.path.PathLike))
+    deployer.run(bucket_file_path=container_file_name, alter_system=False,
+                 allow_override=False, wait_for_completion=False)
+
+    queries = [c.args[0] for c in conn.execute.call_args_list]
+    assert sum('EXA_PARAMETERS' in query for query in queries) == 1
+    assert sum(query.startswith('ALTER SESSION') for query in queries) == 1
+    # The session settings have been updated by our ALTER, the system ones have not.
+    session_command = deployer.generate_activation_command(
+        container_file_name, LanguageActivationLevel.Session, allow_override=True)
+    system_command = deployer.generate_activation_command(
+        container_file_name, LanguageActivationLevel.System, allow_override=False)
+    assert session_command.count(f'{language_alias}=') == 1
+    assert system_command.count(f'{language_alias}=') == 1
+    with pytest.raises(RuntimeError):
+        deployer.generate_activation_command(container_file_name, LanguageActivationLevel.Session)
+
+
+def test_slc_deployer_update_language_settings(language_alias):
+    conn = create_autospec(ExaConnection)
+    conn.execute.return_value.fetchall.return_value = [
+        ('R=builtin_r JAVA=builtin_java PYTHON3=builtin_python3', '')]
+    deployer = LanguageContainerDeployer(pyexasol_connection=conn,
+                                         language_alias=language_alias,
+                                         bucketfs_path=create_autospec(bfs.path.PathLike))
+    deployer.update_language_settings(LanguageActivationLevel.System,
+                                      [LanguageDefinition('A', 'builtin_a'),
+                                       LanguageDefinition('B', 'builtin_b')],
+                                      remove_aliases=['R', 'JAVA'])
+    conn.execute.assert_called_with(
+        "ALTER SYSTEM SET SCRIPT_LANGUAGES='PYTHON3=builtin_python3 A=builtin_a B=builtin_b';")
+
+
+@patch('exasol.python_extension_common.deployment.language_container_deployer.wait_language_containers')
+@patch('exasol.python_extension_common.deployment.language_container_deployer.temp_schema')
+def test_slc_deployer_run_batch(mock_temp_schema, mock_wait_slcs, tmp_path):
+    bucket_root = tmp_path / 'bucket'
+    bucket_root.mkdir()
+    bucketfs_path = bfs.path.build_path(backend=bfs.path.StorageBackend.mounted,
+                                        base_path=str(bucket_root))
+    container_files = []
+    for name in ['slc_a.tar.gz', 'slc_b.tar.gz']:
+        container_files.append(tmp_path / name)
+        container_files[-1].write_bytes(name.encode())
+    conn = create_autospec(ExaConnection)
+    conn.execute.return_value.fetchall.return_value = [('R=builtin_r', 'R=builtin_r')]
+    mock_temp_schema.return_value.__enter__.return_value = 'TEMP_SCHEMA'
+    deployer = LanguageContainerDeployer(pyexasol_connection=conn,
+                                         language_alias='NOT_USED',
+                                         bucketfs_path=bucketfs_path)
+    deployer.run_batch([ContainerSpec('PYTHON3_A', container_file=container_files[0]),
+                        ContainerSpec('PYTHON3_B', container_file=container_files[1],
+                                      bucket_file_path='b/slc.tar.gz'),
+                        ContainerSpec('PYTHON3_C', bucket_file_path='slc_c.tar.gz')],
+                       max_concurrency=2)
+
+    assert (bucket_root / 'slc_a.tar.gz').read_bytes() == b'slc_a.tar.gz'
+    assert (bucket_root / 'b' / 'slc.tar.gz').read_bytes() == b'slc_b.tar.gz'
+    alter_commands = [c.args[0] for c in conn.execute.call_args_list
+                      if c.args[0].startswith('ALTER')]
+    assert [command.split()[1] for command in alter_commands] == ['SYSTEM', 'SESSION']
+    for command in alter_commands:
+        assert all(f'{alias}=localzmq+protobuf' in command
+                   for alias in ['PYTHON3_A', 'PYTHON3_B', 'PYTHON3_C'])
+        assert 'NOT_USED' not in command
+    mock_wait_slcs.assert_called_once_with(conn, ['PYTHON3_A', 'PYTHON3_B'], 'TEMP_SCHEMA',
+                                           metrics=deployer.metrics)
+
+
+def test_slc_deployer_run_batch_invalid(container_deployer):
+    with pytest.raises(ValueError):
+        container_deployer.run_batch([ContainerSpec('A', bucket_file_path='a.tar.gz'),
+                                      ContainerSpec('A', bucket_file_path='b.tar.gz')])
+    with pytest.raises(ValueError):
+        container_deployer.run_batch([ContainerSpec('A', container_url='http://my_server/a')])
+
+
+@patch('exasol.bucketfs.path.build_path')
+@patch('pyexasol.connect')
+def test_slc_deployer_create_pooled(mock_connect, mock_build_path, language_alias):
+    mock_connect.return_value.is_closed = False
+    mock_connect.return_value.attr = {'currentSchema': ''}
+    mock_connect.return_value.current_schema.return_value = ''
+    params = {'dsn': 'my_cluster:123', 'db_user': 'me', 'db_password': 'secret',
+              'bucketfs_host': 'my_cluster', 'bucketfs_port': 2580, 'bucketfs_name': 'bfsdefault',
+              'bucket': 'default', 'bucketfs_user': 'w', 'bucketfs_password': 'write'}
+    pool = PyexasolConnectionPool()
+    for _ in range(2):
+        deployer = LanguageContainerDeployer.create(language_alias, **params, pool=pool)
+        deployer.close()
+    mock_connect.assert_called_once()
+    assert pool.idle_count == 1
+
+
+@patch('exasol.bucketfs.path.build_path')
+@patch('pyexasol.connect')
+def test_slc_deployer_create_onprem_with_saas_cache(mock_connect, mock_build_path, language_alias):
+    mock_connect.side_effect = ConnectionError('Connection refused')
+    saas_cache = create_autospec(SaasLookupCache)
+    params = {'dsn': 'my_cluster:123', 'db_user': 'me', 'db_password': 'secret',
+              'bucketfs_host': 'my_cluster', 'bucketfs_port': 2580, 'bucketfs_name': 'bfsdefault',
+              'bucket': 'default', 'bucketfs_user': 'w', 'bucketfs_password': 'write'}
+    with pytest.raises(ConnectionError, match='Connection refused'):
+        LanguageContainerDeployer.create(language_alias, **params, saas_cache=saas_cache)
+    saas_cache.invalidate.assert_not_called()
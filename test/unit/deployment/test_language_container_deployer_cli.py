@@ -1,6 +1,8 @@
+from pathlib import Path
 import click
+from exasol.python_extension_common.deployment.language_container_deployer import ContainerSpec
 from exasol.python_extension_common.deployment.language_container_deployer_cli import (
-    _ParameterFormatters, CustomizableParameters)
+    _ParameterFormatters, CustomizableParameters, _get_container_spec)
 
 
 def test_parameter_formatters_1param():
@@ -27,3 +29,12 @@ def test_parameter_formatters_2params():
     formatters(ctx, opt2, 'cezar')
     assert ctx.params[CustomizableParameters.container_url.name] == 'http://my_server/1.3.2/cezar/my_stuff'
     assert ctx.params[CustomizableParameters.container_name.name] == 'downloaded-1.3.2'
+
+
+def test_get_container_spec():
+    assert _get_container_spec('A', 'https://my_server/a.tar.gz', 'a.tar.gz', True) == \
+        ContainerSpec('A', container_url='https://my_server/a.tar.gz', bucket_file_path='a.tar.gz')
+    assert _get_container_spec('B', 'local/b.tar.gz', 'b.tar.gz', True) == \
+        ContainerSpec('B', container_file=Path('local/b.tar.gz'), bucket_file_path='b.tar.gz')
+    assert _get_container_spec('C', 'local/c.tar.gz', 'c.tar.gz', False) == \
+        ContainerSpec('C', bucket_file_path='c.tar.gz')
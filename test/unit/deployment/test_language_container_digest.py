@@ -0,0 +1,71 @@
+import hashlib
+import io
+import os
+from pathlib import Path
+
+import pytest
+import exasol.bucketfs as bfs
+
+from exasol.python_extension_common.deployment.language_container_digest import (
+    HashingReader, get_container_digest, get_cached_digest, cache_digest, read_manifest,
+    write_manifest, remove_manifest)
+
+CONTAINER_CONTENT = b'not really a container' * 1000
+
+
+@pytest.fixture
+def container_file(tmp_path) -> Path:
+    container_file = tmp_path / 'container_xyz.tar.gz'
+    container_file.write_bytes(CONTAINER_CONTENT)
+    return container_file
+
+
+@pytest.fixture
+def bucket_path(tmp_path) -> bfs.path.PathLike:
+    bucket_root = tmp_path / 'bucket'
+    bucket_root.mkdir()
+    return bfs.path.build_path(backend=bfs.path.StorageBackend.mounted,
+                               base_path=str(bucket_root))
+
+
+def test_hashing_reader():
+    reader = HashingReader(io.BytesIO(CONTAINER_CONTENT))
+    assert reader.read() == CONTAINER_CONTENT
+    assert reader.tell() == len(CONTAINER_CONTENT)
+    assert reader.hexdigest() == hashlib.sha256(CONTAINER_CONTENT).hexdigest()
+
+
+def test_get_container_digest_cached(container_file):
+    assert get_cached_digest(container_file) is None
+    digest = get_container_digest(container_file)
+    assert digest == hashlib.sha256(CONTAINER_CONTENT).hexdigest()
+    assert get_cached_digest(container_file) == digest
+
+
+def test_cached_digest_variant(container_file):
+    # The digest of a transformed file doesn't pass for the digest of the file itself.
+    cache_digest(container_file, 'abc', variant='gzip-9')
+    assert get_cached_digest(container_file, variant='gzip-9') == 'abc'
+    assert get_cached_digest(container_file, variant='gzip-6') is None
+    assert get_container_digest(container_file) == hashlib.sha256(CONTAINER_CONTENT).hexdigest()
+    assert get_cached_digest(container_file, variant='gzip-9') is None
+
+
+def test_get_container_digest_file_changed(container_file):
+    get_container_digest(container_file)
+    container_file.write_bytes(b'another container')
+    stat = container_file.stat()
+    os.utime(container_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+    assert get_cached_digest(container_file) is None
+    assert get_container_digest(container_file) == hashlib.sha256(b'another container').hexdigest()
+
+
+def test_manifest(bucket_path):
+    archive_path = bucket_path / 'container' / 'container_xyz.tar.gz'
+    assert read_manifest(archive_path) is None
+    archive_path.write(CONTAINER_CONTENT)
+    assert read_manifest(archive_path) is None
+    write_manifest(archive_path, 'abc')
+    assert read_manifest(archive_path) == 'abc'
+    remove_manifest(archive_path)
+    assert read_manifest(archive_path) is None
@@ -0,0 +1,187 @@
+from __future__ import annotations
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Generator
+import hashlib
+import re
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from exasol.python_extension_common.deployment.language_container_download import (
+    download_container, probe_download, get_published_checksum, _get_ranges)
+
+CONTENT = bytes(range(256)) * 4096 + b'tail'
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    supports_ranges = True
+    ignore_ranges = False
+    # The number of range responses cut short before the connection is dropped.
+    truncated_ranges = 0
+    # The status of the responses to the HEAD requests, if not successful.
+    head_status: int | None = None
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.requested_ranges: list[str] = []
+        self.head_requests = 0
+        self.lock = threading.Lock()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: _Server
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _send_headers(self, status: int, size: int, content_range: str | None = None) -> None:
+        self.send_response(status)
+        self.send_header('Content-Length', str(size))
+        if self.server.supports_ranges:
+            self.send_header('Accept-Ranges', 'bytes')
+        if content_range:
+            self.send_header('Content-Range', content_range)
+        self.end_headers()
+
+    def do_HEAD(self) -> None:  # pylint: disable=invalid-name
+        self.server.head_requests += 1
+        if self.server.head_status is not None:
+            self.send_response(self.server.head_status)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.path == '/redirect':
+            self.send_response(302)
+            self.send_header('Location', '/container.tar.gz')
+            self.end_headers()
+            return
+        self._send_headers(200, len(CONTENT))
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        if self.path == '/container.tar.gz.sha256':
+            body = f'{hashlib.sha256(CONTENT).hexdigest()}  container.tar.gz\n'.encode()
+            self._send_headers(200, len(body))
+            self.wfile.write(body)
+            return
+        range_header = self.headers.get('Range')
+        match = re.fullmatch(r'bytes=(\d+)-(\d+)', range_header or '')
+        if match and self.server.supports_ranges and not self.server.ignore_ranges:
+            with self.server.lock:
+                self.server.requested_ranges.append(range_header)
+                truncate = self.server.truncated_ranges > 0
+                self.server.truncated_ranges -= truncate
+            first, last = int(match.group(1)), int(match.group(2))
+            self._send_headers(206, last - first + 1,
+                               f'bytes {first}-{last}/{len(CONTENT)}')
+            if truncate:
+                self.wfile.write(CONTENT[first:(first + last) // 2])
+                self.close_connection = True
+            else:
+                self.wfile.write(CONTENT[first:last + 1])
+        else:
+            self._send_headers(200, len(CONTENT))
+            self.wfile.write(CONTENT)
+
+
+@pytest.fixture
+def http_server() -> Generator[_Server, None, None]:
+    server = _Server(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _get_url(server: _Server, path: str = '/container.tar.gz') -> str:
+    return f'http://127.0.0.1:{server.server_address[1]}{path}'
+
+
+@pytest.mark.parametrize('size, connections, min_range_size, expected', [
+    (100, 4, 10, [(0, 24), (25, 49), (50, 74), (75, 99)]),
+    (100, 4, 40, [(0, 49), (50, 99)]),
+    (101, 2, 10, [(0, 50), (51, 100)]),
+    (100, 4, 200, [(0, 99)]),
+])
+def test_get_ranges(size, connections, min_range_size, expected):
+    assert _get_ranges(size, connections, min_range_size) == expected
+
+
+def test_probe_download(http_server):
+    info = probe_download(_get_url(http_server, '/redirect'))
+    assert info.url == _get_url(http_server)
+    assert info.size == len(CONTENT)
+    assert info.accepts_ranges
+
+
+def test_download_container_in_ranges(http_server, tmp_path):
+    target = tmp_path / 'container.tar.gz'
+    digest = download_container(_get_url(http_server), target, connections=4,
+                                min_range_size=64 * 1024)
+    assert target.read_bytes() == CONTENT
+    assert digest == hashlib.sha256(CONTENT).hexdigest()
+    assert len(http_server.requested_ranges) == 4
+
+
+def test_download_container_range_retry(http_server, tmp_path):
+    # A range cut short is downloaded again, without counting its first part twice.
+    http_server.truncated_ranges = 1
+    progress = MagicMock()
+    target = tmp_path / 'container.tar.gz'
+    download_container(_get_url(http_server), target, connections=4, min_range_size=64 * 1024,
+                       chunk_size=16 * 1024, progress=progress)
+    assert target.read_bytes() == CONTENT
+    assert len(http_server.requested_ranges) == 5
+    final = progress.call_args.args[0]
+    assert final.done
+    assert final.transferred == len(CONTENT)
+
+
+@pytest.mark.parametrize('supports_ranges, ignore_ranges', [(False, False), (True, True)])
+def test_download_container_single_stream(http_server, tmp_path, supports_ranges, ignore_ranges):
+    # Either the server says it doesn't support ranges or it pretends to but sends the whole file.
+    http_server.supports_ranges = supports_ranges
+    http_server.ignore_ranges = ignore_ranges
+    target = tmp_path / 'container.tar.gz'
+    digest = download_container(_get_url(http_server), target, connections=4,
+                                min_range_size=64 * 1024)
+    assert target.read_bytes() == CONTENT
+    assert digest == hashlib.sha256(CONTENT).hexdigest()
+    assert not http_server.requested_ranges
+
+
+@pytest.mark.parametrize('head_status', [403, 405])
+def test_download_container_head_rejected(http_server, tmp_path, head_status):
+    http_server.head_status = head_status
+    progress = MagicMock()
+    target = tmp_path / 'container.tar.gz'
+    digest = download_container(_get_url(http_server), target, connections=4,
+                                min_range_size=64 * 1024, progress=progress)
+    assert target.read_bytes() == CONTENT
+    assert digest == hashlib.sha256(CONTENT).hexdigest()
+    assert not http_server.requested_ranges
+    assert progress.call_args.args[0].transferred == len(CONTENT)
+
+
+def test_download_container_single_connection_no_probe(http_server, tmp_path):
+    target = tmp_path / 'container.tar.gz'
+    download_container(_get_url(http_server), target, connections=1)
+    assert target.read_bytes() == CONTENT
+    assert http_server.head_requests == 0
+
+
+def test_download_container_checksum(http_server, tmp_path):
+    target = tmp_path / 'container.tar.gz'
+    checksum = get_published_checksum(_get_url(http_server, '/container.tar.gz.sha256'))
+    assert download_container(_get_url(http_server), target, checksum=checksum.upper(),
+                              min_range_size=64 * 1024) == checksum
+
+
+def test_download_container_checksum_mismatch(http_server, tmp_path):
+    target = tmp_path / 'container.tar.gz'
+    with pytest.raises(RuntimeError, match='does not match'):
+        download_container(_get_url(http_server), target, checksum='0' * 64,
+                           min_range_size=64 * 1024)
+    assert not target.exists()
@@ -0,0 +1,135 @@
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import create_autospec, MagicMock
+
+import pytest
+import exasol.bucketfs as bfs
+from pyexasol import ExaConnection
+
+from exasol.python_extension_common.deployment.language_container_deployer import (
+    LanguageContainerDeployer)
+from exasol.python_extension_common.deployment.language_container_fleet_deployer import (
+    LanguageContainerFleetDeployer, DeploymentTarget, format_deployment_report, _FanOut)
+
+CONTAINER_CONTENT = bytes(range(256)) * 4000
+LANGUAGE_ALIAS = 'PYTHON3_TEST'
+CONTAINER_NAME = 'container_xyz.tar.gz'
+
+
+@pytest.fixture
+def container_file(tmp_path) -> Path:
+    container_file = tmp_path / CONTAINER_NAME
+    container_file.write_bytes(CONTAINER_CONTENT)
+    return container_file
+
+
+class FakeDeployerFactory:
+    """
+    Creates deployers backed by local directories instead of buckets.
+    A target with the parameter fail_at set to 'connection' or 'activation' fails at that phase.
+    """
+    def __init__(self, root: Path):
+        self.root = root
+        self.deployers = {}
+
+    def __call__(self, language_alias: str, name: str, fail_at: str = '',
+                 delay: float = 0) -> LanguageContainerDeployer:
+        time.sleep(delay)
+        if fail_at == 'connection':
+            raise ConnectionError(f'Cannot connect to {name}')
+        bucket_root = self.root / name
+        bucket_root.mkdir(exist_ok=True)
+        bucketfs_path = bfs.path.build_path(backend=bfs.path.StorageBackend.mounted,
+                                            base_path=str(bucket_root))
+        deployer = LanguageContainerDeployer(create_autospec(ExaConnection), language_alias,
+                                             bucketfs_path)
+        deployer.activate_and_wait = MagicMock()
+        if fail_at == 'activation':
+            deployer.activate_and_wait.side_effect = RuntimeError('Cannot activate')
+        self.deployers[name] = deployer
+        return deployer
+
+
+def make_targets(names, **parameters):
+    return [DeploymentTarget(name, {'name': name, **parameters.get(name, {})}) for name in names]
+
+
+@pytest.mark.parametrize('max_concurrency', [1, 2, 8])
+def test_fleet_deployer_run(tmp_path, container_file, max_concurrency):
+    factory = FakeDeployerFactory(tmp_path)
+    names = ['db1', 'db2', 'db3']
+    fleet = LanguageContainerFleetDeployer(LANGUAGE_ALIAS, make_targets(names),
+                                           max_concurrency=max_concurrency,
+                                           deployer_factory=factory)
+    results = fleet.run(container_file=container_file, alter_system=False)
+
+    assert [result.target for result in results] == names
+    assert all(result.success and result.uploaded for result in results)
+    for name in names:
+        assert (tmp_path / name / CONTAINER_NAME).read_bytes() == CONTAINER_CONTENT
+        factory.deployers[name].activate_and_wait.assert_called_once_with(
+            CONTAINER_NAME, False, False, True)
+        factory.deployers[name]._pyexasol_conn.close.assert_called_once()
+
+
+def test_fleet_deployer_partial_failure(tmp_path, container_file):
+    factory = FakeDeployerFactory(tmp_path)
+    targets = make_targets(['db1', 'db2', 'db3'],
+                           db1={'fail_at': 'connection'}, db3={'fail_at': 'activation'})
+    fleet = LanguageContainerFleetDeployer(LANGUAGE_ALIAS, targets, deployer_factory=factory)
+    results = fleet.run(container_file=container_file)
+
+    assert [(result.success, result.uploaded) for result in results] == \
+        [(False, False), (True, True), (False, True)]
+    assert isinstance(results[0].error, ConnectionError)
+    report = format_deployment_report(results)
+    assert 'Cannot connect to db1' in report
+    assert 'Deployed to 1 out of 3 targets.' in report
+
+
+def test_fleet_deployer_durations(tmp_path, container_file):
+    # The second target waits for the first one to connect, but this is not counted.
+    factory = FakeDeployerFactory(tmp_path)
+    targets = make_targets(['db1', 'db2'], db1={'delay': 0.5}, db2={'fail_at': 'connection'})
+    fleet = LanguageContainerFleetDeployer(LANGUAGE_ALIAS, targets, max_concurrency=1,
+                                           deployer_factory=factory)
+    results = fleet.run(container_file=container_file)
+    assert results[0].duration.total_seconds() >= 0.5
+    assert results[1].duration.total_seconds() < 0.4
+
+
+def test_fleet_deployer_closes_on_failure(tmp_path, container_file):
+    factory = FakeDeployerFactory(tmp_path)
+    fleet = LanguageContainerFleetDeployer(LANGUAGE_ALIAS, make_targets(['db1', 'db2']),
+                                           deployer_factory=factory)
+    with pytest.raises(ValueError):
+        fleet.run(container_url='', bucket_file_path=CONTAINER_NAME)
+    for deployer in factory.deployers.values():
+        deployer._pyexasol_conn.close.assert_called_once()
+
+
+def test_fleet_deployer_skip_if_unchanged(tmp_path, container_file):
+    factory = FakeDeployerFactory(tmp_path)
+    fleet = LanguageContainerFleetDeployer(LANGUAGE_ALIAS, make_targets(['db1']),
+                                           deployer_factory=factory)
+    fleet.run(container_file=container_file)
+    fleet = LanguageContainerFleetDeployer(LANGUAGE_ALIAS, make_targets(['db1', 'db2']),
+                                           deployer_factory=factory)
+    results = fleet.run(container_file=container_file, skip_if_unchanged=True)
+    assert [result.uploaded for result in results] == [False, True]
+
+
+def test_fleet_deployer_unique_names():
+    with pytest.raises(ValueError):
+        LanguageContainerFleetDeployer(LANGUAGE_ALIAS, make_targets(['db1', 'db1']))
+
+
+def test_fan_out_closed_reader_does_not_block():
+    fan_out = _FanOut(io.BytesIO(CONTAINER_CONTENT), 2, chunk_size=100)
+    fan_out.readers[1].close()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(fan_out.readers[0].read)
+        fan_out.run()
+        assert future.result() == CONTAINER_CONTENT
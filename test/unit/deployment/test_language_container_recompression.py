@@ -0,0 +1,72 @@
+import gzip
+import io
+import random
+import tarfile
+from pathlib import Path
+
+import pytest
+
+from exasol.python_extension_common.deployment.language_container_recompression import (
+    RecompressingReader, RecompressionReport)
+
+BLOCK_SIZE = 64 * 1024
+
+
+@pytest.fixture
+def container_content() -> bytes:
+    rnd = random.Random(0)
+    words = [rnd.randbytes(rnd.randint(3, 9)) for _ in range(1000)]
+    return b' '.join(rnd.choice(words) for _ in range(100000))
+
+
+@pytest.fixture
+def container_file(tmp_path, container_content) -> Path:
+    container_file = tmp_path / 'container_xyz.tar.gz'
+    container_file.write_bytes(gzip.compress(container_content, compresslevel=1))
+    return container_file
+
+
+@pytest.mark.parametrize('threads', [1, 4])
+def test_recompressing_reader(container_file, container_content, threads):
+    with RecompressingReader(container_file, level=9, block_size=BLOCK_SIZE,
+                             threads=threads) as reader:
+        recompressed = reader.read()
+        report = reader.report()
+
+    assert gzip.decompress(recompressed) == container_content
+    assert report.original_size == container_file.stat().st_size
+    assert report.size == len(recompressed) < report.original_size
+    assert report.saved_bytes == report.original_size - report.size
+
+
+def test_recompressing_reader_deterministic(container_file):
+    # The output doesn't depend on the number of threads or the size of the reads.
+    with RecompressingReader(container_file, block_size=BLOCK_SIZE, threads=1) as reader:
+        expected = reader.read()
+    with RecompressingReader(container_file, block_size=BLOCK_SIZE, threads=3) as reader:
+        chunks = iter(lambda: reader.read(1000), b'')
+        assert b''.join(chunks) == expected
+
+
+def test_recompressing_reader_tar(tmp_path):
+    container_file = tmp_path / 'container.tar.gz'
+    with tarfile.open(container_file, 'w:gz') as tar:
+        data = b'#!/bin/sh\n' * 10000
+        info = tarfile.TarInfo('exaudf/exaudfclient_py3')
+        info.size = len(data)
+        tar.addfile(info, io.BytesIO(data))
+    with RecompressingReader(container_file, block_size=1000) as reader:
+        recompressed = reader.read()
+    with tarfile.open(fileobj=io.BytesIO(recompressed), mode='r:gz') as tar:
+        assert tar.extractfile('exaudf/exaudfclient_py3').read() == data
+
+
+def test_recompressing_reader_invalid_level(container_file):
+    with pytest.raises(ValueError):
+        RecompressingReader(container_file, level=0)
+
+
+def test_recompression_report():
+    report = RecompressionReport(original_size=1000, size=800, seconds=4.)
+    assert report.saved_seconds == pytest.approx(1.)
+    assert str(report) == '1000 -> 800 bytes (20.0% saved) in 4.0 s, about 1.0 s of upload saved'
@@ -0,0 +1,67 @@
+from pathlib import Path
+
+import pytest
+import requests
+
+from exasol.python_extension_common.deployment.language_container_digest import read_manifest
+from exasol.python_extension_common.deployment.language_container_resumable_upload import (
+    upload_container_resumable, JOURNAL_SUFFIX)
+
+from test.utils.bucketfs_stand_in import bucketfs_stand_in
+
+CONTAINER_CONTENT = bytes(range(256)) * 1000
+PART_SIZE = 50000
+
+
+@pytest.fixture
+def container_file(tmp_path) -> Path:
+    container_file = tmp_path / 'container_xyz.tar.gz'
+    container_file.write_bytes(CONTAINER_CONTENT)
+    return container_file
+
+
+@pytest.fixture
+def stand_in(tmp_path):
+    bucket_root = tmp_path / 'bucket'
+    bucket_root.mkdir()
+    with bucketfs_stand_in(bucket_root) as stand_in:
+        yield stand_in
+
+
+def test_upload_container_resumable(stand_in, container_file):
+    file_path = stand_in.build_path('container') / container_file.name
+    upload_container_resumable(container_file, file_path, stand_in.assemble, PART_SIZE)
+
+    assert (stand_in.root / 'container' / container_file.name).read_bytes() == CONTAINER_CONTENT
+    assert read_manifest(file_path) is not None
+    assert not (stand_in.root / 'container' / (container_file.name + '.parts')).exists()
+    assert not container_file.with_name(container_file.name + JOURNAL_SUFFIX).exists()
+
+
+def test_upload_container_resumable_retry(stand_in, container_file):
+    # The second part fails once, and is then retried.
+    stand_in.fail_puts_after = [PART_SIZE, PART_SIZE // 2]
+    file_path = stand_in.build_path('container') / container_file.name
+    upload_container_resumable(container_file, file_path, stand_in.assemble, PART_SIZE)
+
+    assert (stand_in.root / 'container' / container_file.name).read_bytes() == CONTAINER_CONTENT
+    # 6 parts, one repeated attempt and the manifest.
+    assert stand_in.put_count == 8
+
+
+def test_upload_container_resumable_resume(stand_in, container_file):
+    file_path = stand_in.build_path('container') / container_file.name
+    # The third part fails at all attempts. The upload gets interrupted.
+    stand_in.fail_puts_after = [PART_SIZE, PART_SIZE, 0]
+    with pytest.raises(requests.exceptions.ConnectionError):
+        upload_container_resumable(container_file, file_path, stand_in.assemble, PART_SIZE,
+                                   max_attempts=1)
+    assert container_file.with_name(container_file.name + JOURNAL_SUFFIX).exists()
+    uploads_before = len(stand_in.uploads)
+
+    # The upload continues from the third part.
+    upload_container_resumable(container_file, file_path, stand_in.assemble, PART_SIZE)
+    part_uploads = [upload for upload in stand_in.uploads[uploads_before:] if '.parts/' in upload[0]]
+    assert part_uploads[0][0].endswith('000002')
+    assert sum(size for _, size in part_uploads) == len(CONTAINER_CONTENT) - 2 * PART_SIZE
+    assert (stand_in.root / 'container' / container_file.name).read_bytes() == CONTAINER_CONTENT
@@ -0,0 +1,137 @@
+import json
+from datetime import timedelta
+from pathlib import Path, PurePosixPath
+
+import pytest
+import exasol.bucketfs as bfs
+
+from exasol.python_extension_common.deployment.language_container_retention import (
+    RetentionPolicy, RETENTION_STATE_FILE, list_containers, get_referenced_containers,
+    collect_garbage)
+from exasol.python_extension_common.deployment.language_container_digest import write_manifest
+from exasol.python_extension_common.deployment.script_languages import (
+    LanguageDefinition, ScriptLanguages)
+
+
+@pytest.fixture
+def bucket_root(tmp_path) -> Path:
+    # The location of the containers in the bucket, not the root of the bucket.
+    bucket_root = tmp_path / 'bucket' / 'slc'
+    bucket_root.mkdir(parents=True)
+    return bucket_root
+
+
+def _build_path(bucket_dir: Path, path: str = '') -> bfs.path.PathLike:
+    return bfs.path.build_path(backend=bfs.path.StorageBackend.mounted,
+                               base_path=str(bucket_dir), path=path)
+
+
+@pytest.fixture
+def bucket_path(bucket_root) -> bfs.path.PathLike:
+    return _build_path(bucket_root.parent, bucket_root.name)
+
+
+def _upload(bucket_path: bfs.path.PathLike, *names: str) -> None:
+    for name in names:
+        (bucket_path / name).write(b'container content')
+        write_manifest(bucket_path / name, 'abc')
+
+
+def _get_settings(bucket_path: bfs.path.PathLike, **containers: str) -> str:
+    definitions = [LanguageDefinition.for_container(
+        alias, PurePosixPath((bucket_path / name).as_udf_path()))
+        for alias, name in containers.items()]
+    return str(ScriptLanguages([LanguageDefinition.parse('PYTHON3=builtin_python3'),
+                                *definitions]))
+
+
+def test_list_containers(bucket_path, bucket_root):
+    _upload(bucket_path, 'slc_1.tar.gz', 'sub/slc_2.tgz', 'slc_3.tar.gz.parts/part_0.tar.gz')
+    (bucket_root / 'readme.txt').write_text('not a container')
+    # An archive without a manifest was not uploaded by the deployer.
+    (bucket_root / 'model.tar.gz').write_bytes(b'not a container')
+    assert list_containers(bucket_path) == ['slc_1.tar.gz']
+    assert sorted(list_containers(bucket_path, recursive=True)) == ['slc_1.tar.gz',
+                                                                    'sub/slc_2.tgz']
+
+
+def test_get_referenced_containers(bucket_path):
+    containers = ['slc_1.tar.gz', 'slc_2.tar.gz', 'slc_3.tar.gz']
+    system_settings = _get_settings(bucket_path, PYTHON3_A='slc_1.tar.gz',
+                                    PYTHON3_B='slc_3.tar.gz')
+    session_settings = _get_settings(bucket_path, PYTHON3_C='slc_1.tar.gz')
+    assert get_referenced_containers(bucket_path, containers,
+                                     [system_settings, session_settings]) == {
+        'slc_1.tar.gz': ['PYTHON3_A', 'PYTHON3_C'], 'slc_3.tar.gz': ['PYTHON3_B']}
+
+
+def test_collect_garbage_keep_last(bucket_path, bucket_root):
+    names = [f'slc-1.{minor}.0.tar.gz' for minor in (2, 9, 10, 11)]
+    _upload(bucket_path, *names)
+    settings = [_get_settings(bucket_path, PYTHON3_EXT='slc-1.2.0.tar.gz'), '']
+    policy = RetentionPolicy(keep_last=2)
+
+    report = collect_garbage(bucket_path, settings, policy, dry_run=True)
+    assert report.referenced == {'slc-1.2.0.tar.gz': ['PYTHON3_EXT']}
+    assert report.kept == ['slc-1.11.0.tar.gz', 'slc-1.10.0.tar.gz']
+    assert report.deleted == ['slc-1.9.0.tar.gz']
+    assert str(report).startswith('Would delete 1 of 4 containers, 1 referenced, 2 kept')
+    assert (bucket_root / 'slc-1.9.0.tar.gz').exists()
+    assert not (bucket_root / RETENTION_STATE_FILE).exists()
+
+    report = collect_garbage(bucket_path, settings, policy)
+    assert report.deleted == ['slc-1.9.0.tar.gz']
+    assert not (bucket_root / 'slc-1.9.0.tar.gz').exists()
+    assert not (bucket_root / 'slc-1.9.0.tar.gz.sha256').exists()
+    assert (bucket_root / 'slc-1.10.0.tar.gz.sha256').exists()
+    state = json.loads((bucket_root / RETENTION_STATE_FILE).read_text())
+    assert sorted(state['first_seen']) == ['slc-1.10.0.tar.gz', 'slc-1.11.0.tar.gz',
+                                           'slc-1.2.0.tar.gz']
+
+
+def test_collect_garbage_max_age(bucket_path, bucket_root):
+    # The age is counted from the first collection that saw a container.
+    _upload(bucket_path, 'slc_a.tar.gz', 'slc_b.tar.gz')
+    policy = RetentionPolicy(max_age=timedelta(hours=1))
+    report = collect_garbage(bucket_path, [''], policy, now=1000.)
+    assert sorted(report.kept) == ['slc_a.tar.gz', 'slc_b.tar.gz']
+
+    _upload(bucket_path, 'slc_c.tar.gz')
+    report = collect_garbage(bucket_path, [''], policy, now=1000. + 7200)
+    assert report.kept == ['slc_c.tar.gz']
+    assert sorted(report.deleted) == ['slc_a.tar.gz', 'slc_b.tar.gz']
+    assert sorted(path.name for path in bucket_root.iterdir()) == [
+        RETENTION_STATE_FILE, 'slc_c.tar.gz', 'slc_c.tar.gz.sha256']
+
+
+def test_collect_garbage_both_limits(bucket_path):
+    # A container is deleted only if it is beyond both the count and the age.
+    _upload(bucket_path, 'slc_1.tar.gz', 'slc_2.tar.gz')
+    policy = RetentionPolicy(keep_last=0, max_age=timedelta(hours=1))
+    collect_garbage(bucket_path, [''], policy, now=1000.)
+    _upload(bucket_path, 'slc_3.tar.gz')
+    report = collect_garbage(bucket_path, [''], policy, now=1000. + 7200)
+    assert report.kept == ['slc_3.tar.gz']
+    assert report.deleted == ['slc_2.tar.gz', 'slc_1.tar.gz']
+
+
+@pytest.mark.parametrize('keep_last, max_age', [(None, None), (-1, None),
+                                                (None, timedelta(hours=-1))])
+def test_retention_policy_invalid(keep_last, max_age):
+    with pytest.raises(ValueError):
+        RetentionPolicy(keep_last, max_age)
+
+
+def test_collect_garbage_bucket_root(bucket_root):
+    bucket_path = _build_path(bucket_root)
+    _upload(bucket_path, 'slc_1.tar.gz', 'slc_2.tar.gz')
+    (bucket_root / 'models').mkdir()
+    (bucket_root / 'models' / 'bert.tar.gz').write_bytes(b'a model')
+    policy = RetentionPolicy(keep_last=1)
+    with pytest.raises(ValueError):
+        collect_garbage(bucket_path, [''], policy)
+    assert len(list(bucket_root.iterdir())) == 5
+
+    report = collect_garbage(bucket_path, [''], policy, allow_bucket_root=True, recursive=True)
+    assert report.deleted == ['slc_1.tar.gz']
+    assert (bucket_root / 'models' / 'bert.tar.gz').exists()
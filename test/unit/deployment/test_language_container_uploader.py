@@ -0,0 +1,37 @@
+import exasol.bucketfs as bfs
+
+from exasol.python_extension_common.deployment.language_container_uploader import (
+    LanguageContainerUploader, ContainerSpec, _IterableReader)
+from exasol.python_extension_common.deployment.language_container_digest import (
+    get_container_digest)
+
+
+def test_iterable_reader_bounded_reads():
+    reader = _IterableReader([b'abcdef', b'gh'])
+    assert reader.read(4) == b'abcd'
+    assert reader.tell() == 4
+    assert reader.read(4) == b'ef'
+    assert reader.read(4) == b'gh'
+    assert reader.read(4) == b''
+
+
+def test_uploader_upload_containers(tmp_path):
+    # The uploader works without a database connection.
+    container_files = []
+    for i in range(3):
+        container_file = tmp_path / f'container_{i}.tar.gz'
+        container_file.write_bytes(f'container {i}'.encode())
+        container_files.append(container_file)
+    bucketfs_path = bfs.path.BucketPath('', bfs.path.MountedBucket(base_path=str(tmp_path)))
+    uploader = LanguageContainerUploader(bucketfs_path / 'bucket')
+
+    uploader.upload_containers([
+        ContainerSpec('PYTHON3_A', container_file=container_files[0]),
+        ContainerSpec('PYTHON3_B', container_file=container_files[1], bucket_file_path='b.tar.gz'),
+        ContainerSpec('PYTHON3_C', bucket_file_path='uploaded_before.tar.gz'),
+    ], max_concurrency=2)
+
+    assert sorted(path.name for path in (tmp_path / 'bucket').iterdir()) == [
+        'b.tar.gz', 'b.tar.gz.sha256', 'container_0.tar.gz', 'container_0.tar.gz.sha256']
+    assert uploader.get_uploaded_digest('b.tar.gz') == get_container_digest(container_files[1])
+    assert [record.phase for record in uploader.metrics.records] == ['upload', 'upload']
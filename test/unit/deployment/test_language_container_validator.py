@@ -1,10 +1,14 @@
+import asyncio
 import pytest
 from datetime import datetime, timedelta
-from unittest.mock import create_autospec, patch
+from unittest.mock import create_autospec, patch, DEFAULT
 
 from pyexasol import ExaConnection
+from tenacity.wait import wait_fixed
 
-from exasol.python_extension_common.deployment.language_container_validator import wait_language_container
+from exasol.python_extension_common.deployment.language_container_validator import (
+    wait_language_container, wait_language_containers, wait_language_container_async,
+    ValidationSession, NodeReadiness, NodesNotReadyError, warm_up_language_container)
 
 
 @pytest.fixture(scope='module')
@@ -21,7 +25,7 @@ class TimeChecker:
             raise RuntimeError
 
 
-@patch('exasol.python_extension_common.deployment.language_container_validator.validate_language_container')
+@patch('exasol.python_extension_common.deployment.language_container_validator.ValidationSession.validate')
 def test_wait_language_container_success(mock_validate_slc, mock_pyexasol_conn):
     tc = TimeChecker(timedelta(milliseconds=200))
     mock_validate_slc.side_effect = tc.check_time
@@ -31,7 +35,7 @@ def test_wait_language_container_success(mock_validate_slc, mock_pyexasol_conn):
                             interval=timedelta(milliseconds=50))
 
 
-@patch('exasol.python_extension_common.deployment.language_container_validator.validate_language_container')
+@patch('exasol.python_extension_common.deployment.language_container_validator.ValidationSession.validate')
 def test_wait_language_container_failure(mock_validate_slc, mock_pyexasol_conn):
     tc = TimeChecker(timedelta(milliseconds=400))
     mock_validate_slc.side_effect = tc.check_time
@@ -40,3 +44,204 @@ def test_wait_language_container_failure(mock_validate_slc, mock_pyexasol_conn):
                                 'xyz',
                                 timeout=timedelta(milliseconds=200),
                                 interval=timedelta(milliseconds=50))
+
+
+@patch('exasol.python_extension_common.deployment.language_container_validator.ValidationSession.validate')
+def test_wait_language_container_adaptive(mock_validate_slc, mock_pyexasol_conn):
+    # With the default adaptive strategy the readiness is detected soon after it happens.
+    tc = TimeChecker(timedelta(milliseconds=300))
+    mock_validate_slc.side_effect = tc.check_time
+    elapsed = wait_language_container(mock_pyexasol_conn, 'xyz', timeout=timedelta(seconds=10))
+    assert timedelta(milliseconds=300) <= elapsed < timedelta(seconds=2)
+
+
+@patch('exasol.python_extension_common.deployment.language_container_validator.ValidationSession.validate')
+def test_wait_language_container_custom_strategy(mock_validate_slc, mock_pyexasol_conn):
+    mock_validate_slc.side_effect = [RuntimeError, RuntimeError, None]
+    wait_language_container(mock_pyexasol_conn, 'xyz', timeout=timedelta(seconds=10),
+                            wait_strategy=wait_fixed(0.01))
+    assert mock_validate_slc.call_count == 3
+
+
+@patch('exasol.python_extension_common.deployment.language_container_validator.ValidationSession.validate')
+def test_wait_language_container_within_timeout(mock_validate_slc, mock_pyexasol_conn):
+    # The wait never extends beyond the timeout, even if the strategy's interval is longer.
+    mock_validate_slc.side_effect = RuntimeError
+    start_time = datetime.now()
+    with pytest.raises(RuntimeError):
+        wait_language_container(mock_pyexasol_conn, 'xyz', timeout=timedelta(milliseconds=300),
+                                wait_strategy=wait_fixed(10))
+    assert datetime.now() - start_time < timedelta(seconds=2)
+
+
+def test_validation_session_single_ddl():
+    conn = create_autospec(ExaConnection)
+    conn.execute.return_value.fetchval.return_value = 2
+    conn.execute.return_value.fetchall.side_effect = [[(0, 0.5)], [(0, 0.1)], [(0, 0.1), (1, 2.)]]
+    with ValidationSession(conn, 'xyz', 'my_schema') as session:
+        for _ in range(2):
+            with pytest.raises(AssertionError):
+                session.validate()
+        session.validate()
+
+    queries = [c.args[0] for c in conn.execute.call_args_list]
+    assert sum('CREATE OR REPLACE' in query for query in queries) == 1
+    assert sum('NPROC' in query for query in queries) == 1
+    assert sum('DROP SCRIPT' in query for query in queries) == 1
+    assert 'DROP SCRIPT' in queries[-1]
+
+
+def test_validation_session_create_retried():
+    # The CREATE fails in the first attempt, and is repeated in the second one.
+    conn = create_autospec(ExaConnection)
+    conn.execute.side_effect = [RuntimeError('Connection lost')] + [DEFAULT] * 4
+    conn.execute.return_value.fetchval.return_value = 1
+    conn.execute.return_value.fetchall.return_value = [(0, 0.1)]
+    with ValidationSession(conn, 'xyz') as session:
+        with pytest.raises(RuntimeError):
+            session.validate()
+        session.validate()
+
+    queries = [c.args[0] for c in conn.execute.call_args_list]
+    assert sum('CREATE OR REPLACE' in query for query in queries) == 2
+    assert 'DROP SCRIPT IF EXISTS' in queries[-1]
+
+
+def test_validation_session_create_failed():
+    # The UDF is dropped, in case the failed CREATE left it behind.
+    conn = create_autospec(ExaConnection)
+    conn.execute.side_effect = [RuntimeError('Connection lost'), DEFAULT]
+    with ValidationSession(conn, 'xyz') as session:
+        with pytest.raises(RuntimeError):
+            session.validate()
+
+    queries = [c.args[0] for c in conn.execute.call_args_list]
+    assert len(queries) == 2
+    assert 'DROP SCRIPT IF EXISTS' in queries[-1]
+
+
+def test_validation_session_readiness():
+    # Node 2 is missed by the first probe, node 1 by the second one.
+    conn = create_autospec(ExaConnection)
+    conn.execute.return_value.fetchval.return_value = 3
+    conn.execute.return_value.fetchall.side_effect = [[(0, 0.5), (1, 2.5)], [(0, 0.1), (2, -0.01)]]
+    with ValidationSession(conn, 'xyz', rows_per_node=4) as session:
+        with pytest.raises(NodesNotReadyError, match='2 of 3 nodes. Not ready nodes: 2.') as ex:
+            session.validate()
+        assert str(ex.value.readiness) == '2/3 nodes ready'
+        readiness = session.validate()
+
+    assert readiness.all_ready
+    assert readiness.latencies == {0: timedelta(seconds=0.5), 1: timedelta(seconds=2.5),
+                                   2: timedelta(0)}
+    queries = [c.args[0] for c in conn.execute.call_args_list]
+    assert sum('BETWEEN 1 AND 12 ' in query for query in queries) == 2
+
+
+def test_nodes_not_ready_error_message():
+    readiness = NodeReadiness(64, {node: timedelta(0) for node in range(52)})
+    assert str(NodesNotReadyError(readiness)) == (
+        'The language container is operational on 52 of 64 nodes. '
+        'Not ready nodes: 52, 53, 54, 55, 56, 57, 58, 59, 60, 61, ....')
+
+
+def test_wait_language_container_readiness_callback():
+    conn = create_autospec(ExaConnection)
+    conn.execute.return_value.fetchval.return_value = 2
+    conn.execute.return_value.fetchall.side_effect = [[(0, 0.5)], [(1, 0.5)]]
+    reports = []
+    wait_language_container(conn, 'xyz', timeout=timedelta(seconds=10),
+                            wait_strategy=wait_fixed(0.01),
+                            readiness_callback=lambda alias, readiness: reports.append(
+                                (alias, str(readiness))))
+    assert reports == [('xyz', '1/2 nodes ready'), ('xyz', '2/2 nodes ready')]
+
+
+def test_warm_up_language_container():
+    conn = create_autospec(ExaConnection)
+    conn.execute.return_value.fetchval.return_value = 3
+    conn.execute.return_value.fetchall.return_value = [(1, 2, 4.5), (0, 3, 1.5)]
+    report = warm_up_language_container(conn, 'xyz', 'my_schema', vms_per_node=3,
+                                        hold=timedelta(milliseconds=200))
+
+    assert report.latencies == {0: timedelta(seconds=1.5), 1: timedelta(seconds=4.5)}
+    assert report.vms == {0: 3, 1: 2}
+    assert report.missing_nodes == [2]
+    assert str(report) == '2/3 nodes warmed up, the slowest node 1 in 4.5 s'
+    queries = [c.args[0] for c in conn.execute.call_args_list]
+    assert any('POSIX_TIME(CURRENT_TIMESTAMP), 0.2)' in query and 'BETWEEN 1 AND 144 ' in query
+               for query in queries)
+    # The latency of a node is the start of its slowest VM.
+    assert any('MIN(latency) AS vm_latency' in query and 'GROUP BY node_id, vm_id' in query
+               and 'MAX(vm_latency)' in query for query in queries)
+    assert 'DROP SCRIPT' in queries[-1]
+
+def test_wait_language_containers():
+    # Container xyz is ready at once, container abc at the third attempt.
+    conn = create_autospec(ExaConnection)
+    conn.execute.return_value.fetchval.return_value = 1
+    attempts = {'abc': 0}
+
+    def execute(query, *args, **kwargs):
+        if '"DUMMY_UDF_1"(i,' in query:
+            attempts['abc'] += 1
+            conn.execute.return_value.fetchall.return_value = \
+                [(0, 0.1)] if attempts['abc'] >= 3 else []
+        else:
+            conn.execute.return_value.fetchall.return_value = [(0, 0.1)]
+        return conn.execute.return_value
+
+    conn.execute.side_effect = execute
+    ready = wait_language_containers(conn, ['xyz', 'abc'], 'my_schema',
+                                     timeout=timedelta(seconds=10), wait_strategy=wait_fixed(0.01))
+
+    assert list(ready) == ['xyz', 'abc']
+    assert ready['xyz'] <= ready['abc']
+    queries = [c.args[0] for c in conn.execute.call_args_list]
+    assert sum('"DUMMY_UDF_0"(i,' in query for query in queries) == 1
+    assert attempts['abc'] == 3
+    assert sum('DROP SCRIPT' in query for query in queries) == 2
+
+
+@patch('exasol.python_extension_common.deployment.language_container_validator.ValidationSession.validate')
+def test_wait_language_containers_failure(mock_validate_slc, mock_pyexasol_conn):
+    mock_validate_slc.side_effect = RuntimeError
+    with pytest.raises(RuntimeError):
+        wait_language_containers(mock_pyexasol_conn, ['xyz', 'abc'],
+                                 timeout=timedelta(milliseconds=200),
+                                 interval=timedelta(milliseconds=50))
+
+
+@patch('exasol.python_extension_common.deployment.language_container_validator.ValidationSession.validate')
+def test_wait_language_container_async(mock_validate_slc, mock_pyexasol_conn):
+    # The event loop must keep running other tasks while the validation is retried.
+    mock_validate_slc.side_effect = [RuntimeError, RuntimeError, RuntimeError, None]
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(1)
+            await asyncio.sleep(0.01)
+
+    async def wait():
+        ticker_task = asyncio.create_task(ticker())
+        try:
+            return await wait_language_container_async(mock_pyexasol_conn, 'xyz',
+                                                       timeout=timedelta(seconds=10),
+                                                       wait_strategy=wait_fixed(0.05))
+        finally:
+            ticker_task.cancel()
+
+    elapsed = asyncio.run(wait())
+    assert mock_validate_slc.call_count == 4
+    assert elapsed >= timedelta(milliseconds=150)
+    assert len(ticks) >= 5
+
+
+@patch('exasol.python_extension_common.deployment.language_container_validator.ValidationSession.validate')
+def test_wait_language_container_async_failure(mock_validate_slc, mock_pyexasol_conn):
+    mock_validate_slc.side_effect = RuntimeError
+    with pytest.raises(RuntimeError):
+        asyncio.run(wait_language_container_async(mock_pyexasol_conn, 'xyz',
+                                                  timeout=timedelta(milliseconds=200),
+                                                  interval=timedelta(milliseconds=50)))
@@ -0,0 +1,48 @@
+import hashlib
+
+import pytest
+
+from exasol.python_extension_common.deployment.mapped_file import MappedFileBody
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / 'container.tar.gz'
+    path.write_bytes(bytes(range(256)) * 40)
+    return path
+
+
+def test_mapped_file_body_chunks(data_file):
+    with MappedFileBody(data_file, buffer_size=4096) as body:
+        chunks = list(body)
+        assert len(body) == 10240
+        assert [len(chunk) for chunk in chunks] == [4096, 4096, 2048]
+        assert all(isinstance(chunk, memoryview) and chunk.readonly for chunk in chunks)
+        assert b''.join(chunks) == data_file.read_bytes()
+        del chunks
+
+
+def test_mapped_file_body_observers(data_file):
+    sha256 = hashlib.sha256()
+    sizes = []
+    with MappedFileBody(data_file, 3000, [sha256.update, lambda chunk: sizes.append(len(chunk))]) \
+            as body:
+        # A client peeking at the first chunk, then sending the whole body.
+        next(iter(body))
+        sent = b''.join(body)
+    assert sent == data_file.read_bytes()
+    assert sha256.hexdigest() == hashlib.sha256(sent).hexdigest()
+    assert sizes == [3000, 3000, 3000, 1240]
+
+
+def test_mapped_file_body_empty(tmp_path):
+    path = tmp_path / 'empty.tar.gz'
+    path.write_bytes(b'')
+    with MappedFileBody(path) as body:
+        assert len(body) == 0
+        assert not list(body)
+
+
+def test_mapped_file_body_invalid_buffer_size(data_file):
+    with pytest.raises(ValueError):
+        MappedFileBody(data_file, buffer_size=0)
@@ -0,0 +1,70 @@
+from pathlib import PurePosixPath
+
+import pytest
+
+from exasol.python_extension_common.deployment.script_languages import (
+    ScriptLanguages, LanguageDefinition)
+
+SLC_URL = ('localzmq+protobuf:///bfsdefault/default/container/my_slc?lang=python#'
+           '/buckets/bfsdefault/default/container/my_slc/exaudf/exaudfclient_py3')
+
+
+@pytest.mark.parametrize('settings', [
+    '',
+    'R=builtin_r JAVA=builtin_java PYTHON3=builtin_python3',
+    f'PYTHON3=builtin_python3 MY_SLC={SLC_URL}',
+    '  R=builtin_r   JAVA=builtin_java ',
+])
+def test_round_trip(settings):
+    assert str(ScriptLanguages.parse(settings)) == settings
+
+
+def test_definition_fields():
+    languages = ScriptLanguages.parse(f'PYTHON3=builtin_python3 MY_SLC={SLC_URL}')
+    assert list(languages) == ['PYTHON3', 'MY_SLC']
+    assert languages['PYTHON3'].is_builtin
+    assert languages['PYTHON3'].lang is None
+    slc = languages['MY_SLC']
+    assert slc.container_path == 'bfsdefault/default/container/my_slc'
+    assert slc.lang == 'python'
+    assert slc.client_path == '/buckets/bfsdefault/default/container/my_slc/exaudf/exaudfclient_py3'
+
+
+def test_for_container():
+    definition = LanguageDefinition.for_container(
+        'MY_SLC', PurePosixPath('/buckets/bfsdefault/default/container/my_slc'))
+    assert str(definition) == f'MY_SLC={SLC_URL}'
+
+
+def test_bulk_changes():
+    languages = ScriptLanguages.parse('R=builtin_r JAVA=builtin_java PYTHON3=builtin_python3')
+    languages.remove(['R', 'UNKNOWN'])
+    languages.update([LanguageDefinition('PYTHON3', 'builtin_python3_new'),
+                      LanguageDefinition('MY_SLC', SLC_URL)])
+    assert str(languages) == f'JAVA=builtin_java PYTHON3=builtin_python3_new MY_SLC={SLC_URL}'
+
+
+def test_replaced_definition_goes_last():
+    languages = ScriptLanguages.parse('R=builtin_r JAVA=builtin_java PYTHON3=builtin_python3')
+    languages.set(LanguageDefinition('R', 'builtin_r_new'))
+    assert str(languages) == 'JAVA=builtin_java PYTHON3=builtin_python3 R=builtin_r_new'
+
+
+@pytest.mark.parametrize('settings', ['R=builtin_r JAVA', 'R=builtin_r R=builtin_r2',
+                                      'JAVA R=builtin_r =x'])
+def test_invalid_tokens_kept(settings, caplog):
+    languages = ScriptLanguages.parse(settings)
+    assert str(languages) == settings
+    assert list(languages) == ['R']
+    assert languages['R'].url == 'builtin_r'
+    assert caplog.records
+
+
+def test_invalid_tokens_updated():
+    # The repeated definitions of an alias are replaced together with the first one.
+    languages = ScriptLanguages.parse('R=builtin_r JAVA R=builtin_r2 PYTHON3=builtin_python3')
+    languages.set(LanguageDefinition('R', 'builtin_r3'))
+    assert str(languages) == 'JAVA PYTHON3=builtin_python3 R=builtin_r3'
+    languages.remove(['JAVA', 'PYTHON3'])
+    assert len(languages) == 1
+    assert str(languages) == 'JAVA R=builtin_r3'
@@ -0,0 +1,55 @@
+import io
+
+import pytest
+import requests
+
+from exasol.python_extension_common.deployment.sized_reader import (
+    CountingReader, LengthReader, with_length)
+
+
+class _BytesReader(CountingReader):
+    def __init__(self, data: bytes) -> None:
+        super().__init__()
+        self._stream = io.BytesIO(data)
+
+    def _readinto(self, buffer) -> int:
+        return self._stream.readinto(buffer)
+
+
+def test_counting_reader():
+    reader = _BytesReader(b'0123456789')
+    assert not hasattr(reader, '__len__')
+    assert reader.read(4) == b'0123'
+    assert reader.tell() == reader.bytes_read == 4
+    assert reader.read() == b'456789'
+
+
+def test_length_reader():
+    reader = with_length(_BytesReader(b'0123456789'), 10)
+    assert isinstance(reader, LengthReader)
+    assert len(reader) == 10
+    assert reader.read(4) == b'0123'
+    assert reader.tell() == 4
+    assert reader.read() == b'456789'
+
+
+def test_with_length_unknown_size():
+    reader = _BytesReader(b'0123456789')
+    assert with_length(reader, None) is reader
+
+
+def test_counting_reader_iteration():
+    # The binary data is iterated in chunks, not in lines.
+    data = b'a\nb\n' * 1000
+    assert b''.join(_BytesReader(data)) == data
+    assert len(list(_BytesReader(data))) == 1
+
+
+@pytest.mark.parametrize('size, headers', [
+    (None, {'Transfer-Encoding': 'chunked'}),
+    (3, {'Content-Length': '3'}),
+])
+def test_with_length_request(size, headers):
+    request = requests.Request('PUT', 'http://my_server/slc.tar.gz',
+                               data=with_length(_BytesReader(b'abc'), size)).prepare()
+    assert headers.items() <= request.headers.items()
@@ -0,0 +1,75 @@
+import io
+from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from exasol.python_extension_common.deployment.transfer_progress import (
+    TransferProgress, ProgressTracker, ProgressReader, format_progress, format_size)
+
+
+@pytest.mark.parametrize('size, expected', [
+    (500, '500 B'),
+    (1536, '1.5 KiB'),
+    (200 * 1024 * 1024, '200.0 MiB'),
+    (3 * 1024 ** 3, '3.0 GiB'),
+])
+def test_format_size(size, expected):
+    assert format_size(size) == expected
+
+
+def test_transfer_progress_eta():
+    progress = TransferProgress('upload', transferred=100, total=400, elapsed=10.,
+                                bytes_per_second=10.)
+    assert progress.fraction == 0.25
+    assert progress.eta == timedelta(seconds=30)
+    assert TransferProgress('upload', 100, None, 10., 10.).eta is None
+    assert TransferProgress('upload', 400, 400, 40., 10., done=True).eta == timedelta(0)
+
+
+def test_format_progress():
+    progress = TransferProgress('upload', transferred=1024 ** 3, total=4 * 1024 ** 3,
+                                elapsed=10., bytes_per_second=100 * 1024 ** 2)
+    line = format_progress(progress, bar_width=8)
+    assert line == 'upload [##......]  25.0% 1.0 GiB/4.0 GiB 100.0 MiB/s ETA 0:00:31'
+
+
+def test_format_progress_unknown_size():
+    progress = TransferProgress('download', transferred=2048, total=None, elapsed=1.,
+                                bytes_per_second=2048)
+    assert format_progress(progress) == 'download 2.0 KiB 2.0 KiB/s'
+
+
+def test_progress_tracker_throttling():
+    reports = []
+    tracker = ProgressTracker('upload', 1000, reports.append, report_interval=3600)
+    for _ in range(10):
+        tracker.update(100)
+    tracker.finish()
+    tracker.finish()
+    # The first update and the final report.
+    assert [(report.transferred, report.done) for report in reports] == [(100, False), (1000, True)]
+
+
+def test_progress_tracker_threads():
+    reports = []
+    tracker = ProgressTracker('download', 4000, reports.append, report_interval=0)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for _ in range(4):
+            executor.submit(lambda: [tracker.update(1) for _ in range(1000)])
+    tracker.finish()
+    assert reports[-1].transferred == 4000
+
+
+def test_progress_reader():
+    reports = []
+    tracker = ProgressTracker('upload', 10, reports.append, report_interval=0)
+    reader = ProgressReader(io.BytesIO(b'0123456789'), tracker)
+    buffer = bytearray(4)
+    chunks = []
+    while size := reader.readinto(buffer):
+        chunks.append(bytes(buffer[:size]))
+    assert reader.tell() == 10
+    assert chunks == [b'0123', b'4567', b'89']
+    assert [report.transferred for report in reports] == [4, 8, 10, 10]
+    assert reports[-1].done
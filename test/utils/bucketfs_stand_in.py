@@ -0,0 +1,225 @@
+from __future__ import annotations
+from typing import Generator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import re
+import shutil
+import threading
+
+import exasol.bucketfs as bfs
+
+from exasol.python_extension_common.deployment.language_container_delta_upload import (
+    DeltaRecipe, RECIPE_FILE, BLOCKS_FILE, apply_delta)
+
+BUCKET_NAME = 'default'
+SERVICE_NAME = 'bfsdefault'
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+
+class BucketFsStandIn:
+    """
+    A minimal local HTTP server mimicking the REST API of an On-Prem BucketFS service
+    with a single bucket, sufficient for the exasol.bucketfs client. The files are
+    stored in a local directory.
+
+    The files can also be downloaded with plain GET requests, including byte ranges,
+    which makes the stand-in usable as the source of a container download.
+
+    Faults can be injected to emulate a dropped connection: the next PUT requests
+    listed in fail_puts_after will break after receiving the given number of bytes.
+    """
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.fail_puts_after: list[int] = []
+        self.put_count = 0
+        self.bytes_received = 0
+        # Path and size of each successfully uploaded file, in the order of the uploads.
+        self.uploads: list[tuple[str, int]] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._make_handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self._server.server_port}'
+
+    def build_path(self, path: str = '') -> bfs.path.PathLike:
+        return bfs.path.build_path(backend=bfs.path.StorageBackend.onprem, url=self.url,
+                                   username='w', password='write', bucket_name=BUCKET_NAME,
+                                   service_name=SERVICE_NAME, verify=False, path=path)
+
+    def assemble(self, part_paths: list[bfs.path.PathLike], file_path: bfs.path.PathLike) -> None:
+        """
+        Emulates a server-side step concatenating the uploaded parts into the target file.
+        """
+        target = self.root / str(file_path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with open(target, 'wb') as f:
+            for part_path in part_paths:
+                with open(self.root / str(part_path), 'rb') as part:
+                    shutil.copyfileobj(part, f, _COPY_CHUNK_SIZE)
+
+    def apply_delta(self, base_path: bfs.path.PathLike, delta_path: bfs.path.PathLike,
+                    file_path: bfs.path.PathLike) -> None:
+        """
+        Emulates a server-side step rebuilding the target file from the base file and the delta.
+        """
+        delta_root = self.root / str(delta_path)
+        recipe = DeltaRecipe.from_json((delta_root / RECIPE_FILE).read_bytes())
+        target = self.root / str(file_path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.root / str(base_path), 'rb') as base, \
+                open(delta_root / BLOCKS_FILE, 'rb') as blocks, open(target, 'wb') as f:
+            apply_delta(recipe, base, blocks, f)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _next_fault(self) -> int | None:
+        with self._lock:
+            self.put_count += 1
+            return self.fail_puts_after.pop(0) if self.fail_puts_after else None
+
+    def _make_handler(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):     # pylint: disable=arguments-differ
+                pass
+
+            def _file_path(self) -> Path | None:
+                parts = self.path.lstrip('/').split('/', 1)
+                if len(parts) < 2 or parts[0] != BUCKET_NAME or not parts[1]:
+                    return None
+                return stand_in.root / parts[1]
+
+            def _reply(self, status: int, body: bytes = b'') -> None:
+                self.send_response(status)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _body_chunks(self) -> Generator[bytes, None, None]:
+                if self.headers.get('Transfer-Encoding') == 'chunked':
+                    while True:
+                        size = int(self.rfile.readline().strip(), 16)
+                        if size == 0:
+                            self.rfile.readline()
+                            return
+                        yield self.rfile.read(size)
+                        self.rfile.readline()
+                else:
+                    remaining = int(self.headers.get('Content-Length', 0))
+                    while remaining:
+                        chunk = self.rfile.read(min(remaining, _COPY_CHUNK_SIZE))
+                        if not chunk:
+                            return
+                        remaining -= len(chunk)
+                        yield chunk
+
+            def do_GET(self):     # pylint: disable=invalid-name
+                if self.path.strip('/') == '':
+                    self._reply(200, BUCKET_NAME.encode())
+                elif self.path.strip('/') == BUCKET_NAME:
+                    files = [str(p.relative_to(stand_in.root)) for p in stand_in.root.rglob('*')
+                             if p.is_file()]
+                    self._reply(200, '\n'.join(files).encode())
+                else:
+                    file_path = self._file_path()
+                    if (file_path is None) or (not file_path.is_file()):
+                        self._reply(404)
+                        return
+                    size = file_path.stat().st_size
+                    match = re.fullmatch(r'bytes=(\d+)-(\d+)', self.headers.get('Range', ''))
+                    first, last = (int(match.group(1)), int(match.group(2))) if match \
+                        else (0, size - 1)
+                    last = min(last, size - 1)
+                    if match:
+                        self.send_response(206)
+                        self.send_header('Content-Range', f'bytes {first}-{last}/{size}')
+                    else:
+                        self.send_response(200)
+                    self.send_header('Content-Length', str(last - first + 1))
+                    self.send_header('Accept-Ranges', 'bytes')
+                    self.end_headers()
+                    with open(file_path, 'rb') as f:
+                        f.seek(first)
+                        remaining = last - first + 1
+                        while remaining > 0:
+                            chunk = f.read(min(remaining, _COPY_CHUNK_SIZE))
+                            if not chunk:
+                                break
+                            self.wfile.write(chunk)
+                            remaining -= len(chunk)
+
+            def do_HEAD(self):     # pylint: disable=invalid-name
+                file_path = self._file_path()
+                if (file_path is None) or (not file_path.is_file()):
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Length', str(file_path.stat().st_size))
+                self.send_header('Accept-Ranges', 'bytes')
+                self.end_headers()
+
+            def do_PUT(self):     # pylint: disable=invalid-name
+                file_path = self._file_path()
+                if file_path is None:
+                    self._reply(400)
+                    return
+                fault = stand_in._next_fault()
+                file_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = file_path.with_name(file_path.name + '.uploading')
+                received = 0
+                with open(tmp_path, 'wb') as f:
+                    for chunk in self._body_chunks():
+                        if (fault is not None) and (received + len(chunk) > fault):
+                            # Emulate a dropped connection. The file stays as it was.
+                            tmp_path.unlink()
+                            self.close_connection = True
+                            self.connection.close()
+                            return
+                        f.write(chunk)
+                        received += len(chunk)
+                with stand_in._lock:
+                    stand_in.bytes_received += received
+                    stand_in.uploads.append((str(file_path.relative_to(stand_in.root)), received))
+                tmp_path.replace(file_path)
+                self._reply(200)
+
+            def do_DELETE(self):     # pylint: disable=invalid-name
+                file_path = self._file_path()
+                if (file_path is None) or (not file_path.is_file()):
+                    self._reply(404)
+                    return
+                file_path.unlink()
+                # The BucketFS has no directories. Remove the ones left empty.
+                for parent in file_path.parents:
+                    if (parent == stand_in.root) or any(parent.iterdir()):
+                        break
+                    parent.rmdir()
+                self._reply(200)
+
+        return Handler
+
+
+@contextmanager
+def bucketfs_stand_in(root: Path) -> Generator[BucketFsStandIn, None, None]:
+    """
+    Runs a local BucketFS stand-in, storing the files in the provided directory.
+    """
+    stand_in = BucketFsStandIn(root)
+    stand_in.start()
+    try:
+        yield stand_in
+    finally:
+        stand_in.stop()